@@ -0,0 +1,16 @@
+"""
+Celery config for iron project.
+
+It exposes the Celery app as a module-level variable named ``app`` and
+autodiscovers ``tasks.py`` modules from installed apps.
+"""
+
+import os
+
+from celery import Celery
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "iron.settings")
+
+app = Celery("iron")
+app.config_from_object("django.conf:settings", namespace="CELERY")
+app.autodiscover_tasks()
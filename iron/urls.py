@@ -18,10 +18,12 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path, include
 from rest_framework.authtoken import views as auth_views
+from resume.views import MetricsView
 
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/auth/", include('rest_framework.urls')),
     path("api/token/", auth_views.obtain_auth_token, name='api_token_auth'),
     path("api/", include('resume.urls')),
+    path("metrics", MetricsView.as_view(), name='metrics'),
 ]
@@ -1,43 +1,171 @@
 from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList
+from django.contrib.auth.models import User
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.functional import cached_property
 from .models import Resume, JobPosition, GeneratedQuestion
 
 # Register your models here.
 
+
+def estimate_row_count(model, using='default'):
+    """Row count from planner statistics, or None where there are none"""
+    connection = connections[using]
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass", [table])
+        elif connection.vendor == 'mysql':
+            cursor.execute(
+                "SELECT table_rows FROM information_schema.tables WHERE table_schema = DATABASE() AND table_name = %s",
+                [table]
+            )
+        elif connection.vendor == 'sqlite':
+            # Ids only grow, so the largest one bounds the row count from above
+            cursor.execute(f"SELECT MAX(rowid) FROM {connection.ops.quote_name(table)}")
+        else:
+            return None
+        row = cursor.fetchone()
+    if row is None or row[0] is None or row[0] < 0:
+        return None  # never analyzed
+    return int(row[0])
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator that never runs an unbounded COUNT(*)
+
+    The unfiltered list uses the database's row estimate once the table is
+    past exact_limit rows. Filtered and searched lists count at most
+    count_limit matching rows, so their last page is capped there.
+    """
+
+    exact_limit = 10000
+    count_limit = 10000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not queryset.query.where:
+            estimate = estimate_row_count(queryset.model, queryset.db)
+            if estimate is not None and estimate > self.exact_limit:
+                return estimate
+        # COUNT(*) over a LIMIT subquery stops after count_limit rows
+        return queryset.order_by()[:self.count_limit].count()
+
+
+class ScalableChangeList(ChangeList):
+    def get_queryset(self, request, exclude_parameters=None):
+        queryset = super().get_queryset(request, exclude_parameters)
+        if self.model_admin.list_defer:
+            queryset = queryset.defer(*self.model_admin.list_defer)
+        return queryset
+
+
+class ScalableModelAdmin(admin.ModelAdmin):
+    """ModelAdmin defaults that hold up on tables with millions of rows
+
+    list_defer names large columns (including ones reached through
+    list_select_related) that list pages never display.
+    """
+
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    list_defer = []
+
+    def get_changelist(self, request, **kwargs):
+        return ScalableChangeList
+
+
 @admin.register(Resume)
-class ResumeAdmin(admin.ModelAdmin):
-    list_display = ['user', 'original_filename', 'uploaded_at', 'is_processed']
-    list_filter = ['is_processed', 'uploaded_at']
-    search_fields = ['user__username', 'original_filename']
-    readonly_fields = ['uploaded_at']
-    
+class ResumeAdmin(ScalableModelAdmin):
+    list_display = ['user', 'original_filename', 'file_type', 'processing_status', 'uploaded_at']
+    list_select_related = ['user']
+    list_defer = ['parsed_content', 'content_preview', 'error_message']
+    # Every filter column leads an index that also covers the -uploaded_at ordering
+    list_filter = ['processing_status', 'file_type', 'uploaded_at']
+    search_help_text = "Filename prefix or exact username"
+    raw_id_fields = ['user']
+    readonly_fields = ['uploaded_at', 'processed_at', 'content_hash', 'content_length', 'content_preview']
+
     fieldsets = (
         ('Basic Information', {
-            'fields': ('user', 'file', 'original_filename')
+            'fields': ('user', 'file', 'original_filename', 'file_type', 'file_size', 'content_hash')
         }),
         ('Processing Status', {
-            'fields': ('is_processed', 'parsed_content')
+            # parsed_content is shown as its preview; decompressing and
+            # rendering megabytes of text made the change form unusable
+            'fields': ('processing_status', 'is_processed', 'error_message', 'content_length', 'content_preview')
         }),
         ('Timestamps', {
-            'fields': ('uploaded_at',),
+            'fields': ('uploaded_at', 'processed_at'),
             'classes': ('collapse',)
         }),
     )
 
+    def get_queryset(self, request):
+        # The change form never shows parsed_content, so never load it
+        return super().get_queryset(request).defer('parsed_content')
+
+    def get_search_fields(self, request):
+        return ['original_filename']  # enables the search box; matching is done below
+
+    def get_search_results(self, request, queryset, search_term):
+        """Match a filename prefix or an exact username, both through indexes"""
+        term = search_term.strip()
+        if not term:
+            return queryset, False
+        # resume_filename_idx is a PrefixIndex, built for this LIKE 'term%'
+        prefix = Q(original_filename__startswith=term)
+        owner = Q(user__in=User.objects.filter(username=term).values('pk'))
+        return queryset.filter(prefix | owner), False
+
 
 @admin.register(JobPosition)
-class JobPositionAdmin(admin.ModelAdmin):
+class JobPositionAdmin(ScalableModelAdmin):
     list_display = ['title', 'department', 'is_active', 'created_at']
-    list_filter = ['is_active', 'department', 'created_at']
-    search_fields = ['title', 'description', 'department']
+    list_defer = ['description']
+    # Each filter column leads an index that also covers the title ordering
+    list_filter = ['is_active', 'department']
+    search_help_text = "Title prefix or exact department"
     readonly_fields = ['created_at']
 
+    def get_search_fields(self, request):
+        return ['title']  # enables the search box; matching is done below
+
+    def get_search_results(self, request, queryset, search_term):
+        """Match a title prefix or an exact department, both through indexes"""
+        term = search_term.strip()
+        if not term:
+            return queryset, False
+        return queryset.filter(Q(title__startswith=term) | Q(department=term)), False
+
 
 @admin.register(GeneratedQuestion)
-class GeneratedQuestionAdmin(admin.ModelAdmin):
+class GeneratedQuestionAdmin(ScalableModelAdmin):
     list_display = ['category', 'resume', 'job_position', 'priority', 'generated_at']
+    # Resume.__str__ shows the owner's username
+    list_select_related = ['resume__user', 'job_position']
+    list_defer = [
+        'resume__parsed_content', 'resume__content_preview', 'resume__error_message', 'job_position__description'
+    ]
     list_filter = ['category', 'priority', 'generated_at']
-    search_fields = ['question_text', 'resume__original_filename', 'job_position__title']
+    search_help_text = "Resume filename prefix or job position title prefix"
+    raw_id_fields = ['resume']
     readonly_fields = ['generated_at']
-    
+
     # Limit the number of questions shown per page
     list_per_page = 50
+
+    def get_search_fields(self, request):
+        return ['resume__original_filename']  # enables the search box; matching is done below
+
+    def get_search_results(self, request, queryset, search_term):
+        """Match through the resume filename and job title prefix indexes, without joins"""
+        term = search_term.strip()
+        if not term:
+            return queryset, False
+        resumes = Resume.objects.filter(original_filename__startswith=term).values('pk')
+        job_positions = JobPosition.objects.filter(title__startswith=term).values('pk')
+        return queryset.filter(Q(resume__in=resumes) | Q(job_position__in=job_positions)), False
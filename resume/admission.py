@@ -0,0 +1,165 @@
+import contextlib
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from rest_framework.throttling import BaseThrottle
+
+from .executor import ExtractionQueueFull
+
+DEFAULT_ADMISSION = {
+    'CACHE': 'default',  # alias in CACHES holding the buckets; use a shared cache across hosts
+    # Token buckets per view throttle_scope: RATE in DRF's "N/period" form
+    # refills the bucket, BURST is its size. Scopes not listed are not throttled.
+    'THROTTLES': {},
+    'MAX_CONCURRENT_EXTRACTIONS': 4,  # per process
+    'QUEUE_SIZE': 8,  # uploads allowed to wait for an extraction slot
+    'QUEUE_TIMEOUT': 10.0,  # seconds an upload waits before it is turned away
+    'RETRY_AFTER': 5,  # seconds suggested when the extraction queue is full
+}
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def get_admission_settings():
+    """Merge RESUME_ADMISSION from settings over the defaults"""
+    options = dict(DEFAULT_ADMISSION)
+    options.update(getattr(settings, 'RESUME_ADMISSION', {}))
+    return options
+
+
+def parse_rate(rate):
+    """'30/min' -> tokens per second"""
+    count, period = rate.split('/')
+    return int(count) / PERIODS[period.strip()[0]]
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """Per-user (or per-IP for anonymous clients) token bucket per view scope
+
+    A bucket holds up to BURST tokens and refills at RATE; each request
+    spends one. Buckets live in the RESUME_ADMISSION cache, so they are
+    shared by every process using that cache. Reads and writes are not
+    atomic: under contention a few extra requests can get through, which
+    is the price of not taking a lock per request.
+    """
+
+    key_prefix = 'resume:throttle'
+
+    def __init__(self):
+        self.wait_seconds = None
+
+    def get_config(self, view):
+        scope = getattr(view, 'throttle_scope', None)
+        if not scope:
+            return None, None
+        options = get_admission_settings()
+        config = options['THROTTLES'].get(scope)
+        if not config:
+            return None, None
+        return scope, (parse_rate(config['RATE']), max(1, config.get('BURST', 1)), options['CACHE'])
+
+    def get_cache_key(self, request, scope):
+        if request.user and request.user.is_authenticated:
+            ident = f'user:{request.user.pk}'
+        else:
+            ident = f'ip:{self.get_ident(request)}'
+        return f'{self.key_prefix}:{scope}:{ident}'
+
+    def allow_request(self, request, view):
+        scope, config = self.get_config(view)
+        if scope is None:
+            return True
+        rate, burst, cache_alias = config
+        cache = caches[cache_alias]
+        key = self.get_cache_key(request, scope)
+        now = time.time()
+
+        tokens, updated = cache.get(key, (burst, now))
+        tokens = min(burst, tokens + max(0.0, now - updated) * rate)
+        # Entries expire once the bucket would be full again anyway
+        timeout = math.ceil(burst / rate) + 1
+        if tokens < 1:
+            self.wait_seconds = (1 - tokens) / rate
+            cache.set(key, (tokens, now), timeout)
+            return False
+        cache.set(key, (tokens - 1, now), timeout)
+        return True
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class ExtractionGate:
+    """Cap on extractions running at once in this process
+
+    Uploads beyond max_concurrent wait for a slot, but only queue_size of
+    them at a time and for at most queue_timeout seconds. Anything else
+    raises ExtractionQueueFull at once, so the view can answer 429 instead
+    of tying up another worker thread.
+    """
+
+    def __init__(self, max_concurrent=4, queue_size=8, queue_timeout=10.0, retry_after=5):
+        self.max_concurrent = max(1, max_concurrent)
+        self.queue_size = max(0, queue_size)
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self.waiting = 0
+        self._slots = threading.BoundedSemaphore(self.max_concurrent)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls):
+        options = get_admission_settings()
+        return cls(
+            max_concurrent=options['MAX_CONCURRENT_EXTRACTIONS'],
+            queue_size=options['QUEUE_SIZE'],
+            queue_timeout=options['QUEUE_TIMEOUT'],
+            retry_after=options['RETRY_AFTER'],
+        )
+
+    @contextlib.contextmanager
+    def slot(self):
+        """Hold one extraction slot for the duration of the block"""
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                if self.waiting >= self.queue_size:
+                    raise ExtractionQueueFull(self.retry_after)
+                self.waiting += 1
+            try:
+                acquired = self._slots.acquire(timeout=self.queue_timeout)
+            finally:
+                with self._lock:
+                    self.waiting -= 1
+            if not acquired:
+                raise ExtractionQueueFull(self.retry_after)
+        try:
+            yield
+        finally:
+            self._slots.release()
+
+
+_gate = None
+_gate_lock = threading.Lock()
+
+
+def get_extraction_gate():
+    """Return this process's gate, creating it on first use"""
+    global _gate
+    with _gate_lock:
+        if _gate is None:
+            _gate = ExtractionGate.from_settings()
+        return _gate
+
+
+def reset_extraction_gate(setting, **kwargs):
+    global _gate
+    if setting == 'RESUME_ADMISSION':
+        with _gate_lock:
+            _gate = None
+
+
+setting_changed.connect(reset_extraction_gate)
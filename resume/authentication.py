@@ -0,0 +1,163 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+DEFAULT_TOKEN_CACHE = {
+    'MAX_ENTRIES': 10000,  # tokens kept in each process
+    'LOCAL_TTL': 30,  # seconds a process trusts its own copy
+    'SHARED_CACHE': None,  # alias in CACHES for a tier shared by all processes
+    'SHARED_TTL': 300,
+}
+
+
+def get_token_cache_settings():
+    """Merge RESUME_TOKEN_CACHE from settings over the defaults"""
+    options = dict(DEFAULT_TOKEN_CACHE)
+    options.update(getattr(settings, 'RESUME_TOKEN_CACHE', {}))
+    return options
+
+
+class TokenCache:
+    """Credentials of authenticated API tokens, keyed by token key
+
+    A bounded in-process LRU answers most requests. With SHARED_CACHE set,
+    misses fall through to that cache before the database, so a token
+    looked up by one worker is warm for all of them. Signal handlers
+    invalidate both tiers in the process that made the change; other
+    processes drop their local copy within LOCAL_TTL.
+    """
+
+    key_prefix = 'resume:auth-token:'
+
+    def __init__(self, max_entries=10000, local_ttl=30, shared_cache=None, shared_ttl=300):
+        self.max_entries = max_entries
+        self.local_ttl = local_ttl
+        self.shared_cache = shared_cache
+        self.shared_ttl = shared_ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls):
+        options = get_token_cache_settings()
+        return cls(
+            max_entries=options['MAX_ENTRIES'],
+            local_ttl=options['LOCAL_TTL'],
+            shared_cache=options['SHARED_CACHE'],
+            shared_ttl=options['SHARED_TTL'],
+        )
+
+    def configure(self):
+        """Re-read RESUME_TOKEN_CACHE and drop every local entry"""
+        configured = self.from_settings()
+        with self._lock:
+            self.max_entries = configured.max_entries
+            self.local_ttl = configured.local_ttl
+            self.shared_cache = configured.shared_cache
+            self.shared_ttl = configured.shared_ttl
+            self._entries.clear()
+
+    def shared_key(self, key):
+        # Never put raw credentials into a shared backend
+        return self.key_prefix + hashlib.sha256(key.encode()).hexdigest()
+
+    def get(self, key):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[1] > now:
+                    self._entries.move_to_end(key)
+                    return entry[0]
+                del self._entries[key]
+
+        if self.shared_cache:
+            credentials = caches[self.shared_cache].get(self.shared_key(key))
+            if credentials is not None:
+                self._remember(key, credentials, now)
+                return credentials
+        return None
+
+    def set(self, key, credentials):
+        self._remember(key, credentials, time.monotonic())
+        if self.shared_cache:
+            caches[self.shared_cache].set(self.shared_key(key), credentials, self.shared_ttl)
+
+    def _remember(self, key, credentials, now):
+        if not self.max_entries:
+            return
+        with self._lock:
+            self._entries[key] = (credentials, now + self.local_ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, *keys):
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+        if self.shared_cache and keys:
+            caches[self.shared_cache].delete_many([self.shared_key(key) for key in keys])
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+token_cache = TokenCache.from_settings()
+
+
+def _field_values(instance, exclude=()):
+    fields = [field.attname for field in instance._meta.concrete_fields if field.attname not in exclude]
+    return fields, [getattr(instance, name) for name in fields]
+
+
+def freeze_credentials(user, token):
+    """Plain field values of an authenticated (user, token), minus the password hash"""
+    return user._state.db, _field_values(user, exclude={'password'}), _field_values(token)
+
+
+def thaw_credentials(frozen):
+    """Fresh (user, token) instances for one request
+
+    The password is left deferred: reading it costs a query, and save()
+    writes only the loaded fields, so it is never blanked.
+    """
+    db, (user_fields, user_values), (token_fields, token_values) = frozen
+    user = get_user_model().from_db(db, user_fields, user_values)
+    token = Token.from_db(db, token_fields, token_values)
+    token.user = user
+    return user, token
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """Drop-in TokenAuthentication that skips the token/user query when cached
+
+    Only successful lookups are cached; unknown keys and inactive users
+    still go to the database and fail the same way. Every request gets
+    its own user and token instances.
+    """
+
+    def authenticate_credentials(self, key):
+        frozen = token_cache.get(key)
+        if frozen is None:
+            user, token = super().authenticate_credentials(key)
+            token_cache.set(key, freeze_credentials(user, token))
+            return user, token
+        return thaw_credentials(frozen)
+
+
+def _reload_settings(setting, **kwargs):
+    if setting == 'RESUME_TOKEN_CACHE':
+        token_cache.configure()
+
+
+setting_changed.connect(_reload_settings)
@@ -0,0 +1,19 @@
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+
+from .questions import get_question_cache_settings
+
+
+@register(Tags.caches)
+def check_question_cache_is_shared(app_configs, **kwargs):
+    """Invalidation only reaches other processes through a shared cache"""
+    alias = get_question_cache_settings()['CACHE']
+    backend = settings.CACHES.get(alias, {}).get('BACKEND', '')
+    if backend.endswith('.LocMemCache'):
+        return [Error(
+            f"RESUME_QUESTION_CACHE uses the process-local cache '{alias}'.",
+            hint="Point it at a cache every worker shares, such as RedisCache or FileBasedCache; "
+                 "otherwise other workers keep serving regenerated or deleted questions.",
+            id='resume.E001',
+        )]
+    return []
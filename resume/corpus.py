@@ -0,0 +1,260 @@
+import io
+import random
+import struct
+
+from docx import Document
+
+FIRST_NAMES = ['Aarav', 'Maria', 'Chen', 'Fatima', 'Lukas', 'Priya', 'James', 'Sofia', 'Kenji', 'Amara']
+LAST_NAMES = ['Sharma', 'Garcia', 'Wei', 'Khan', 'Muller', 'Iyer', 'Smith', 'Rossi', 'Tanaka', 'Okafor']
+SKILLS = [
+    'Python', 'Django', 'Flask', 'FastAPI', 'PostgreSQL', 'MySQL', 'Redis', 'Celery', 'Docker',
+    'Kubernetes', 'AWS', 'GCP', 'Terraform', 'React', 'TypeScript', 'JavaScript', 'Node.js', 'Go',
+    'Rust', 'Java', 'Spring', 'Kotlin', 'Swift', 'C++', 'Pandas', 'NumPy', 'PyTorch', 'TensorFlow',
+    'scikit-learn', 'Kafka', 'Spark', 'Airflow', 'GraphQL', 'REST APIs', 'Git', 'Linux', 'CI/CD',
+]
+SOFT_SKILLS = ['communication', 'leadership', 'mentoring', 'teamwork', 'problem solving', 'ownership']
+COMPANIES = ['Acme Corp', 'Globex', 'Initech', 'Umbrella Labs', 'Hooli', 'Stark Industries', 'Wayne Tech']
+ROLES = ['Software Engineer', 'Backend Developer', 'Data Engineer', 'Full Stack Developer', 'ML Engineer']
+VERBS = ['Built', 'Designed', 'Led', 'Migrated', 'Optimized', 'Automated', 'Shipped', 'Scaled', 'Refactored']
+OBJECTS = [
+    'a payments service', 'the search pipeline', 'an internal analytics dashboard', 'the CI pipeline',
+    'a recommendation engine', 'the public REST API', 'a real-time notification system', 'the data warehouse',
+]
+OUTCOMES = [
+    'cutting p99 latency by 40%', 'serving 2M requests per day', 'reducing cloud spend by 25%',
+    'improving test coverage to 90%', 'onboarding 5 new engineers', 'eliminating nightly outages',
+]
+
+
+def _bullet(rng):
+    skills = ', '.join(rng.sample(SKILLS, 2))
+    return f"- {rng.choice(VERBS)} {rng.choice(OBJECTS)} using {skills}, {rng.choice(OUTCOMES)}."
+
+
+def generate_resume_text(seed, target_chars=4000):
+    """Deterministic, resume-shaped plain text of roughly target_chars characters
+
+    Sections use the headings real resumes use (skills, experience,
+    internships, projects, ...), so the output also exercises section
+    detection and skill matching.
+    """
+    rng = random.Random(seed)
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    lines = [
+        name,
+        f"{rng.choice(ROLES)} | {name.split()[0].lower()}@example.com | +1 555 {rng.randint(1000, 9999)}",
+        '',
+        'SUMMARY',
+        f"{rng.choice(ROLES)} with {rng.randint(1, 15)} years of experience in {', '.join(rng.sample(SKILLS, 3))}.",
+        '',
+        'TECHNICAL SKILLS',
+        ', '.join(rng.sample(SKILLS, rng.randint(6, 14))),
+        '',
+        'EXPERIENCE',
+    ]
+    body = []
+    while sum(len(line) + 1 for line in lines + body) < target_chars * 0.75:
+        start = rng.randint(2008, 2022)
+        body.append(f"{rng.choice(ROLES)}, {rng.choice(COMPANIES)} ({start} - {start + rng.randint(1, 4)})")
+        body.extend(_bullet(rng) for _ in range(rng.randint(3, 6)))
+        body.append('')
+    lines.extend(body)
+    lines.extend(['INTERNSHIPS', f"Intern, {rng.choice(COMPANIES)}", _bullet(rng), ''])
+    lines.append('PROJECTS')
+    while sum(len(line) + 1 for line in lines) < target_chars * 0.95:
+        lines.append(_bullet(rng))
+    lines.extend(['', 'SOFT SKILLS', ', '.join(rng.sample(SOFT_SKILLS, 3)), '', 'EDUCATION',
+                  f"B.Tech in Computer Science, {rng.randint(2005, 2020)}"])
+    return '\n'.join(lines)
+
+
+# Non-ASCII line that every corpus encoding can represent
+LOCATIONS_LINE = 'Locations: Zürich, São Paulo, Montréal, Malmö'
+TEXT_ENCODINGS = ['utf-8', 'utf-16', 'latin-1', 'cp1252']
+CORPUS_TYPES = ['.pdf', '.docx', '.txt', '.rtf']
+
+
+def _pdf_string(text):
+    escaped = text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+    return escaped.encode('latin-1', 'replace')
+
+
+def make_pdf(pages):
+    """Build a minimal PDF with Helvetica text; each page string may span lines"""
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # page tree, filled in once the page ids are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    page_ids = []
+    for text in pages:
+        lines = [b"(%s) Tj" % _pdf_string(line) for line in text.split('\n')]
+        stream = b"BT /F1 12 Tf 14 TL 72 720 Td " + b" T* ".join(lines) + b" ET"
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % len(objects)
+        )
+        page_ids.append(len(objects))
+    kids = b" ".join(b"%d 0 R" % page_id for page_id in page_ids)
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_ids))
+
+    output = io.BytesIO()
+    output.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(output.tell())
+        output.write(b"%d 0 obj\n%s\nendobj\n" % (number, body))
+    xref_offset = output.tell()
+    output.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        output.write(b"%010d 00000 n \n" % offset)
+    output.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_offset))
+    return output.getvalue()
+
+
+def build_pdf(text, lines_per_page=50):
+    lines = text.split('\n')
+    return make_pdf([
+        '\n'.join(lines[start:start + lines_per_page]) for start in range(0, len(lines), lines_per_page)
+    ])
+
+
+def build_docx(text):
+    document = Document()
+    for line in text.split('\n'):
+        document.add_paragraph(line)
+    output = io.BytesIO()
+    document.save(output)
+    return output.getvalue()
+
+
+def build_doc(text):
+    """Minimal Word 97-2003 file: one piece of text in a version 3 compound file"""
+    body = text.replace('\n', '\r') + '\r'
+    compressed = all(ord(char) < 128 for char in body)
+    encoded = body.encode('cp1252' if compressed else 'utf-16-le')
+    text_offset = 0x800
+
+    fib = bytearray(text_offset)
+    struct.pack_into('<HHH', fib, 0, 0xA5EC, 0x00C1, 0)
+    struct.pack_into('<H', fib, 0x0A, 0x0200)  # fWhichTblStm: the table stream is 1Table
+    position = 32
+    struct.pack_into('<H', fib, position, 14)  # csw
+    position += 2 + 14 * 2
+    struct.pack_into('<H', fib, position, 22)  # cslw
+    struct.pack_into('<i', fib, position + 2 + 3 * 4, len(body))  # ccpText
+    position += 2 + 22 * 4
+    struct.pack_into('<H', fib, position, 93)  # cbRgFcLcb
+    # A piece table (Pcdt) with one piece covering the whole text
+    offset = text_offset * 2 | 0x40000000 if compressed else text_offset
+    clx = b'\x02' + struct.pack('<IIIHIH', 16, 0, len(body), 0, offset, 0)
+    struct.pack_into('<II', fib, position + 2 + 33 * 8, 0, len(clx))
+    word = bytes(fib) + encoded
+    table = clx
+
+    # Streams below the 4096-byte cutoff would belong in the mini stream
+    streams = [('WordDocument', word.ljust(4096, b'\x00')), ('1Table', table.ljust(4096, b'\x00'))]
+    sectors = [(len(data) + 511) // 512 for _, data in streams]
+    fat_count = 1
+    while fat_count * 128 < fat_count + 1 + sum(sectors):
+        fat_count += 1
+    fat = [0xFFFFFFFD] * fat_count + [0xFFFFFFFE]  # FAT sectors, then the directory
+    starts = []
+    for count in sectors:
+        starts.append(len(fat))
+        fat.extend(range(len(fat) + 1, len(fat) + count))
+        fat.append(0xFFFFFFFE)
+    fat.extend([0xFFFFFFFF] * (fat_count * 128 - len(fat)))
+
+    def entry(name, entry_type, child, right, start, size):
+        encoded_name = (name + '\x00').encode('utf-16-le')
+        return (
+            encoded_name.ljust(64, b'\x00')
+            + struct.pack('<HBBIII', len(encoded_name), entry_type, 1, 0xFFFFFFFF, right, child)
+            + bytes(36) + struct.pack('<IQ', start, size)
+        )
+
+    directory = (
+        entry('Root Entry', 5, 1, 0xFFFFFFFF, 0xFFFFFFFE, 0)
+        + entry(streams[0][0], 2, 0xFFFFFFFF, 2, starts[0], len(streams[0][1]))
+        + entry(streams[1][0], 2, 0xFFFFFFFF, 0xFFFFFFFF, starts[1], len(streams[1][1]))
+        + entry('', 0, 0xFFFFFFFF, 0xFFFFFFFF, 0, 0)
+    )
+
+    header = (
+        b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1' + bytes(16)
+        + struct.pack('<HHHHH', 0x003E, 0x0003, 0xFFFE, 9, 6) + bytes(6)
+        + struct.pack('<IIIIIIIII', 0, fat_count, fat_count, 0, 4096, 0xFFFFFFFE, 0, 0xFFFFFFFE, 0)
+        + struct.pack('<109I', *(list(range(fat_count)) + [0xFFFFFFFF] * (109 - fat_count)))
+    )
+    output = io.BytesIO()
+    output.write(header)
+    output.write(struct.pack(f'<{len(fat)}I', *fat))
+    output.write(directory)
+    for _, data in streams:
+        output.write(data.ljust((len(data) + 511) // 512 * 512, b'\x00'))
+    return output.getvalue()
+
+
+def build_rtf(text, pictures=0, picture_bytes=64 * 1024, seed=0):
+    """RTF for text, optionally with hex-encoded pictures spread through it
+
+    Pictures are written the way word processors do: a \\shppict group
+    with a PNG and a \\nonshppict metafile fallback, as 128-column hex.
+    """
+    def escape(line):
+        line = line.replace('\\', '\\\\').replace('{', '\\{').replace('}', '\\}')
+        return ''.join(char if ord(char) < 128 else f"\\u{ord(char)}?" for char in line)
+
+    def picture():
+        data = rng.randbytes(picture_bytes).hex()
+        rows = '\n'.join(data[start:start + 128] for start in range(0, len(data), 128))
+        return (
+            f"{{\\*\\shppict{{\\pict\\pngblip\\picw640\\pich480\n{rows}\n}}}}"
+            f"{{\\nonshppict{{\\pict\\wmetafile8\\picw640\\pich480\n{rows}\n}}}}"
+        )
+
+    rng = random.Random(seed)
+    lines = [f"{escape(line)}\\par" for line in text.split('\n')]
+    for number in range(pictures):
+        lines.insert((number + 1) * len(lines) // (pictures + 1), picture())
+    body = '\n'.join(lines)
+    return f"{{\\rtf1\\ansi\\deff0 {{\\fonttbl {{\\f0 Helvetica;}}}}\\f0\n{body}\n}}".encode('ascii')
+
+
+def build_document(text, extension, encoding='utf-8'):
+    """Encode resume text as a file of the given type"""
+    if extension == '.pdf':
+        return build_pdf(text)
+    if extension == '.docx':
+        return build_docx(text)
+    if extension == '.doc':
+        return build_doc(text)
+    if extension == '.rtf':
+        return build_rtf(text)
+    return text.encode(encoding)
+
+
+def generate_corpus(documents, sizes=(2000, 8000, 32000), file_types=CORPUS_TYPES, seed=0):
+    """Deterministic list of synthetic resume files
+
+    Each entry is a dict with name, extension, encoding, chars and data.
+    Types, sizes and (for text files) encodings are cycled so any prefix of
+    the corpus covers all of them.
+    """
+    corpus = []
+    for index in range(documents):
+        extension = file_types[index % len(file_types)]
+        size = sizes[(index // len(file_types)) % len(sizes)]
+        encoding = TEXT_ENCODINGS[(index // len(file_types)) % len(TEXT_ENCODINGS)] if extension == '.txt' else None
+        text = generate_resume_text(seed + index, size)
+        text = text.replace('\n\nTECHNICAL SKILLS', f"\n{LOCATIONS_LINE}\n\nTECHNICAL SKILLS", 1)
+        corpus.append({
+            'name': f"resume-{index:04d}-{size}{extension}",
+            'extension': extension,
+            'encoding': encoding,
+            'chars': len(text),
+            'data': build_document(text, extension, encoding or 'utf-8'),
+        })
+    return corpus
@@ -0,0 +1,163 @@
+import codecs
+import threading
+from collections import OrderedDict
+
+import chardet
+from django.conf import settings
+
+DEFAULT_TEXT_DECODING = {
+    'SAMPLE_SIZE': 16 * 1024,  # bytes handed to chardet, split over start/middle/end
+    'FALLBACK_ENCODING': 'cp1252',
+    'NULL_BYTE_RATIO': 0.1,  # above this share of NUL bytes a buffer is binary
+    'EXTENSION_CACHE_SIZE': 64,
+}
+
+# UTF-32 first: its little-endian BOM starts with the UTF-16 one
+BOMS = [
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+]
+
+
+def get_text_decoding_settings():
+    """Merge RESUME_TEXT_DECODING from settings over the defaults"""
+    options = dict(DEFAULT_TEXT_DECODING)
+    options.update(getattr(settings, 'RESUME_TEXT_DECODING', {}))
+    return options
+
+
+class DecodeResult:
+    """Decoded text and how its encoding was chosen"""
+
+    def __init__(self, text, encoding, method):
+        self.text = text
+        self.encoding = encoding
+        self.method = method  # 'bom', 'utf-8', 'cached', 'sample' or 'fallback'
+
+    def __repr__(self):
+        return f"<DecodeResult {self.encoding} via {self.method}>"
+
+
+class ExtensionEncodingCache:
+    """Last encoding that worked for each unknown file extension
+
+    Files with an unrecognised extension usually come from one source
+    system, so the generic extractor tries the previous result (which must
+    still decode strictly) before running detection again.
+    """
+
+    def __init__(self, max_entries=64):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, extension):
+        with self._lock:
+            encoding = self._entries.get(extension)
+            if encoding is not None:
+                self._entries.move_to_end(extension)
+            return encoding
+
+    def set(self, extension, encoding):
+        with self._lock:
+            self._entries[extension] = encoding
+            self._entries.move_to_end(extension)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+extension_encodings = ExtensionEncodingCache(get_text_decoding_settings()['EXTENSION_CACHE_SIZE'])
+
+
+class TextDecoder:
+    """Decode uploaded text with as few passes over the buffer as possible
+
+    A BOM or a successful strict UTF-8 decode settles the encoding straight
+    away. Otherwise chardet only sees a bounded sample taken from the
+    start, middle and end of the buffer, and the whole buffer is decoded
+    once with the result.
+    """
+
+    def __init__(self, sample_size=16 * 1024, fallback_encoding='cp1252', null_byte_ratio=0.1, cache=None):
+        self.sample_size = sample_size
+        self.fallback_encoding = fallback_encoding
+        self.null_byte_ratio = null_byte_ratio
+        self.cache = cache if cache is not None else extension_encodings
+
+    @classmethod
+    def from_settings(cls):
+        options = get_text_decoding_settings()
+        return cls(
+            sample_size=options['SAMPLE_SIZE'],
+            fallback_encoding=options['FALLBACK_ENCODING'],
+            null_byte_ratio=options['NULL_BYTE_RATIO'],
+        )
+
+    def sample(self, raw):
+        """Up to sample_size bytes from the start, middle and end of raw"""
+        if len(raw) <= self.sample_size:
+            return raw
+        # Keep offsets on 4-byte boundaries so UTF-16/32 code units stay aligned
+        part = self.sample_size // 3 // 4 * 4
+        middle = (len(raw) // 2 - part // 2) // 4 * 4
+        end = (len(raw) - part) // 4 * 4
+        return raw[:part] + raw[middle:middle + part] + raw[end:end + part]
+
+    def looks_binary(self, raw):
+        """NUL-byte heuristic on the sample; text with a UTF-16/32 BOM is exempt"""
+        if self.bom_encoding(raw):
+            return False
+        sample = self.sample(raw)
+        return bool(sample) and sample.count(b'\x00') > len(sample) * self.null_byte_ratio
+
+    def bom_encoding(self, raw):
+        for bom, encoding in BOMS:
+            if raw.startswith(bom):
+                return encoding
+        return None
+
+    def decode(self, raw, extension=None):
+        """Return a DecodeResult for raw bytes, decoding the buffer once"""
+        encoding = self.bom_encoding(raw)
+        if encoding:
+            return DecodeResult(raw.decode(encoding, errors='replace'), encoding, 'bom')
+
+        try:
+            # Fails fast at the first invalid byte for most legacy encodings
+            return DecodeResult(raw.decode('utf-8'), 'utf-8', 'utf-8')
+        except UnicodeDecodeError:
+            pass
+
+        cached = self.cache.get(extension) if extension else None
+        if cached:
+            try:
+                return DecodeResult(raw.decode(cached), cached, 'cached')
+            except (UnicodeDecodeError, LookupError):
+                pass
+
+        detected = chardet.detect(self.sample(raw))
+        encoding = detected['encoding']
+        method = 'sample'
+        if not encoding or encoding.lower() == 'ascii':
+            # ascii for a buffer that failed UTF-8 means the sample missed the 8-bit bytes
+            encoding, method = self.fallback_encoding, 'fallback'
+
+        try:
+            text = raw.decode(encoding)
+        except LookupError:
+            encoding, method = self.fallback_encoding, 'fallback'
+            text = raw.decode(encoding, errors='replace')
+        except UnicodeDecodeError:
+            # The sample missed bytes this codec cannot map
+            text = raw.decode(encoding, errors='replace')
+        else:
+            if extension:
+                self.cache.set(extension, encoding)
+        return DecodeResult(text, encoding, method)
@@ -30,6 +30,29 @@ class FileType(Enum):
         }
         return mapping.get(extension.lower(), 'Unknown File Type')
 
+    @classmethod
+    def get_signatures(cls, extension):
+        """Get the magic byte prefixes a file of this type may start with"""
+        mapping = {
+            '.pdf': [b'%PDF-'],
+            '.docx': [b'PK\x03\x04'],
+            # OLE2, or a .docx renamed to .doc, which extract_word also reads
+            '.doc': [b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1', b'PK\x03\x04'],
+            '.rtf': [b'{\\rtf'],
+        }
+        return mapping.get(extension.lower(), [])
+
+    @classmethod
+    def matches_signature(cls, extension, header):
+        """Check that the leading bytes of a file agree with its extension"""
+        signatures = cls.get_signatures(extension)
+        if not signatures:
+            return True  # plain text has no signature to check
+        if extension.lower() == '.pdf':
+            # Readers accept junk before the header within the first 1KB
+            return b'%PDF-' in header[:1024]
+        return any(header.startswith(signature) for signature in signatures)
+
 class ProcessingStatus(Enum):
     """Processing status for resume files"""
     PENDING = 'pending'
@@ -0,0 +1,113 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.signals import setting_changed
+
+DEFAULT_EXTRACTION_EXECUTOR = {
+    'WORKERS': 4,  # extractions running at once per process
+    'QUEUE_SIZE': 16,  # extractions allowed to wait for a worker
+    'RETRY_AFTER': 5,  # seconds suggested to clients turned away with 429
+}
+
+
+def get_executor_settings():
+    """Merge RESUME_EXTRACTION_EXECUTOR from settings over the defaults"""
+    options = dict(DEFAULT_EXTRACTION_EXECUTOR)
+    options.update(getattr(settings, 'RESUME_EXTRACTION_EXECUTOR', {}))
+    return options
+
+
+class ExtractionQueueFull(Exception):
+    """Every worker is busy and the wait queue is full"""
+
+    def __init__(self, retry_after):
+        super().__init__("Too many uploads are being processed; try again shortly")
+        self.retry_after = retry_after
+
+
+class BoundedExecutor:
+    """Thread pool that turns work away instead of queueing without limit
+
+    Async views await extraction here so the event loop stays free for
+    other requests. Threads are enough: with the extraction sandbox enabled
+    each thread only waits on a sandbox worker process, and without it the
+    extractors spend most of their time in C code. At most ``workers``
+    calls run and ``queue_size`` wait; anything beyond that raises
+    ExtractionQueueFull straight away.
+    """
+
+    def __init__(self, workers=4, queue_size=16, retry_after=5):
+        self.workers = max(1, workers)
+        self.capacity = self.workers + max(0, queue_size)
+        self.retry_after = retry_after
+        self.pending = 0
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='extraction')
+
+    @classmethod
+    def from_settings(cls):
+        options = get_executor_settings()
+        return cls(
+            workers=options['WORKERS'],
+            queue_size=options['QUEUE_SIZE'],
+            retry_after=options['RETRY_AFTER'],
+        )
+
+    def submit(self, func, *args):
+        """Schedule func(*args) and return its concurrent.futures.Future"""
+        with self._lock:
+            if self.pending >= self.capacity:
+                raise ExtractionQueueFull(self.retry_after)
+            self.pending += 1
+        try:
+            future = self._pool.submit(func, *args)
+        except BaseException:
+            self._release()
+            raise
+        # Released when the call finishes, even if the awaiting request was cancelled
+        future.add_done_callback(self._release)
+        return future
+
+    def _release(self, future=None):
+        with self._lock:
+            self.pending -= 1
+
+    async def run(self, func, *args):
+        """Await func(*args) on the pool; raises ExtractionQueueFull when full"""
+        return await asyncio.wrap_future(self.submit(func, *args))
+
+    def shutdown(self, wait=True):
+        self._pool.shutdown(wait=wait)
+
+
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+
+
+def get_extraction_executor():
+    """Return this process's executor, creating it on first use"""
+    global _executor, _executor_pid
+    with _executor_lock:
+        # Threads do not survive a fork; a forked worker needs its own pool
+        if _executor is None or _executor_pid != os.getpid():
+            _executor = BoundedExecutor.from_settings()
+            _executor_pid = os.getpid()
+        return _executor
+
+
+def reset_extraction_executor(setting, **kwargs):
+    """Drop the executor so the next request builds one from new settings"""
+    global _executor
+    if setting != 'RESUME_EXTRACTION_EXECUTOR':
+        return
+    with _executor_lock:
+        if _executor is not None and _executor_pid == os.getpid():
+            _executor.shutdown(wait=False)
+        _executor = None
+
+
+setting_changed.connect(reset_extraction_executor)
@@ -0,0 +1,139 @@
+import csv
+import json
+from datetime import datetime, time
+
+from django.db.models import Prefetch, Q
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .models import GeneratedQuestion
+from .pagination import decode_cursor, encode_cursor
+
+CHUNK_SIZE = 500  # rows fetched per round trip, and written per chunk of output
+
+RESUME_FIELDS = [
+    'id', 'user_id', 'original_filename', 'file_type', 'file_size', 'content_hash', 'content_length',
+    'processing_status', 'error_message', 'uploaded_at', 'processed_at', 'is_processed',
+]
+
+FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+
+def parse_export_time(value):
+    """ISO date or datetime -> aware datetime; a bare date means midnight"""
+    moment = parse_datetime(value)
+    if moment is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(f"Invalid date: {value}")
+        moment = datetime.combine(day, time.min)
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+def export_queryset(resumes, since=None, until=None, cursor=None, include_content=False, include_questions=False):
+    """Resumes to export, oldest first, starting just after ``cursor``
+
+    Ascending order means a cursor from one run also picks up every resume
+    uploaded since. Only the exported columns are read, and questions come
+    in one extra query per chunk of resumes.
+    """
+    fields = [name for name in RESUME_FIELDS if name != 'user_id'] + ['user']
+    if include_content:
+        fields.append('parsed_content')
+    resumes = resumes.only(*fields).order_by('uploaded_at', 'id')
+    if since is not None:
+        resumes = resumes.filter(uploaded_at__gte=since)
+    if until is not None:
+        resumes = resumes.filter(uploaded_at__lt=until)
+    if cursor:
+        timestamp, pk = decode_cursor(cursor)
+        resumes = resumes.filter(Q(uploaded_at__gt=timestamp) | Q(uploaded_at=timestamp, id__gt=pk))
+    if include_questions:
+        questions = GeneratedQuestion.objects.select_related('job_position').only(
+            'resume_id', 'category', 'question_text', 'priority', 'generated_at', 'job_position__title'
+        ).order_by('resume_id', 'category', 'priority', 'id')
+        resumes = resumes.prefetch_related(Prefetch('questions', queryset=questions))
+    return resumes
+
+
+def _format(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def iter_records(resumes, include_content=False, include_questions=False, chunk_size=CHUNK_SIZE):
+    """Yield one dict per resume, each with the cursor that resumes after it"""
+    for resume in resumes.iterator(chunk_size=chunk_size):
+        record = {name: _format(getattr(resume, name)) for name in RESUME_FIELDS}
+        if include_content:
+            record["parsed_content"] = resume.parsed_content
+        if include_questions:
+            record["questions"] = [
+                {
+                    "id": question.id,
+                    "job_position": question.job_position.title,
+                    "category": question.category,
+                    "question_text": question.question_text,
+                    "priority": question.priority,
+                    "generated_at": _format(question.generated_at),
+                }
+                for question in resume.questions.all()
+            ]
+        record["cursor"] = encode_cursor(resume.uploaded_at, resume.id)
+        yield record
+
+
+def _chunks(lines, chunk_size):
+    """Join lines into chunks so a stream is not written a row at a time"""
+    chunk = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) >= chunk_size:
+            yield ''.join(chunk)
+            chunk = []
+    if chunk:
+        yield ''.join(chunk)
+
+
+def iter_ndjson(records, chunk_size=CHUNK_SIZE):
+    """One JSON object per line"""
+    return _chunks((json.dumps(record, ensure_ascii=False) + '\n' for record in records), chunk_size)
+
+
+class _Line:
+    """File-like object whose write() hands the CSV line straight back"""
+
+    def write(self, value):
+        return value
+
+
+def iter_csv(records, include_content=False, include_questions=False, chunk_size=CHUNK_SIZE):
+    """Header row, then one row per resume; questions are a JSON array cell"""
+    columns = list(RESUME_FIELDS)
+    if include_content:
+        columns.append('parsed_content')
+    if include_questions:
+        columns.append('questions')
+    columns.append('cursor')
+    writer = csv.writer(_Line())
+
+    def lines():
+        yield writer.writerow(columns)
+        for record in records:
+            if include_questions:
+                record["questions"] = json.dumps(record["questions"], ensure_ascii=False)
+            yield writer.writerow(['' if record[column] is None else record[column] for column in columns])
+
+    return _chunks(lines(), chunk_size)
+
+
+def iter_export(resumes, export_format='ndjson', include_content=False, include_questions=False, chunk_size=CHUNK_SIZE):
+    """Text chunks of the export of an ``export_queryset`` in the given format"""
+    records = iter_records(resumes, include_content, include_questions, chunk_size)
+    if export_format == 'csv':
+        return iter_csv(records, include_content, include_questions, chunk_size)
+    return iter_ndjson(records, chunk_size)
@@ -0,0 +1,133 @@
+import io
+
+from .decoding import TextDecoder
+from .enums import FileType
+from .rtf import rtf_to_text
+from .sandbox import get_sandbox_pool, get_sandbox_settings, in_sandbox
+from .services import PDFExtractionEngine
+from .word import OLE_SIGNATURE, doc_to_text, docx_to_text
+
+
+class ExtractedText:
+    """Text produced by an extractor, plus extractor-specific details"""
+
+    def __init__(self, text, details=None):
+        self.text = text
+        self.details = details
+
+
+class ExtractorRegistry:
+    """Extractor functions keyed by FileType
+
+    An extractor is a module-level function taking ``(data, extension)``
+    with the raw upload bytes and returning an ExtractedText or a string.
+    Module-level functions can be sent to a sandbox worker by reference.
+    """
+
+    def __init__(self):
+        self._extractors = {}
+        self._fallback = None
+
+    def register(self, *file_types):
+        """Decorator registering an extractor for the given FileTypes"""
+        def decorator(func):
+            for file_type in file_types:
+                self._extractors[file_type] = func
+            return func
+        return decorator
+
+    def register_fallback(self, func):
+        """Decorator registering the extractor for unknown file types"""
+        self._fallback = func
+        return func
+
+    def get(self, extension):
+        try:
+            return self._extractors[FileType(extension.lower())]
+        except (KeyError, ValueError):
+            return self._fallback
+
+    def file_types(self):
+        return list(self._extractors)
+
+    def extract(self, file_obj, extension):
+        """Run the extractor for extension over file_obj
+
+        With RESUME_EXTRACTION_SANDBOX enabled the extractor runs in a
+        pre-forked worker under CPU, wall-time and memory limits.
+        """
+        extractor = self.get(extension)
+        file_obj.seek(0)
+        data = file_obj.read()
+        if get_sandbox_settings()['ENABLED'] and not in_sandbox():
+            result = get_sandbox_pool().run(extractor, data, extension)
+        else:
+            result = extractor(data, extension)
+        return result if isinstance(result, ExtractedText) else ExtractedText(result)
+
+
+registry = ExtractorRegistry()
+
+
+@registry.register(FileType.PDF)
+def extract_pdf(data, extension):
+    """Extract text from PDF bytes"""
+    try:
+        # Page/character/time budgets and the engine come from RESUME_PDF_EXTRACTION
+        engine = PDFExtractionEngine.from_settings()
+        if in_sandbox():
+            # Sandbox workers are the unit of parallelism; no nested pools
+            engine.engine = 'serial'
+        result = engine.extract(io.BytesIO(data))
+        return ExtractedText(result.text, result.summary())
+    except Exception as e:
+        raise Exception(f"Error extracting PDF text: {str(e)}")
+
+
+@registry.register(FileType.DOC, FileType.DOCX)
+def extract_word(data, extension):
+    """Extract text from a Word document"""
+    try:
+        # Go by content: .doc files are sometimes .docx files renamed
+        if data.startswith(OLE_SIGNATURE):
+            return doc_to_text(data).strip()
+        return docx_to_text(data).strip()
+    except Exception as e:
+        raise Exception(f"Error extracting Word document text: {str(e)}")
+
+
+@registry.register(FileType.TXT)
+def extract_text(data, extension):
+    """Extract text from a plain text file"""
+    try:
+        # BOM and strict UTF-8 fast paths, then chardet on a bounded sample
+        return TextDecoder.from_settings().decode(data).text.strip()
+    except Exception as e:
+        raise Exception(f"Error extracting text file content: {str(e)}")
+
+
+@registry.register(FileType.RTF)
+def extract_rtf(data, extension):
+    """Extract plain text from an RTF document
+
+    Uploads are only accepted when they start with {\\rtf (see
+    FileType.matches_signature), so there is no plain text fallback.
+    """
+    try:
+        return rtf_to_text(data).strip()
+    except Exception as e:
+        raise Exception(f"Error extracting RTF text: {str(e)}")
+
+
+@registry.register_fallback
+def extract_generic(data, extension):
+    """Try to extract text from unknown file types"""
+    try:
+        # Check the raw bytes for NULs once instead of after every trial decode
+        decoder = TextDecoder.from_settings()
+        if decoder.looks_binary(data):
+            return f"Binary file detected. File size: {len(data)} bytes. Text extraction not possible."
+
+        return decoder.decode(data, extension).text.strip()
+    except Exception as e:
+        raise Exception(f"Error processing generic file: {str(e)}")
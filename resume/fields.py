@@ -0,0 +1,146 @@
+import zlib
+
+from django.conf import settings
+from django.db import models
+from django.db.models.query_utils import DeferredAttribute
+
+try:
+    import zstandard
+except ImportError:  # zstd is optional; zlib is always available
+    zstandard = None
+
+# First byte of every stored value says how the rest is encoded
+PLAIN = b'\x00'
+ZLIB = b'\x01'
+ZSTD = b'\x02'
+
+DEFAULT_COMPRESSION = {
+    'ALGORITHM': 'zlib',  # 'zlib' or 'zstd'
+    'LEVEL': 6,
+    'THRESHOLD': 1024,  # values shorter than this many bytes are stored as-is
+}
+
+
+def get_compression_settings():
+    options = dict(DEFAULT_COMPRESSION)
+    options.update(getattr(settings, 'RESUME_COMPRESSION', {}))
+    return options
+
+
+def compress_text(text):
+    """Encode text as header byte + payload, compressing above the threshold"""
+    options = get_compression_settings()
+    raw = text.encode('utf-8')
+    if len(raw) < options['THRESHOLD']:
+        return PLAIN + raw
+    if options['ALGORITHM'] == 'zstd' and zstandard is not None:
+        return ZSTD + zstandard.ZstdCompressor(level=options['LEVEL']).compress(raw)
+    return ZLIB + zlib.compress(raw, options['LEVEL'])
+
+
+def decompress_text(data):
+    """Inverse of compress_text; plain strings from before compression pass through"""
+    if data is None or isinstance(data, str):
+        return data
+    data = bytes(data)
+    header, payload = data[:1], data[1:]
+    if header == ZLIB:
+        return zlib.decompress(payload).decode('utf-8')
+    if header == ZSTD:
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read zstd-compressed values")
+        return zstandard.ZstdDecompressor().decompress(payload).decode('utf-8')
+    return payload.decode('utf-8')
+
+
+class CompressedValue:
+    """Stored bytes of a CompressedTextField that have not been decoded yet
+
+    Model instances decode these on first attribute access. ``values()`` and
+    ``values_list()`` hand them out as-is; use ``str()`` to get the text.
+    """
+
+    __slots__ = ('data',)
+
+    def __init__(self, data):
+        self.data = data
+
+    def __str__(self):
+        return decompress_text(self.data)
+
+    def __repr__(self):
+        return f"<CompressedValue: {len(self.data)} bytes>"
+
+    def __eq__(self, other):
+        if isinstance(other, CompressedValue):
+            return self.data == other.data
+        return NotImplemented
+
+    __hash__ = None
+
+
+class CompressedTextDescriptor(DeferredAttribute):
+    """Decompress on first access and keep the text on the instance
+
+    Defining __set__ makes this a data descriptor, so reads go through
+    __get__ even once the value sits in the instance __dict__.
+    """
+
+    def __get__(self, instance, cls=None):
+        value = super().__get__(instance, cls)
+        if isinstance(value, CompressedValue):
+            value = str(value)
+            instance.__dict__[self.field.attname] = value
+        return value
+
+    def __set__(self, instance, value):
+        instance.__dict__[self.field.attname] = value
+
+
+class CompressedTextField(models.TextField):
+    """TextField stored compressed in a binary column
+
+    Values at least RESUME_COMPRESSION['THRESHOLD'] bytes long are compressed
+    with zlib (or zstd when configured and installed). Loading a row does not
+    decompress anything; the text is decoded when the attribute is read, and
+    saving a row whose value was never read writes the stored bytes back
+    untouched.
+    """
+
+    descriptor_class = CompressedTextDescriptor
+
+    def get_internal_type(self):
+        return 'BinaryField'
+
+    def get_placeholder(self, value, compiler, connection):
+        return connection.ops.binary_placeholder_sql(value)
+
+    def from_db_value(self, value, expression, connection):
+        if value is None or isinstance(value, str):
+            return value
+        return CompressedValue(bytes(value))
+
+    def to_python(self, value):
+        if isinstance(value, CompressedValue):
+            return str(value)
+        return super().to_python(value)
+
+    def pre_save(self, model_instance, add):
+        # Read around the descriptor so untouched values are not decompressed
+        return model_instance.__dict__.get(self.attname)
+
+    def get_prep_value(self, value):
+        if value is None:
+            return None
+        if isinstance(value, CompressedValue):
+            return value.data
+        return compress_text(str(value))
+
+    def get_db_prep_value(self, value, connection, prepared=False):
+        value = super().get_db_prep_value(value, connection, prepared)
+        if value is not None:
+            return connection.Database.Binary(value)
+        return value
+
+    def value_to_string(self, obj):
+        return self.value_from_object(obj)
@@ -0,0 +1,26 @@
+from django.db import models
+from django.db.models import F
+from django.db.models.functions import Collate
+
+
+class PrefixIndex(models.Index):
+    """Index on text columns that serves ``__startswith`` filters
+
+    Django runs startswith as LIKE 'term%', which a plain B-tree serves only
+    under the C collation. PostgreSQL gets varchar_pattern_ops, SQLite
+    (whose LIKE ignores ASCII case) a NOCASE index, and other backends a
+    plain index, which MySQL already uses for prefix LIKE.
+    """
+
+    def for_vendor(self, vendor):
+        if vendor == 'postgresql':
+            return models.Index(
+                fields=self.fields, name=self.name, opclasses=['varchar_pattern_ops'] * len(self.fields)
+            )
+        if vendor == 'sqlite':
+            return models.Index(*(Collate(F(field), 'NOCASE') for field in self.fields), name=self.name)
+        return models.Index(fields=self.fields, name=self.name)
+
+    def create_sql(self, model, schema_editor, using='', **kwargs):
+        index = self.for_vendor(schema_editor.connection.vendor)
+        return index.create_sql(model, schema_editor, using=using, **kwargs)
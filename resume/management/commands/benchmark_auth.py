@@ -0,0 +1,91 @@
+import json
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authentication import SessionAuthentication, TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+from resume.authentication import CachedTokenAuthentication, token_cache
+from resume.enums import ProcessingStatus
+from resume.management.commands.benchmark_extraction import summarize
+from resume.models import Resume
+from resume.views import ResumeStatusView
+
+
+class Command(BaseCommand):
+    help = "Compare queries and latency per status poll with TokenAuthentication and CachedTokenAuthentication"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=50, help="Users, each with one token and one resume")
+        parser.add_argument('--requests', type=int, default=1000, help="Status polls per authentication class")
+        parser.add_argument('--json', action='store_true', help="Print the results as JSON")
+
+    def handle(self, *args, **options):
+        if options['users'] < 1 or options['requests'] < 1:
+            raise CommandError("--users and --requests must be positive")
+
+        results = {}
+        with override_settings(ALLOWED_HOSTS=['testserver']), transaction.atomic():
+            polls = self.create_fixtures(options['users'])
+            for label, authentication in (('token', TokenAuthentication), ('cached_token', CachedTokenAuthentication)):
+                token_cache.clear()
+                results[label] = self.poll(polls, options['requests'], authentication)
+            transaction.set_rollback(True)
+        token_cache.clear()
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        for label, row in results.items():
+            self.stdout.write(
+                f"{label:>12}: {row['queries_per_request']:.2f} queries/request "
+                f"({row['auth_queries_per_request']:.2f} for auth), {row['ops_per_second']:>8}/s, "
+                f"p50 {row['p50_ms']} ms, p99 {row['p99_ms']} ms"
+            )
+
+    def create_fixtures(self, count):
+        """(token key, resume id) for count fresh users"""
+        prefix = f'benchmark-auth-{time.time_ns()}'
+        polls = []
+        for index in range(count):
+            user = User.objects.create_user(username=f'{prefix}-{index}')
+            token = Token.objects.create(user=user)
+            resume = Resume.objects.create(
+                user=user,
+                original_filename='resume.txt',
+                file_type='.txt',
+                parsed_content='Python developer',
+                processing_status=ProcessingStatus.COMPLETED.value,
+            )
+            polls.append((token.key, resume.id))
+        return polls
+
+    def poll(self, polls, requests, authentication):
+        """Poll the status endpoint round-robin over every user's token"""
+        client = Client()
+        previous = ResumeStatusView.authentication_classes
+        ResumeStatusView.authentication_classes = [SessionAuthentication, authentication]
+        timings = []
+        queries = auth_queries = 0
+        try:
+            for index in range(requests):
+                key, resume_id = polls[index % len(polls)]
+                with CaptureQueriesContext(connection) as captured:
+                    began = time.perf_counter()
+                    response = client.get(f'/api/status/{resume_id}/', HTTP_AUTHORIZATION=f'Token {key}')
+                    timings.append(time.perf_counter() - began)
+                if response.status_code != 200:
+                    raise CommandError(f"Status poll failed with {response.status_code}")
+                queries += len(captured)
+                auth_queries += sum('authtoken_token' in query['sql'] for query in captured.captured_queries)
+        finally:
+            ResumeStatusView.authentication_classes = previous
+
+        result = summarize(timings, 0)
+        result["queries_per_request"] = queries / requests
+        result["auth_queries_per_request"] = auth_queries / requests
+        return result
@@ -0,0 +1,87 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+
+from resume.corpus import generate_resume_text
+from resume.fields import compress_text, decompress_text, zstandard
+from resume.models import Resume
+from resume.search import fts_available
+
+
+class Command(BaseCommand):
+    help = "Measure storage ratio and read overhead of compressed parsed_content"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--documents', type=int, default=500, help="Synthetic documents to generate")
+        parser.add_argument('--size', type=int, default=6000, help="Approximate characters per document")
+        parser.add_argument('--from-db', action='store_true', help="Use existing Resume.parsed_content instead")
+        parser.add_argument('--json', action='store_true', help="Print the results as JSON")
+
+    def handle(self, *args, **options):
+        corpus = self.load_corpus(options)
+        raw_bytes = sum(len(text.encode('utf-8')) for text in corpus)
+        results = {"documents": len(corpus), "raw_bytes": raw_bytes, "algorithms": {}}
+
+        # Baseline read: what a plain TextField pays to hand back the value
+        started = time.perf_counter()
+        for text in corpus:
+            text.encode('utf-8').decode('utf-8')
+        baseline = (time.perf_counter() - started) / len(corpus)
+
+        candidates = [('zlib-1', 'zlib', 1), ('zlib-6', 'zlib', 6), ('zlib-9', 'zlib', 9)]
+        if zstandard is not None:
+            candidates += [('zstd-3', 'zstd', 3), ('zstd-10', 'zstd', 10)]
+
+        for label, algorithm, level in candidates:
+            # Threshold 0 so every document is measured compressed
+            with override_settings(RESUME_COMPRESSION={'ALGORITHM': algorithm, 'LEVEL': level, 'THRESHOLD': 0}):
+                started = time.perf_counter()
+                stored = [compress_text(text) for text in corpus]
+                compress_time = time.perf_counter() - started
+
+            started = time.perf_counter()
+            for data in stored:
+                decompress_text(data)
+            read_time = (time.perf_counter() - started) / len(corpus)
+
+            stored_bytes = sum(len(data) for data in stored)
+            # With FTS5 the search index keeps its own plaintext copy of every
+            # document, which compression does not shrink
+            search_copy = raw_bytes if fts_available() else 0
+            results["algorithms"][label] = {
+                "stored_bytes": stored_bytes,
+                "ratio": round(raw_bytes / stored_bytes, 2),
+                "stored_with_search_copy_bytes": stored_bytes + search_copy,
+                "net_ratio": round((raw_bytes + search_copy) / (stored_bytes + search_copy), 2),
+                "compress_us_per_doc": round(compress_time / len(corpus) * 1e6, 1),
+                "read_us_per_doc": round(read_time * 1e6, 1),
+                "read_overhead_us_per_doc": round((read_time - baseline) * 1e6, 1),
+            }
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+
+        self.stdout.write(f"{len(corpus)} documents, {raw_bytes / 1024:.1f} KiB raw")
+        if fts_available():
+            self.stdout.write(
+                f"The full-text index stores another {raw_bytes / 1024:.1f} KiB of plaintext (before its own index), "
+                "on both sides of the net ratio"
+            )
+        for label, row in results["algorithms"].items():
+            self.stdout.write(
+                f"{label:>8}: ratio {row['ratio']:>5}x (net {row['net_ratio']}x), "
+                f"{row['stored_bytes'] / 1024:>8.1f} KiB stored, "
+                f"compress {row['compress_us_per_doc']:>7} us/doc, "
+                f"read +{row['read_overhead_us_per_doc']} us/doc"
+            )
+
+    def load_corpus(self, options):
+        if options['from_db']:
+            return [
+                resume.parsed_content
+                for resume in Resume.objects.filter(parsed_content__isnull=False).only('parsed_content').iterator()
+            ]
+        return [generate_resume_text(seed, options['size']) for seed in range(options['documents'])]
@@ -0,0 +1,105 @@
+import json
+import time
+
+import chardet
+from django.core.management.base import BaseCommand, CommandError
+
+from resume.corpus import LOCATIONS_LINE, generate_resume_text
+from resume.decoding import TextDecoder
+
+
+def legacy_text_decode(raw):
+    """Previous extract_text_file_from_memory: chardet over the whole buffer"""
+    detected = chardet.detect(raw)
+    return raw.decode(detected['encoding'] or 'utf-8').strip()
+
+
+def legacy_generic_decode(raw):
+    """Previous extract_generic_text_from_memory: up to four trial decodes"""
+    for encoding in ['utf-8', 'latin-1', 'cp1252', 'iso-8859-1']:
+        try:
+            content = raw.decode(encoding)
+            if content.count('\x00') < len(content) * 0.1:
+                return content.strip()
+        except UnicodeDecodeError:
+            continue
+    return None
+
+
+class Command(BaseCommand):
+    help = "Compare sample-based text decoding with full-buffer chardet on large files"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='262144,1048576,4194304', help="Comma-separated file sizes in bytes")
+        parser.add_argument('--encodings', default='utf-8,utf-16,latin-1,cp1252', help="Comma-separated encodings")
+        parser.add_argument('--repeat', type=int, default=3, help="Runs per case; the fastest is reported")
+        parser.add_argument('--json', action='store_true', help="Print the results as JSON")
+
+    def handle(self, *args, **options):
+        try:
+            sizes = [int(size) for size in options['sizes'].split(',')]
+        except ValueError:
+            raise CommandError("--sizes must be a comma-separated list of integers")
+        encodings = [encoding.strip() for encoding in options['encodings'].split(',')]
+
+        results = []
+        for encoding in encodings:
+            for size in sizes:
+                raw = self.build_document(size, encoding)
+                decoder = TextDecoder.from_settings()
+                decoder.cache.clear()
+
+                legacy_text, legacy_seconds = self.measure(legacy_text_decode, raw, options['repeat'])
+                result = None
+
+                def decode(data):
+                    nonlocal result
+                    result = decoder.decode(data)
+                    return result.text.strip()
+
+                text, seconds = self.measure(decode, raw, options['repeat'])
+                _, generic_legacy_seconds = self.measure(legacy_generic_decode, raw, options['repeat'])
+                # Unknown extensions reuse the last encoding, so repeats hit the cache
+                _, generic_seconds = self.measure(
+                    lambda data: decoder.looks_binary(data) or decoder.decode(data, '.dat').text.strip(),
+                    raw, options['repeat']
+                )
+                results.append({
+                    "encoding": encoding,
+                    "bytes": len(raw),
+                    "detected": result.encoding,
+                    "method": result.method,
+                    "matches_legacy": text == legacy_text,
+                    "text_legacy_ms": round(legacy_seconds * 1000, 2),
+                    "text_ms": round(seconds * 1000, 2),
+                    "text_speedup": round(legacy_seconds / seconds, 1) if seconds else None,
+                    "generic_legacy_ms": round(generic_legacy_seconds * 1000, 2),
+                    "generic_ms": round(generic_seconds * 1000, 2),
+                })
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+
+        for row in results:
+            self.stdout.write(
+                f"{row['encoding']:>8} {row['bytes'] / 1024:>8.0f} KiB: "
+                f"text {row['text_legacy_ms']:>9} -> {row['text_ms']:>7} ms ({row['text_speedup']}x, "
+                f"{row['method']} {row['detected']}, {'same' if row['matches_legacy'] else 'DIFFERENT'} text), "
+                f"generic {row['generic_legacy_ms']} -> {row['generic_ms']} ms"
+            )
+
+    def build_document(self, size, encoding):
+        """Resume text repeated up to roughly size bytes once encoded"""
+        chunk = generate_resume_text(0, 4000) + f"\n{LOCATIONS_LINE}\n"
+        chunk_bytes = len(chunk.encode(encoding))
+        return (chunk * max(1, size // chunk_bytes)).encode(encoding)
+
+    def measure(self, func, raw, repeat):
+        best, value = None, None
+        for _ in range(max(1, repeat)):
+            started = time.perf_counter()
+            value = func(raw)
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return value, best
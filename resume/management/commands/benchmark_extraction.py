@@ -0,0 +1,183 @@
+import io
+import json
+import math
+import platform
+import time
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import override_settings
+from rest_framework.test import APIClient
+
+from resume.corpus import CORPUS_TYPES, generate_corpus
+from resume.services import extraction_cache
+from resume.views import ResumeUploadView
+
+
+def peak_rss_kib():
+    """Peak resident set size of this process so far, in KiB"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and KiB on Linux
+    return peak // 1024 if platform.system() == 'Darwin' else peak
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    # Smallest value with at least fraction of the data at or below it; the
+    # rounding only absorbs float error such as 0.07 * 100 == 7.000000000000001
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(round(fraction * len(sorted_values), 9)) - 1))
+    return sorted_values[rank]
+
+
+def summarize(timings, payload_bytes):
+    """Throughput and latency percentiles (milliseconds) for one benchmark"""
+    timings = sorted(timings)
+    total = sum(timings)
+    return {
+        "runs": len(timings),
+        "ops_per_second": round(len(timings) / total, 1) if total else 0.0,
+        "mb_per_second": round(payload_bytes / total / 1e6, 2) if total else 0.0,
+        "p50_ms": round(percentile(timings, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(timings, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(timings, 0.99) * 1000, 3),
+        "max_ms": round(timings[-1] * 1000, 3) if timings else 0.0,
+        "peak_rss_kib": peak_rss_kib(),
+    }
+
+
+class Command(BaseCommand):
+    help = "Benchmark resume extraction and the upload/status/list endpoints on a synthetic corpus"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--documents', type=int, default=40, help="Synthetic documents to generate")
+        parser.add_argument('--sizes', default='2000,8000,32000', help="Comma-separated characters per document")
+        parser.add_argument('--types', default=','.join(CORPUS_TYPES), help="Comma-separated file extensions")
+        parser.add_argument('--iterations', type=int, default=3, help="Passes over the corpus per benchmark")
+        parser.add_argument('--seed', type=int, default=0, help="Corpus seed; keep it fixed when comparing commits")
+        parser.add_argument('--skip-endpoints', action='store_true', help="Only benchmark the extract_* paths")
+        parser.add_argument('--json', action='store_true', help="Print the results as JSON")
+        parser.add_argument('--output', help="Also write the JSON results to this file")
+
+    def handle(self, *args, **options):
+        try:
+            sizes = [int(size) for size in options['sizes'].split(',')]
+        except ValueError:
+            raise CommandError("--sizes must be a comma-separated list of integers")
+        file_types = [extension.strip().lower() for extension in options['types'].split(',')]
+        unknown = set(file_types) - set(CORPUS_TYPES)
+        if unknown:
+            raise CommandError(f"Unsupported corpus types: {', '.join(sorted(unknown))}")
+
+        started = time.perf_counter()
+        corpus = generate_corpus(options['documents'], sizes, file_types, options['seed'])
+        results = {
+            "corpus": {
+                "documents": len(corpus),
+                "bytes": sum(len(document['data']) for document in corpus),
+                "sizes": sizes,
+                "types": file_types,
+                "seed": options['seed'],
+                "generate_seconds": round(time.perf_counter() - started, 3),
+            },
+            "iterations": options['iterations'],
+            "extraction": self.benchmark_extraction(corpus, options['iterations']),
+        }
+        if not options['skip_endpoints']:
+            results["endpoints"] = self.benchmark_endpoints(corpus, options['iterations'])
+        results["peak_rss_kib"] = peak_rss_kib()
+
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(results, output, indent=2)
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        self.print_table(results)
+
+    def benchmark_extraction(self, corpus, iterations):
+        """Time ResumeUploadView's extract_* path for every file type"""
+        view = ResumeUploadView()
+        results = {}
+        for extension in sorted({document['extension'] for document in corpus}):
+            documents = [document for document in corpus if document['extension'] == extension]
+            timings = []
+            for _ in range(iterations):
+                for document in documents:
+                    file_obj = io.BytesIO(document['data'])
+                    began = time.perf_counter()
+                    view.extract_content_from_file(file_obj, extension)
+                    timings.append(time.perf_counter() - began)
+            results[extension] = summarize(timings, sum(len(document['data']) for document in documents) * iterations)
+        return results
+
+    def benchmark_endpoints(self, corpus, iterations):
+        """Time upload, status and list through the test client, rolled back afterwards"""
+        timings = {'upload': [], 'status': [], 'list': []}
+        uploaded_bytes = 0
+        # Measures the views, not admission control, so nothing is throttled
+        overrides = override_settings(
+            ALLOWED_HOSTS=['testserver'], RESUME_ASYNC_PROCESSING=False, RESUME_ADMISSION={'THROTTLES': {}}
+        )
+        with overrides, transaction.atomic():
+            user = User.objects.create_user(username=f'benchmark-{time.time_ns()}')
+            client = APIClient()
+            client.force_authenticate(user=user)
+            resume_ids = []
+
+            for _ in range(iterations):
+                for document in corpus:
+                    # Measure the full extraction path, not a dedup hit
+                    extraction_cache.clear()
+                    upload = SimpleUploadedFile(document['name'], document['data'])
+                    began = time.perf_counter()
+                    response = client.post('/api/upload/', {'resume': upload}, format='multipart')
+                    timings['upload'].append(time.perf_counter() - began)
+                    if response.status_code != 201:
+                        raise CommandError(f"Upload of {document['name']} failed: {response.data}")
+                    uploaded_bytes += len(document['data'])
+                    resume_ids.append(response.data['resume_id'])
+
+            for resume_id in resume_ids:
+                began = time.perf_counter()
+                client.get(f'/api/status/{resume_id}/')
+                timings['status'].append(time.perf_counter() - began)
+
+            for _ in range(len(resume_ids)):
+                began = time.perf_counter()
+                client.get('/api/list/', {'page_size': 20})
+                timings['list'].append(time.perf_counter() - began)
+
+            transaction.set_rollback(True)
+        extraction_cache.clear()
+
+        return {
+            'upload': summarize(timings['upload'], uploaded_bytes),
+            'status': summarize(timings['status'], 0),
+            'list': summarize(timings['list'], 0),
+        }
+
+    def print_table(self, results):
+        corpus = results["corpus"]
+        self.stdout.write(
+            f"{corpus['documents']} documents, {corpus['bytes'] / 1024:.1f} KiB, "
+            f"{results['iterations']} iterations"
+        )
+        rows = [(f"extract {extension}", row) for extension, row in results["extraction"].items()]
+        rows += [(endpoint, row) for endpoint, row in results.get("endpoints", {}).items()]
+        for label, row in rows:
+            self.stdout.write(
+                f"{label:>14}: {row['ops_per_second']:>8}/s {row['mb_per_second']:>7} MB/s  "
+                f"p50 {row['p50_ms']:>8} ms  p95 {row['p95_ms']:>8} ms  p99 {row['p99_ms']:>8} ms"
+            )
+        self.stdout.write(f"peak RSS {results['peak_rss_kib']} KiB")
@@ -0,0 +1,130 @@
+import json
+import re
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from resume.corpus import LOCATIONS_LINE, build_rtf, generate_resume_text
+from resume.decoding import TextDecoder
+from resume.rtf import DESTINATIONS, SPECIAL_CHARACTERS, rtf_to_text
+
+# The widely copied regex stripper: one match per control word and per
+# plain-text character, with ignorable groups tracked on a stack
+REGEX_TOKEN = re.compile(r"\\([a-z]{1,32})(-?\d{1,10})?[ ]?|\\'([0-9a-f]{2})|\\([^a-z])|([{}])|[\r\n]+|(.)", re.I)
+REGEX_DESTINATIONS = {word.decode() for word in DESTINATIONS}
+REGEX_SPECIALS = {word.decode(): text for word, text in SPECIAL_CHARACTERS.items()}
+
+
+def regex_strip_rtf(data):
+    """Strip RTF markup with a single regex and a per-match callback"""
+    stack = []
+    ignorable = False
+    ucskip = 1
+    curskip = 0
+    out = []
+    for match in REGEX_TOKEN.finditer(data.decode('latin-1')):
+        word, arg, hex_code, char, brace, text = match.groups()
+        if brace:
+            curskip = 0
+            if brace == '{':
+                stack.append((ucskip, ignorable))
+            elif stack:
+                ucskip, ignorable = stack.pop()
+        elif char:
+            curskip = 0
+            if char == '*':
+                ignorable = True
+            elif not ignorable and char in REGEX_SPECIALS:
+                out.append(REGEX_SPECIALS[char])
+        elif word:
+            curskip = 0
+            if word in REGEX_DESTINATIONS:
+                ignorable = True
+            elif ignorable:
+                pass
+            elif word in REGEX_SPECIALS:
+                out.append(REGEX_SPECIALS[word])
+            elif word == 'uc':
+                ucskip = int(arg)
+            elif word == 'u':
+                code = int(arg)
+                out.append(chr(code + 0x10000 if code < 0 else code))
+                curskip = ucskip
+        elif hex_code:
+            if curskip > 0:
+                curskip -= 1
+            elif not ignorable:
+                out.append(bytes([int(hex_code, 16)]).decode('cp1252', errors='replace'))
+        elif text:
+            if curskip > 0:
+                curskip -= 1
+            elif not ignorable:
+                out.append(text)
+    return ''.join(out)
+
+
+class Command(BaseCommand):
+    help = "Compare the streaming RTF extractor with a regex stripper on documents with embedded pictures"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='1048576,4194304,16777216', help="Comma-separated file sizes in bytes")
+        parser.add_argument('--picture-share', type=float, default=0.8,
+                            help="Share of each file taken up by hex-encoded pictures")
+        parser.add_argument('--repeat', type=int, default=3, help="Runs per case; the fastest is reported")
+        parser.add_argument('--json', action='store_true', help="Print the results as JSON")
+
+    def handle(self, *args, **options):
+        try:
+            sizes = [int(size) for size in options['sizes'].split(',')]
+        except ValueError:
+            raise CommandError("--sizes must be a comma-separated list of integers")
+        if not 0 <= options['picture_share'] < 1:
+            raise CommandError("--picture-share must be at least 0 and below 1")
+
+        results = []
+        for size in sizes:
+            raw = self.build_document(size, options['picture_share'])
+            text, seconds = self.measure(rtf_to_text, raw, options['repeat'])
+            regex_text, regex_seconds = self.measure(regex_strip_rtf, raw, options['repeat'])
+            # What .rtf uploads stored before: the decoded markup itself
+            stored = TextDecoder().decode(raw).text.strip()
+            results.append({
+                "bytes": len(raw),
+                "text_chars": len(text.strip()),
+                "previous_stored_chars": len(stored),
+                "matches_regex": text.strip() == regex_text.strip(),
+                "regex_ms": round(regex_seconds * 1000, 2),
+                "streaming_ms": round(seconds * 1000, 2),
+                "streaming_mb_per_s": round(len(raw) / seconds / 1e6, 1) if seconds else None,
+                "speedup": round(regex_seconds / seconds, 1) if seconds else None,
+            })
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+
+        for row in results:
+            self.stdout.write(
+                f"{row['bytes'] / 1024 / 1024:>6.1f} MiB: regex {row['regex_ms']:>9} ms, "
+                f"streaming {row['streaming_ms']:>8} ms ({row['speedup']}x, {row['streaming_mb_per_s']} MB/s), "
+                f"{row['previous_stored_chars']} -> {row['text_chars']} chars stored, "
+                f"{'same' if row['matches_regex'] else 'DIFFERENT'} text"
+            )
+
+    def build_document(self, size, picture_share):
+        """Resume RTF of roughly size bytes, picture_share of it pictures"""
+        chunk = generate_resume_text(0, 4000) + f"\n{LOCATIONS_LINE}\n"
+        text_bytes = len(build_rtf(chunk))
+        text = '\n'.join([chunk] * max(1, int(size * (1 - picture_share)) // text_bytes))
+        # Each picture is written twice (PNG plus metafile fallback) as hex
+        pictures = max(1, int(size * picture_share) // (256 * 1024)) if picture_share else 0
+        return build_rtf(text, pictures=pictures)
+
+    def measure(self, func, raw, repeat):
+        best, value = None, None
+        for _ in range(max(1, repeat)):
+            started = time.perf_counter()
+            value = func(raw)
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return value, best
@@ -0,0 +1,56 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from resume.enums import ProcessingStatus
+from resume.export import CHUNK_SIZE, FORMATS, export_queryset, iter_export, parse_export_time
+from resume.models import Resume
+from resume.pagination import InvalidCursor
+
+
+class Command(BaseCommand):
+    help = "Stream resumes, optionally with parsed content and questions, as NDJSON or CSV"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', choices=sorted(FORMATS), default='ndjson', help="Output format")
+        parser.add_argument('--output', help="File to write; standard output by default")
+        parser.add_argument('--user', help="Only this username's resumes")
+        parser.add_argument('--status', choices=[choice for choice, _ in ProcessingStatus.get_choices()])
+        parser.add_argument('--since', help="Uploaded at or after this ISO date or datetime")
+        parser.add_argument('--until', help="Uploaded before this ISO date or datetime")
+        parser.add_argument('--cursor', help="Continue after the row that carried this cursor")
+        parser.add_argument('--include-content', action='store_true', help="Add parsed_content")
+        parser.add_argument('--include-questions', action='store_true', help="Add generated questions")
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help="Rows fetched per query")
+
+    def handle(self, *args, **options):
+        if options['chunk_size'] < 1:
+            raise CommandError("--chunk-size must be positive")
+        resumes = Resume.objects.all()
+        if options['user']:
+            try:
+                resumes = resumes.filter(user=User.objects.get(username=options['user']))
+            except User.DoesNotExist:
+                raise CommandError(f"No user named {options['user']}")
+        if options['status']:
+            resumes = resumes.filter(processing_status=options['status'])
+        try:
+            since, until = (parse_export_time(options[name]) if options[name] else None for name in ('since', 'until'))
+            resumes = export_queryset(
+                resumes, since, until, options['cursor'],
+                include_content=options['include_content'], include_questions=options['include_questions']
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+        except InvalidCursor:
+            raise CommandError("Invalid cursor")
+
+        chunks = iter_export(
+            resumes, options['format'], options['include_content'], options['include_questions'],
+            options['chunk_size']
+        )
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8', newline='') as stream:
+                stream.writelines(chunks)
+        else:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending='')
@@ -0,0 +1,389 @@
+import atexit
+import contextlib
+import functools
+import glob
+import hmac
+import inspect
+import json
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from rest_framework.permissions import BasePermission
+
+try:
+    import fcntl
+except ImportError:  # Windows: snapshots of exited processes are not compacted
+    fcntl = None
+
+DEFAULT_METRICS = {
+    'ENABLED': False,
+    # Directory shared by every worker process on the host; None keeps the
+    # registry process-local
+    'MULTIPROCESS_DIR': None,
+    'FLUSH_INTERVAL': 5.0,  # seconds between snapshot writes per process
+    # Bearer token a scraper sends to read /metrics; staff users may always
+    # read it, and with no token nobody else can
+    'TOKEN': None,
+}
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+METRIC_HELP = {
+    'resume_stage_duration_seconds': ('histogram', "Time spent in each stage of a request or task"),
+    'resume_request_duration_seconds': ('histogram', "End-to-end view handling time"),
+    'resume_task_duration_seconds': ('histogram', "Celery task run time"),
+    'resume_uploads_total': ('counter', "Uploaded resumes by file type and processing status"),
+    'resume_upload_rejections_total': ('counter', "Uploads rejected before extraction, by reason"),
+    'resume_status_polls_total': ('counter', "Status endpoint responses by processing status"),
+    'resume_tasks_total': ('counter', "Celery task runs by outcome"),
+}
+
+
+def get_metrics_settings():
+    """Merge RESUME_METRICS from settings over the defaults"""
+    options = dict(DEFAULT_METRICS)
+    options.update(getattr(settings, 'RESUME_METRICS', {}))
+    return options
+
+
+def _label_key(labels):
+    return tuple(sorted(labels.items()))
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(key, extra=()):
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _merge(counters, histograms, snapshot):
+    """Add one snapshot's values into the running totals"""
+    for name, key, value in snapshot['counters']:
+        key = (name, tuple(tuple(pair) for pair in key))
+        counters[key] = counters.get(key, 0) + value
+    for name, key, values in snapshot['histograms']:
+        key = (name, tuple(tuple(pair) for pair in key))
+        if key not in histograms:
+            histograms[key] = list(values)
+        else:
+            histograms[key] = [total + value for total, value in zip(histograms[key], values)]
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # exists, owned by another user
+    return True
+
+
+def _write_json(path, data):
+    temporary = f"{path}.tmp"
+    with open(temporary, 'w') as output:
+        json.dump(data, output)
+    os.replace(temporary, path)
+
+
+def _format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _NullTimer:
+    """Stand-in for StageTimer while metrics are disabled"""
+
+    _context = contextlib.nullcontext()
+
+    def __call__(self, stage):
+        return self._context
+
+
+NULL_TIMER = _NullTimer()
+
+
+class StageTimer:
+    """Times named stages of one request or task into a labelled histogram"""
+
+    def __init__(self, registry, name, labels):
+        self.registry = registry
+        self.name = name
+        self.labels = labels
+
+    @contextlib.contextmanager
+    def __call__(self, stage):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.registry.observe(self.name, time.perf_counter() - started, stage=stage, **self.labels)
+
+
+class MetricsRegistry:
+    """In-process counters and histograms rendered in Prometheus text format
+
+    With MULTIPROCESS_DIR set, each process periodically writes a snapshot
+    of its own values to that directory and a scrape sums every snapshot, so
+    /metrics on any web worker reports totals for all web and Celery
+    workers on the host. Snapshots of exited processes are folded into one
+    aggregate file at scrape time, so counters never go backwards and the
+    directory does not grow with every worker restart. Liveness is checked
+    by PID, so the directory must not be shared across PID namespaces.
+    """
+
+    AGGREGATE_NAME = 'aggregate.json'
+    LOCK_NAME = 'metrics.lock'
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+        self._last_flush = 0.0
+        self._enabled = None
+        self._snapshot_name = self._new_snapshot_name()
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._after_fork)
+
+    @staticmethod
+    def _new_snapshot_name():
+        return f"metrics-{os.getpid()}-{time.time_ns()}.json"
+
+    def _after_fork(self):
+        # Prefork Celery and gunicorn children must not report the parent's
+        # values a second time
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+        self._last_flush = 0.0
+        self._snapshot_name = self._new_snapshot_name()
+
+    @property
+    def enabled(self):
+        # Read once: this is checked on every hot-path call even when disabled
+        if self._enabled is None:
+            self._enabled = bool(get_metrics_settings()['ENABLED'])
+        return self._enabled
+
+    def settings_changed(self):
+        self._enabled = None
+
+    def inc(self, name, amount=1, **labels):
+        if not self.enabled:
+            return
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+        self.maybe_flush()
+
+    def observe(self, name, value, **labels):
+        if not self.enabled:
+            return
+        key = (name, _label_key(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                # Per-bucket counts, then the overflow bucket, sum and count
+                histogram = self._histograms[key] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    break
+            else:
+                index = len(self.buckets)
+            histogram[index] += 1
+            histogram[-2] += value
+            histogram[-1] += 1
+        self.maybe_flush()
+
+    def stage_timer(self, name='resume_stage_duration_seconds', **labels):
+        """Return a callable giving a context manager per stage"""
+        if not self.enabled:
+            return NULL_TIMER
+        return StageTimer(self, name, labels)
+
+    def timed(self, name, **labels):
+        """Decorator recording the wrapped call's duration"""
+        def decorator(func):
+            if inspect.iscoroutinefunction(func):
+                @functools.wraps(func)
+                async def async_wrapper(*args, **kwargs):
+                    if not self.enabled:
+                        return await func(*args, **kwargs)
+                    started = time.perf_counter()
+                    try:
+                        return await func(*args, **kwargs)
+                    finally:
+                        self.observe(name, time.perf_counter() - started, **labels)
+                return async_wrapper
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                started = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.observe(name, time.perf_counter() - started, **labels)
+            return wrapper
+        return decorator
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'counters': [[name, list(key), value] for (name, key), value in self._counters.items()],
+                'histograms': [[name, list(key), list(values)] for (name, key), values in self._histograms.items()],
+            }
+
+    def maybe_flush(self):
+        options = get_metrics_settings()
+        if options['MULTIPROCESS_DIR'] and time.monotonic() - self._last_flush >= options['FLUSH_INTERVAL']:
+            self.flush()
+
+    def flush(self):
+        """Write this process's values to the shared directory"""
+        directory = get_metrics_settings()['MULTIPROCESS_DIR']
+        if not directory:
+            return
+        self._last_flush = time.monotonic()
+        os.makedirs(directory, exist_ok=True)
+        _write_json(os.path.join(directory, self._snapshot_name), self.snapshot())
+
+    @staticmethod
+    def _read(path):
+        try:
+            with open(path) as snapshot_file:
+                return json.load(snapshot_file)
+        except (OSError, ValueError):
+            return None  # removed or being replaced mid-scrape
+
+    def _compact(self, directory, aggregate):
+        """Fold snapshots of exited processes into the aggregate file
+
+        Merged names are recorded in the aggregate before the files are
+        deleted, so a crash in between cannot count a snapshot twice.
+        """
+        merged = [name for name in aggregate.get('merged', []) if os.path.exists(os.path.join(directory, name))]
+        counters, histograms = {}, {}
+        _merge(counters, histograms, aggregate)
+        dead = []
+        for path in glob.glob(os.path.join(directory, 'metrics-*.json')):
+            name = os.path.basename(path)
+            try:
+                pid = int(name.split('-')[1])
+            except (IndexError, ValueError):
+                continue
+            if name in merged or _pid_alive(pid):
+                continue
+            snapshot = self._read(path)
+            if snapshot is not None:
+                _merge(counters, histograms, snapshot)
+                dead.append(name)
+        if not dead:
+            aggregate['merged'] = merged
+            return aggregate
+        aggregate = {
+            'counters': [[name, list(key), value] for (name, key), value in counters.items()],
+            'histograms': [[name, list(key), values] for (name, key), values in histograms.items()],
+            'merged': merged + dead,
+        }
+        _write_json(os.path.join(directory, self.AGGREGATE_NAME), aggregate)
+        for name in aggregate['merged']:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(os.path.join(directory, name))
+        return aggregate
+
+    def _collect_directory(self, directory):
+        self.flush()
+        with open(os.path.join(directory, self.LOCK_NAME), 'a') as lock:
+            if fcntl is not None:
+                # One scrape at a time, so two workers never fold the same file
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            aggregate = self._read(os.path.join(directory, self.AGGREGATE_NAME))
+            aggregate = aggregate or {'counters': [], 'histograms': [], 'merged': []}
+            if fcntl is not None:
+                aggregate = self._compact(directory, aggregate)
+            snapshots = [aggregate]
+            for path in glob.glob(os.path.join(directory, 'metrics-*.json')):
+                if os.path.basename(path) in aggregate['merged']:
+                    continue
+                snapshot = self._read(path)
+                if snapshot is not None:
+                    snapshots.append(snapshot)
+        return snapshots
+
+    def collect(self):
+        """Merge the snapshots of every process (or just this one)"""
+        directory = get_metrics_settings()['MULTIPROCESS_DIR']
+        snapshots = self._collect_directory(directory) if directory else [self.snapshot()]
+        counters, histograms = {}, {}
+        for snapshot in snapshots:
+            _merge(counters, histograms, snapshot)
+        return counters, histograms
+
+    def render(self):
+        """Prometheus text exposition format (version 0.0.4)"""
+        counters, histograms = self.collect()
+        lines = []
+        names = sorted({name for name, _ in counters} | {name for name, _ in histograms})
+        counter_names = {name for name, _ in counters}
+        for name in names:
+            metric_type, help_text = METRIC_HELP.get(
+                name, ('counter' if name in counter_names else 'histogram', name)
+            )
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            for (metric, key), value in sorted(counters.items()):
+                if metric == name:
+                    lines.append(f"{name}{_format_labels(key)} {_format_value(value)}")
+            for (metric, key), values in sorted(histograms.items()):
+                if metric != name:
+                    continue
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float('inf'),), values):
+                    cumulative += count
+                    le = '+Inf' if bound == float('inf') else repr(bound)
+                    lines.append(f"{name}_bucket{_format_labels(key, [('le', le)])} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(key)} {_format_value(values[-2])}")
+                lines.append(f"{name}_count{_format_labels(key)} {values[-1]}")
+        return '\n'.join(lines) + '\n'
+
+
+metrics = MetricsRegistry()
+
+
+class ScrapePermission(BasePermission):
+    """Staff users, or a scraper presenting RESUME_METRICS['TOKEN'] as a bearer token"""
+
+    def has_permission(self, request, view):
+        if request.user and request.user.is_staff:
+            return True
+        token = get_metrics_settings()['TOKEN']
+        scheme, _, credentials = request.META.get('HTTP_AUTHORIZATION', '').partition(' ')
+        return bool(token) and scheme.lower() == 'bearer' and hmac.compare_digest(credentials.encode(), token.encode())
+
+
+def _reload_settings(setting, **kwargs):
+    if setting == 'RESUME_METRICS':
+        metrics.settings_changed()
+
+
+setting_changed.connect(_reload_settings)
+
+
+@atexit.register
+def _flush_at_exit():
+    if metrics.enabled:
+        metrics.flush()
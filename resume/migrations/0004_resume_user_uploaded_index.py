@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:28
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resume', '0003_resume_content_hash'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='resume',
+            index=models.Index(fields=['user', '-uploaded_at'], name='resume_user_uploaded_idx'),
+        ),
+    ]
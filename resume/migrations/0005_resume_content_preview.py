@@ -0,0 +1,50 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:29
+
+from django.db import migrations, models
+
+PREVIEW_LENGTH = 500
+BATCH_SIZE = 500
+
+
+def backfill_previews(apps, schema_editor):
+    Resume = apps.get_model("resume", "Resume")
+    last_id = 0
+    while True:
+        batch = list(
+            Resume.objects.filter(id__gt=last_id, parsed_content__isnull=False)
+            .order_by("id")
+            .only("id", "parsed_content")[:BATCH_SIZE]
+        )
+        if not batch:
+            break
+        for resume in batch:
+            content = resume.parsed_content
+            resume.content_preview = (
+                content[:PREVIEW_LENGTH] + "..."
+                if len(content) > PREVIEW_LENGTH
+                else content
+            )
+            resume.content_length = len(content)
+        Resume.objects.bulk_update(batch, ["content_preview", "content_length"])
+        last_id = batch[-1].id
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("resume", "0004_resume_user_uploaded_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="resume",
+            name="content_length",
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="resume",
+            name="content_preview",
+            field=models.TextField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_previews, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:41
+
+from django.db import migrations
+
+
+def create_fts_table(apps, schema_editor):
+    # Only SQLite has FTS5; other backends use the icontains fallback.
+    # The table holds a full plaintext copy of parsed_content; 0011 rebuilds
+    # it with the owner indexed.
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    schema_editor.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS resume_resume_fts USING fts5("
+        "user_id UNINDEXED, parsed_content, tokenize='porter unicode61')"
+    )
+    schema_editor.execute(
+        "INSERT INTO resume_resume_fts (rowid, user_id, parsed_content) "
+        "SELECT id, user_id, parsed_content FROM resume_resume "
+        "WHERE parsed_content IS NOT NULL"
+    )
+
+
+def drop_fts_table(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    schema_editor.execute("DROP TABLE IF EXISTS resume_resume_fts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("resume", "0005_resume_content_preview"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts_table, drop_fts_table),
+    ]
@@ -0,0 +1,69 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:20
+
+from django.db import migrations
+
+import resume.fields
+
+BATCH_SIZE = 500
+
+
+def copy_parsed_content(apps, schema_editor):
+    Resume = apps.get_model("resume", "Resume")
+    last_id = 0
+    while True:
+        batch = list(
+            Resume.objects.filter(id__gt=last_id)
+            .order_by("id")
+            .only("id", "parsed_content")[:BATCH_SIZE]
+        )
+        if not batch:
+            break
+        for resume in batch:
+            # Assigning the text lets CompressedTextField compress it on save
+            resume.compressed_content = resume.parsed_content
+        Resume.objects.bulk_update(batch, ["compressed_content"])
+        last_id = batch[-1].id
+
+
+def restore_parsed_content(apps, schema_editor):
+    Resume = apps.get_model("resume", "Resume")
+    last_id = 0
+    while True:
+        batch = list(
+            Resume.objects.filter(id__gt=last_id)
+            .order_by("id")
+            .only("id", "compressed_content")[:BATCH_SIZE]
+        )
+        if not batch:
+            break
+        for resume in batch:
+            resume.parsed_content = resume.compressed_content
+        Resume.objects.bulk_update(batch, ["parsed_content"])
+        last_id = batch[-1].id
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("resume", "0006_resume_fulltext_index"),
+    ]
+
+    # The text column is copied into a new binary column batch by batch and
+    # then swapped in, which works on every backend without a type cast.
+    operations = [
+        migrations.AddField(
+            model_name="resume",
+            name="compressed_content",
+            field=resume.fields.CompressedTextField(blank=True, null=True),
+        ),
+        migrations.RunPython(copy_parsed_content, restore_parsed_content),
+        migrations.RemoveField(
+            model_name="resume",
+            name="parsed_content",
+        ),
+        migrations.RenameField(
+            model_name="resume",
+            old_name="compressed_content",
+            new_name="parsed_content",
+        ),
+    ]
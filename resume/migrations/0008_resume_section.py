@@ -0,0 +1,101 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:50
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from resume.sections import segment_resume
+
+BATCH_SIZE = 500
+
+
+def backfill_sections(apps, schema_editor):
+    Resume = apps.get_model("resume", "Resume")
+    ResumeSection = apps.get_model("resume", "ResumeSection")
+    last_id = 0
+    while True:
+        batch = list(
+            Resume.objects.filter(id__gt=last_id, parsed_content__isnull=False)
+            .order_by("id")
+            .only("id", "parsed_content")[:BATCH_SIZE]
+        )
+        if not batch:
+            break
+        ResumeSection.objects.bulk_create(
+            [
+                ResumeSection(
+                    resume_id=resume.id,
+                    category=section.category,
+                    heading=section.heading[:100],
+                    position=position,
+                    start_offset=section.start,
+                    end_offset=section.end,
+                    text=section.normalized_text,
+                )
+                for resume in batch
+                for position, section in enumerate(
+                    segment_resume(str(resume.parsed_content))
+                )
+            ]
+        )
+        last_id = batch[-1].id
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("resume", "0007_compress_parsed_content"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ResumeSection",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "category",
+                    models.CharField(
+                        choices=[
+                            ("skills", "Technical Skills"),
+                            ("experience", "Work Experience"),
+                            ("internships", "Internships"),
+                            ("projects", "Projects"),
+                            ("soft_skills", "Soft Skills"),
+                            ("hr", "HR Questions"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("heading", models.CharField(max_length=100)),
+                ("position", models.PositiveSmallIntegerField()),
+                ("start_offset", models.IntegerField()),
+                ("end_offset", models.IntegerField()),
+                ("text", models.TextField()),
+                (
+                    "resume",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="sections",
+                        to="resume.resume",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["resume", "position"],
+                "indexes": [
+                    models.Index(
+                        fields=["resume", "category"],
+                        name="resume_section_category_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(backfill_sections, migrations.RunPython.noop),
+    ]
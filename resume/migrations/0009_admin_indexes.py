@@ -0,0 +1,50 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:25
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("resume", "0008_resume_section"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="generatedquestion",
+            index=models.Index(
+                fields=["category", "priority"], name="question_category_priority_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="generatedquestion",
+            index=models.Index(fields=["generated_at"], name="question_generated_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="resume",
+            index=models.Index(
+                fields=["-uploaded_at", "-id"], name="resume_uploaded_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="resume",
+            index=models.Index(
+                fields=["processing_status", "-uploaded_at"],
+                name="resume_status_uploaded_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="resume",
+            index=models.Index(
+                fields=["file_type", "-uploaded_at"], name="resume_type_uploaded_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="resume",
+            index=models.Index(
+                fields=["original_filename"], name="resume_filename_idx"
+            ),
+        ),
+    ]
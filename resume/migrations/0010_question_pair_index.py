@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("resume", "0009_admin_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="generatedquestion",
+            index=models.Index(
+                fields=["resume", "job_position", "category", "priority"],
+                name="question_pair_idx",
+            ),
+        ),
+    ]
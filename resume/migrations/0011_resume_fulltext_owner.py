@@ -0,0 +1,62 @@
+from django.db import migrations
+
+# The FTS table keeps a plaintext copy of every resume's parsed_content (on
+# top of the compressed column) so snippet() can quote it. The owner is an
+# indexed "u<id>" token matched inside the FTS query, so a search only reads
+# that user's document lists instead of ranking every user's matches first.
+OWNER_TABLE = (
+    "CREATE VIRTUAL TABLE resume_resume_fts USING fts5("
+    "owner, parsed_content, tokenize='porter unicode61')"
+)
+USER_ID_TABLE = (
+    "CREATE VIRTUAL TABLE resume_resume_fts USING fts5("
+    "user_id UNINDEXED, parsed_content, tokenize='porter unicode61')"
+)
+
+
+def rebuild(apps, schema_editor, create, owner):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    Resume = apps.get_model("resume", "Resume")
+    schema_editor.execute("DROP TABLE IF EXISTS resume_resume_fts")
+    schema_editor.execute(create)
+    column = "owner" if owner else "user_id"
+    # parsed_content is compressed, so rows are decoded here rather than copied in SQL
+    rows = (
+        Resume.objects.filter(parsed_content__isnull=False)
+        .values_list("id", "user_id", "parsed_content")
+        .order_by("id")
+        .iterator(chunk_size=500)
+    )
+    batch = []
+    with schema_editor.connection.cursor() as cursor:
+        for resume_id, user_id, content in rows:
+            batch.append((resume_id, f"u{user_id}" if owner else user_id, str(content)))
+            if len(batch) >= 500:
+                cursor.executemany(
+                    f"INSERT INTO resume_resume_fts (rowid, {column}, parsed_content) VALUES (%s, %s, %s)", batch
+                )
+                batch = []
+        if batch:
+            cursor.executemany(
+                f"INSERT INTO resume_resume_fts (rowid, {column}, parsed_content) VALUES (%s, %s, %s)", batch
+            )
+
+
+def index_owner(apps, schema_editor):
+    rebuild(apps, schema_editor, OWNER_TABLE, owner=True)
+
+
+def unindex_owner(apps, schema_editor):
+    rebuild(apps, schema_editor, USER_ID_TABLE, owner=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("resume", "0010_question_pair_index"),
+    ]
+
+    operations = [
+        migrations.RunPython(index_owner, unindex_owner),
+    ]
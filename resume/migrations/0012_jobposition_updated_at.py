@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("resume", "0011_resume_fulltext_owner"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="jobposition",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:16
+
+import resume.indexes
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("resume", "0012_jobposition_updated_at"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="resume",
+            name="resume_filename_idx",
+        ),
+        migrations.AddIndex(
+            model_name="generatedquestion",
+            index=models.Index(
+                fields=["priority", "category"], name="question_priority_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="jobposition",
+            index=models.Index(
+                fields=["is_active", "title"], name="job_active_title_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="jobposition",
+            index=models.Index(
+                fields=["department", "title"], name="job_department_title_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="jobposition",
+            index=resume.indexes.PrefixIndex(
+                fields=["title"], name="job_title_prefix_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="resume",
+            index=resume.indexes.PrefixIndex(
+                fields=["original_filename"], name="resume_filename_idx"
+            ),
+        ),
+    ]
@@ -1,16 +1,24 @@
 from django.db import models
 from django.contrib.auth.models import User
 from .enums import ProcessingStatus, QuestionCategory
+from .fields import CompressedTextField
+from .indexes import PrefixIndex
+from .sections import section_lines
 
 # Create your models here.
 
 class Resume(models.Model):
+    PREVIEW_LENGTH = 500
+
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='resumes')
-    file = models.FileField(upload_to='resumes/', null=True, blank=True)  # Not used - files are processed in memory
+    file = models.FileField(upload_to='resumes/', null=True, blank=True)  # Only set while an async upload waits for extraction
     original_filename = models.CharField(max_length=255)
     file_type = models.CharField(max_length=50, null=True, blank=True)  # pdf, doc, docx, txt, etc.
     file_size = models.IntegerField(null=True, blank=True)  # in bytes
-    parsed_content = models.TextField(null=True, blank=True)  # Extracted text content from the file
+    content_hash = models.CharField(max_length=64, null=True, blank=True, db_index=True)  # sha256 of the uploaded bytes
+    parsed_content = CompressedTextField(null=True, blank=True)  # Extracted text content from the file, compressed at rest
+    content_preview = models.TextField(null=True, blank=True)  # First PREVIEW_LENGTH characters, precomputed for status polling
+    content_length = models.IntegerField(null=True, blank=True)  # len(parsed_content)
     processing_status = models.CharField(max_length=20, choices=ProcessingStatus.get_choices(), default=ProcessingStatus.PENDING.value)
     error_message = models.TextField(null=True, blank=True)
     uploaded_at = models.DateTimeField(auto_now_add=True)
@@ -19,9 +27,54 @@ class Resume(models.Model):
     
     def __str__(self):
         return f"{self.user.username} - {self.original_filename}"
+
+    @classmethod
+    def build_preview(cls, content):
+        """Preview shown by the status endpoint for a piece of parsed content"""
+        if content is None:
+            return None
+        return content[:cls.PREVIEW_LENGTH] + "..." if len(content) > cls.PREVIEW_LENGTH else content
+
+    def set_parsed_content(self, content):
+        """Store extracted text together with its precomputed preview and length"""
+        self.parsed_content = content
+        self.content_preview = self.build_preview(content)
+        self.content_length = len(content) if content is not None else None
     
     class Meta:
         ordering = ['-uploaded_at']
+        indexes = [
+            models.Index(fields=['user', '-uploaded_at'], name='resume_user_uploaded_idx'),
+            # Admin changelist: default ordering, list_filter columns and filename prefix search
+            models.Index(fields=['-uploaded_at', '-id'], name='resume_uploaded_idx'),
+            models.Index(fields=['processing_status', '-uploaded_at'], name='resume_status_uploaded_idx'),
+            models.Index(fields=['file_type', '-uploaded_at'], name='resume_type_uploaded_idx'),
+            PrefixIndex(fields=['original_filename'], name='resume_filename_idx'),
+        ]
+
+
+class ResumeSection(models.Model):
+    """One categorised section of a resume's parsed_content, found at parse time"""
+    resume = models.ForeignKey(Resume, on_delete=models.CASCADE, related_name='sections')
+    category = models.CharField(max_length=20, choices=QuestionCategory.get_choices())
+    heading = models.CharField(max_length=100)  # Heading line as written in the resume
+    position = models.PositiveSmallIntegerField()  # Order of the section within the resume
+    start_offset = models.IntegerField()  # Body offsets into parsed_content
+    end_offset = models.IntegerField()
+    text = models.TextField()  # Body with whitespace collapsed and blank lines dropped
+
+    def __str__(self):
+        return f"{self.resume_id} - {self.category}"
+
+    def lines(self):
+        """Non-empty lines with bullet markers stripped"""
+        return section_lines(self.text)
+
+    class Meta:
+        ordering = ['resume', 'position']
+        indexes = [
+            models.Index(fields=['resume', 'category'], name='resume_section_category_idx'),
+        ]
 
 
 class JobPosition(models.Model):
@@ -30,12 +83,19 @@ class JobPosition(models.Model):
     department = models.CharField(max_length=100)
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)  # JobMatcher rebuilds its matrix when this moves
     
     def __str__(self):
         return self.title
     
     class Meta:
         ordering = ['title']
+        indexes = [
+            # Admin changelist: list_filter columns (then the title ordering) and title prefix search
+            models.Index(fields=['is_active', 'title'], name='job_active_title_idx'),
+            models.Index(fields=['department', 'title'], name='job_department_title_idx'),
+            PrefixIndex(fields=['title'], name='job_title_prefix_idx'),
+        ]
 
 
 class GeneratedQuestion(models.Model):
@@ -51,4 +111,12 @@ class GeneratedQuestion(models.Model):
     
     class Meta:
         ordering = ['category', 'priority']
+        indexes = [
+            models.Index(fields=['category', 'priority'], name='question_category_priority_idx'),
+            # Admin priority filter, then the category ordering
+            models.Index(fields=['priority', 'category'], name='question_priority_idx'),
+            # Questions endpoint: one pair's questions, already in display order
+            models.Index(fields=['resume', 'job_position', 'category', 'priority'], name='question_pair_idx'),
+            models.Index(fields=['generated_at'], name='question_generated_idx'),
+        ]
 
@@ -0,0 +1,70 @@
+import base64
+import binascii
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+
+class InvalidCursor(Exception):
+    """Raised when a client sends a cursor we did not issue"""
+
+
+def encode_cursor(timestamp, pk):
+    """Opaque cursor pointing just past the row with this (timestamp, pk)"""
+    raw = f"{timestamp.isoformat()}|{pk}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Turn a cursor back into its (timestamp, pk) position"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        timestamp, pk = raw.rsplit('|', 1)
+        timestamp = parse_datetime(timestamp)
+        pk = int(pk)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidCursor(cursor)
+    if timestamp is None:
+        raise InvalidCursor(cursor)
+    return timestamp, pk
+
+
+def keyset_page(queryset, cursor, page_size, field='uploaded_at'):
+    """Return one page of rows ordered by (-field, -pk) and the next cursor
+
+    Rows are located with a range condition on ``(field, pk)`` instead of
+    OFFSET, so every page costs the same regardless of how deep it is.
+    ``queryset`` may be a ``values()`` queryset; it must include ``field``
+    and ``id``.
+    """
+    queryset = page_queryset(queryset, cursor, page_size, field)
+    return finish_page(list(queryset), page_size, field)
+
+
+async def akeyset_page(queryset, cursor, page_size, field='uploaded_at'):
+    """keyset_page for async views, using the async ORM"""
+    queryset = page_queryset(queryset, cursor, page_size, field)
+    return finish_page([row async for row in queryset], page_size, field)
+
+
+def page_queryset(queryset, cursor, page_size, field):
+    queryset = queryset.order_by(f'-{field}', '-id')
+    if cursor:
+        timestamp, pk = decode_cursor(cursor)
+        queryset = queryset.filter(
+            Q(**{f'{field}__lt': timestamp}) | Q(**{field: timestamp, 'id__lt': pk})
+        )
+    # One extra row tells us whether there is a next page
+    return queryset[:page_size + 1]
+
+
+def finish_page(rows, page_size, field):
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        last = rows[-1]
+        if isinstance(last, dict):
+            next_cursor = encode_cursor(last[field], last['id'])
+        else:
+            next_cursor = encode_cursor(getattr(last, field), last.id)
+    return rows, next_cursor
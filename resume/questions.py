@@ -0,0 +1,425 @@
+import logging
+import time
+from collections import deque
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.db import transaction
+
+from .enums import ProcessingStatus, QuestionCategory
+from .sections import segment_resume
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUESTION_GENERATION = {
+    'MAX_PER_CATEGORY': 5,
+    'MAX_ENTRY_LENGTH': 120,
+    'BATCH_SIZE': 200,  # resumes written per transaction in generate_batch
+}
+
+# Canonical spelling of each skill; matching is case-insensitive. Names that
+# are also common English words (Go, Spring, Excel) are left out or qualified.
+TECHNICAL_SKILLS = [
+    'Python', 'Java', 'JavaScript', 'TypeScript', 'Golang', 'Rust', 'C++', 'C#',
+    'Ruby', 'PHP', 'Kotlin', 'Swift', 'Scala', 'SQL', 'Bash',
+    'Django', 'Flask', 'FastAPI', 'Spring Boot', 'Ruby on Rails', 'Node.js',
+    'Express.js', 'React', 'Angular', 'Vue', 'Next.js', '.NET', 'GraphQL', 'REST API',
+    'gRPC', 'PostgreSQL', 'MySQL', 'SQLite', 'MongoDB', 'Redis', 'Elasticsearch',
+    'Cassandra', 'Kafka', 'RabbitMQ', 'Celery', 'Docker', 'Kubernetes',
+    'Terraform', 'Ansible', 'AWS', 'Azure', 'GCP', 'Linux', 'Git', 'CI/CD',
+    'Jenkins', 'GitHub Actions', 'Pandas', 'NumPy', 'SciPy', 'scikit-learn',
+    'TensorFlow', 'PyTorch', 'Spark', 'Hadoop', 'Airflow', 'Machine Learning',
+    'Deep Learning', 'NLP', 'Computer Vision', 'Data Analysis', 'Microservices',
+    'HTML', 'CSS', 'Tableau', 'Power BI',
+]
+SOFT_SKILLS = [
+    'communication', 'teamwork', 'leadership', 'mentoring', 'problem solving',
+    'time management', 'collaboration', 'adaptability', 'critical thinking',
+    'ownership', 'stakeholder management', 'public speaking', 'negotiation',
+    'conflict resolution', 'attention to detail',
+]
+
+# (template, priority) pairs; lower priority is asked first
+QUESTION_TEMPLATES = {
+    'shared_skill': [
+        ("The {job} role relies on {skill}. Walk us through the most complex "
+         "thing you have built with it.", 1),
+    ],
+    'missing_skill': [
+        ("This role uses {skill}, which is not on your resume. How would you get "
+         "up to speed with it?", 2),
+    ],
+    'resume_skill': [
+        ("Your resume lists {skill}. How have you applied it in a recent project?", 3),
+    ],
+    QuestionCategory.EXPERIENCE.value: [
+        ("Tell us about your responsibilities as {entry}.", 1),
+        ("What was your most significant achievement as {entry}?", 2),
+    ],
+    QuestionCategory.INTERNSHIPS.value: [
+        ("What did you learn during your internship: {entry}?", 1),
+        ("How did your internship ({entry}) prepare you for the {job} role?", 2),
+    ],
+    QuestionCategory.PROJECTS.value: [
+        ("Describe the architecture of this project: {entry}.", 1),
+        ("What would you do differently if you rebuilt {entry} today?", 2),
+    ],
+    QuestionCategory.SOFT_SKILLS.value: [
+        ("Give an example of a time you demonstrated {skill}.", 1),
+    ],
+    'soft_skills_generic': [
+        ("Tell us about a time you disagreed with a teammate. How was it resolved?", 2),
+        ("Describe a situation where you had to learn something new under a tight deadline.", 3),
+    ],
+    QuestionCategory.HR.value: [
+        ("Why are you interested in the {job} position in {department}?", 1),
+        ("What are you looking for in your next role?", 2),
+        ("Where do you see yourself in five years?", 3),
+        ("What are your salary expectations?", 4),
+    ],
+}
+
+
+def get_question_generation_settings():
+    """Merge RESUME_QUESTION_GENERATION from settings over the defaults"""
+    options = dict(DEFAULT_QUESTION_GENERATION)
+    options.update(getattr(settings, 'RESUME_QUESTION_GENERATION', {}))
+    return options
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton over a fixed vocabulary
+
+    Every keyword is found in one pass over the text instead of one regex
+    scan per keyword. Matches must sit on word boundaries, so 'Java' does not
+    match inside 'JavaScript'.
+    """
+
+    def __init__(self, keywords):
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+        for keyword in keywords:
+            self._add(keyword)
+        self._build_failure_links()
+
+    def _add(self, keyword):
+        state = 0
+        for char in keyword.lower():
+            next_state = self.goto[state].get(char)
+            if next_state is None:
+                next_state = len(self.goto)
+                self.goto[state][char] = next_state
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append([])
+            state = next_state
+        self.output[state].append((keyword, len(keyword)))
+
+    def _build_failure_links(self):
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.goto[fallback].get(char, 0)
+                # Inherit keywords that end at the failure state
+                self.output[next_state] = self.output[next_state] + self.output[self.fail[next_state]]
+
+    def find(self, text):
+        """Return {keyword: occurrences} for every keyword found in text"""
+        found = {}
+        text = text.lower()
+        length = len(text)
+        goto, fail, output = self.goto, self.fail, self.output
+        state = 0
+        for index, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if not output[state]:
+                continue
+            for keyword, size in output[state]:
+                start = index - size + 1
+                if start > 0 and text[start - 1].isalnum():
+                    continue
+                if index + 1 < length and text[index + 1].isalnum():
+                    continue
+                found[keyword] = found.get(keyword, 0) + 1
+        return found
+
+
+def _rank(found):
+    """Keywords by occurrences, most frequent first, ties by first occurrence"""
+    return sorted(found, key=lambda keyword: -found[keyword])
+
+
+class QuestionGenerator:
+    """Build GeneratedQuestion rows for a resume and a job position from templates
+
+    Skills are compared between the whole resume and the job description;
+    experience, internship, project and soft skill questions come from the
+    matching resume sections. HR questions are always included.
+    """
+
+    def __init__(self, technical_skills=None, soft_skills=None, templates=None,
+                 max_per_category=5, max_entry_length=120, batch_size=200):
+        self.skill_matcher = KeywordMatcher(technical_skills or TECHNICAL_SKILLS)
+        self.soft_skill_matcher = KeywordMatcher(soft_skills or SOFT_SKILLS)
+        self.templates = templates or QUESTION_TEMPLATES
+        self.max_per_category = max_per_category
+        self.max_entry_length = max_entry_length
+        self.batch_size = batch_size
+
+    @classmethod
+    def from_settings(cls):
+        options = get_question_generation_settings()
+        return cls(
+            max_per_category=options['MAX_PER_CATEGORY'],
+            max_entry_length=options['MAX_ENTRY_LENGTH'],
+            batch_size=options['BATCH_SIZE'],
+        )
+
+    def build(self, text, job_position, sections=None):
+        """Return [(category, question_text, priority)] for resume text
+
+        sections are the stored ResumeSection rows when available; otherwise
+        the text is segmented here.
+        """
+        context = {'job': job_position.title, 'department': job_position.department}
+        by_category = {}
+        for section in segment_resume(text) if sections is None else sections:
+            by_category.setdefault(section.category, []).append(section)
+        sections = by_category
+
+        questions = []
+        questions.extend(self._skill_questions(text, job_position, context))
+        for category in (QuestionCategory.EXPERIENCE.value,
+                         QuestionCategory.INTERNSHIPS.value,
+                         QuestionCategory.PROJECTS.value):
+            questions.extend(self._entry_questions(category, sections.get(category, []), context))
+        questions.extend(self._soft_skill_questions(sections.get(QuestionCategory.SOFT_SKILLS.value, []), context))
+        questions.extend(self._fill(QuestionCategory.HR.value, QuestionCategory.HR.value, [{}], context))
+        return questions
+
+    def _fill(self, category, template_key, values, context):
+        questions = []
+        for template, priority in self.templates[template_key]:
+            for value in values:
+                questions.append((category, template.format(**context, **value), priority))
+        return questions
+
+    def _skill_questions(self, text, job_position, context):
+        category = QuestionCategory.SKILLS.value
+        resume_skills = self.skill_matcher.find(text)
+        job_skills = self.skill_matcher.find(f"{job_position.title}\n{job_position.description}")
+
+        shared = [skill for skill in _rank(job_skills) if skill in resume_skills]
+        resume_only = [skill for skill in _rank(resume_skills) if skill not in job_skills]
+        missing = [skill for skill in _rank(job_skills) if skill not in resume_skills]
+
+        # Gaps against the job matter more than skills the job does not need
+        questions = []
+        for template_key, skills in (('shared_skill', shared),
+                                     ('missing_skill', missing),
+                                     ('resume_skill', resume_only)):
+            remaining = self.max_per_category - len(questions)
+            if remaining <= 0:
+                break
+            values = [{'skill': skill} for skill in skills[:remaining]]
+            questions.extend(self._fill(category, template_key, values, context))
+        return questions[:self.max_per_category]
+
+    def _entries(self, sections):
+        entries = []
+        for section in sections:
+            for line in section.lines():
+                entry = line.rstrip('.').strip()
+                if len(entry) > self.max_entry_length:
+                    entry = entry[:self.max_entry_length].rsplit(' ', 1)[0] + '...'
+                entries.append(entry)
+        return entries
+
+    def _entry_questions(self, category, sections, context):
+        templates = self.templates[category]
+        # Spread the budget across entries before asking follow-ups
+        entries = self._entries(sections)[:max(1, self.max_per_category // len(templates))]
+        values = [{'entry': entry} for entry in entries]
+        return self._fill(category, category, values, context)[:self.max_per_category]
+
+    def _soft_skill_questions(self, sections, context):
+        category = QuestionCategory.SOFT_SKILLS.value
+        found = self.soft_skill_matcher.find('\n'.join(section.text for section in sections))
+        values = [{'skill': skill} for skill in _rank(found)]
+        questions = self._fill(category, category, values, context)
+        questions.extend(self._fill(category, 'soft_skills_generic', [{}], context))
+        return questions[:self.max_per_category]
+
+    def generate(self, resume, job_position):
+        """Return unsaved GeneratedQuestion instances for one resume"""
+        from .models import GeneratedQuestion
+
+        return [
+            GeneratedQuestion(
+                resume=resume,
+                job_position=job_position,
+                category=category,
+                question_text=question_text,
+                priority=priority,
+            )
+            for category, question_text, priority in self.build(
+                str(resume.parsed_content or ''), job_position, resume.sections.all()
+            )
+        ]
+
+    def regenerate(self, resume, job_position):
+        """Replace the stored questions for one (resume, job_position) pair"""
+        from .models import GeneratedQuestion
+
+        questions = self.generate(resume, job_position)
+        with transaction.atomic():
+            GeneratedQuestion.objects.filter(resume=resume, job_position=job_position).delete()
+            transaction.on_commit(partial(question_cache.invalidate, [resume.id], job_position.id))
+            return GeneratedQuestion.objects.bulk_create(questions)
+
+    def generate_batch(self, resumes, job_position):
+        """Regenerate questions for many resumes, one transaction per batch
+
+        Returns a dict with resume and question counts and throughput.
+        """
+        from .models import GeneratedQuestion
+
+        started = time.monotonic()
+        resume_count = question_count = 0
+        resumes = resumes.filter(
+            processing_status=ProcessingStatus.COMPLETED.value
+        ).only('id', 'parsed_content').order_by('id').prefetch_related('sections')
+
+        batch_ids, batch_questions = [], []
+
+        def flush():
+            with transaction.atomic():
+                GeneratedQuestion.objects.filter(
+                    resume_id__in=batch_ids, job_position=job_position
+                ).delete()
+                GeneratedQuestion.objects.bulk_create(batch_questions, batch_size=1000)
+                transaction.on_commit(partial(question_cache.invalidate, list(batch_ids), job_position.id))
+
+        for resume in resumes.iterator(chunk_size=self.batch_size):
+            questions = self.generate(resume, job_position)
+            batch_ids.append(resume.id)
+            batch_questions.extend(questions)
+            resume_count += 1
+            question_count += len(questions)
+            if len(batch_ids) >= self.batch_size:
+                flush()
+                batch_ids, batch_questions = [], []
+        if batch_ids:
+            flush()
+
+        elapsed = time.monotonic() - started
+        report = {
+            'resumes': resume_count,
+            'questions': question_count,
+            'elapsed': round(elapsed, 3),
+            'resumes_per_second': round(resume_count / elapsed, 1) if elapsed else 0.0,
+            'questions_per_second': round(question_count / elapsed, 1) if elapsed else 0.0,
+        }
+        logger.info("Generated %(questions)s questions for %(resumes)s resumes in %(elapsed)ss", report)
+        return report
+
+
+question_generator = QuestionGenerator.from_settings()
+
+
+DEFAULT_QUESTION_CACHE = {
+    'CACHE': 'default',  # alias in CACHES; share it between processes so invalidation reaches all of them
+    'TTL': 300,  # seconds; also bounds how long questions of a deleted job position are served
+}
+
+
+def get_question_cache_settings():
+    """Merge RESUME_QUESTION_CACHE from settings over the defaults"""
+    options = dict(DEFAULT_QUESTION_CACHE)
+    options.update(getattr(settings, 'RESUME_QUESTION_CACHE', {}))
+    return options
+
+
+class QuestionCache:
+    """Versioned cache of the questions endpoint, per (resume, job position)
+
+    Entries are keyed by the current version of their resume and of their
+    pair. Regenerating a pair's questions, or deleting the resume, replaces
+    the version once the transaction commits; old entries are never read
+    again and expire on their own. A request that read the rows before the
+    change can only store them under the old version, so it cannot bring
+    stale questions back.
+    """
+
+    key_prefix = 'resume:questions'
+
+    def __init__(self, cache='default', ttl=300):
+        self.cache = cache
+        self.ttl = ttl
+
+    @classmethod
+    def from_settings(cls):
+        options = get_question_cache_settings()
+        return cls(cache=options['CACHE'], ttl=options['TTL'])
+
+    def configure(self):
+        """Re-read RESUME_QUESTION_CACHE"""
+        configured = self.from_settings()
+        self.cache, self.ttl = configured.cache, configured.ttl
+
+    def version_key(self, resume_id, job_position_id=None):
+        if job_position_id is None:
+            return f'{self.key_prefix}:version:{resume_id}'
+        return f'{self.key_prefix}:version:{resume_id}:{job_position_id}'
+
+    def versions(self, resume_id, job_position_id):
+        cache = caches[self.cache]
+        keys = [self.version_key(resume_id), self.version_key(resume_id, job_position_id)]
+        found = cache.get_many(keys)
+        versions = []
+        for key in keys:
+            version = found.get(key)
+            if version is None:
+                # Never set or expired: any fresh value orphans older entries
+                version = time.time_ns()
+                if not cache.add(key, version, self.ttl):
+                    version = cache.get(key, version)
+            versions.append(version)
+        return versions
+
+    def get(self, resume_id, job_position_id):
+        """(cached entry or None, key to store a fresh entry under)"""
+        resume_version, pair_version = self.versions(resume_id, job_position_id)
+        key = f'{self.key_prefix}:{resume_id}:{job_position_id}:{resume_version}:{pair_version}'
+        return caches[self.cache].get(key), key
+
+    def set(self, key, entry):
+        caches[self.cache].set(key, entry, self.ttl)
+
+    def invalidate(self, resume_ids, job_position_id=None):
+        """Drop the entries of each (resume, job_position), or of each whole resume"""
+        version = time.time_ns()
+        keys = [self.version_key(resume_id, job_position_id) for resume_id in resume_ids]
+        if keys:
+            caches[self.cache].set_many(dict.fromkeys(keys, version), self.ttl)
+
+
+question_cache = QuestionCache.from_settings()
+
+
+def _reload_settings(setting, **kwargs):
+    if setting == 'RESUME_QUESTION_CACHE':
+        question_cache.configure()
+
+
+setting_changed.connect(_reload_settings)
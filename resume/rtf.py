@@ -0,0 +1,180 @@
+import codecs
+import re
+
+# Groups whose content is never document text. A group starting with \*
+# is skipped as well, whether or not its control word is listed here.
+DESTINATIONS = frozenset([
+    b'annotation', b'atnauthor', b'atnid', b'author', b'blipuid', b'buptim', b'category', b'colorschememapping',
+    b'colortbl', b'comment', b'company', b'creatim', b'datafield', b'datastore', b'defchp', b'defpap', b'doccomm',
+    b'docvar', b'falt', b'fchars', b'ffdeftext', b'ffentrymcr', b'ffexitmcr', b'ffformat', b'ffhelptext',
+    b'ffl', b'ffname', b'ffstattext', b'filetbl', b'fldinst', b'fldtype', b'fontemb', b'fontfile', b'fonttbl',
+    b'generator', b'info', b'keywords', b'latentstyles', b'lchars', b'listoverridetable', b'listpicture',
+    b'listtable', b'manager', b'mmathPr', b'nonshppict', b'objclass', b'objdata', b'object', b'operator',
+    b'panose', b'pgdsctbl', b'pict', b'pntext', b'pntxta', b'pntxtb', b'printim', b'private', b'revtbl',
+    b'revtim', b'rsidtbl', b'shpinst', b'stylesheet', b'subject', b'tc', b'template', b'themedata', b'title',
+    b'txe', b'userprops', b'wgrffmtfilter', b'writereservation', b'writereservhash', b'xe', b'xmlnstbl',
+])
+
+# Control words and symbols that stand for text
+SPECIAL_CHARACTERS = {
+    b'par': '\n', b'line': '\n', b'sect': '\n', b'page': '\n', b'row': '\n', b'tab': '\t', b'cell': '\t',
+    b'nestcell': '\t', b'emdash': '\u2014', b'endash': '\u2013', b'emspace': ' ', b'enspace': ' ',
+    b'qmspace': ' ', b'bullet': '\u2022', b'lquote': '\u2018', b'rquote': '\u2019', b'ldblquote': '\u201c',
+    b'rdblquote': '\u201d', b'~': '\xa0', b'_': '\u2011', b'-': '', b'\n': '\n', b'\r': '\n',
+    b'\\': '\\', b'{': '{', b'}': '}',
+}
+
+CHARACTER_SETS = {b'ansi': 'cp1252', b'mac': 'mac_roman', b'pc': 'cp437', b'pca': 'cp850'}
+
+# One token per match: control word with optional parameter (the space
+# delimiter belongs to the word), hex escape, control symbol, brace, a run
+# of plain text, or line breaks (which RTF ignores)
+TOKEN = re.compile(
+    rb"\\(?:([a-zA-Z]{1,32})(-?\d{1,10})? ?|'([0-9a-fA-F]{2})|(.))|([{}])|([^\\{}\r\n]+)|[\r\n]+",
+    re.DOTALL,
+)
+# Inside a skipped group only braces and escapes matter
+STRUCTURE = re.compile(rb"[\\{}]")
+BIN = re.compile(rb"\\bin(\d{1,10}) ?")
+
+
+def _skip_group(data, pos, length):
+    """Return the offset just past the group that is open at pos"""
+    depth = 1
+    search = STRUCTURE.search
+    while depth:
+        match = search(data, pos)
+        if match is None:
+            return length
+        pos = match.end()
+        char = data[pos - 1]
+        if char == 0x7b:  # {
+            depth += 1
+        elif char == 0x7d:  # }
+            depth -= 1
+        else:
+            binary = BIN.match(data, pos - 1)
+            # Raw \bin data may contain braces; jump over it
+            pos = binary.end() + int(binary.group(1)) if binary else pos + 1
+    return pos
+
+
+def iter_rtf_text(data):
+    """Yield the plain text of an RTF document in order, in one pass
+
+    Destination groups such as \\fonttbl and \\pict (and embedded binary
+    data) are jumped over without tokenizing their contents, so pictures
+    cost a scan for the closing brace rather than a token per hex run.
+    Nothing is built beyond a stack of \\uc values for the open groups.
+    """
+    length = len(data)
+    pos = 0
+    encoding = 'cp1252'
+    pending = bytearray()  # bytes in the document code page, decoded on flush
+    uc = 1  # characters to drop after \uN
+    uc_stack = []
+    fallback = 0  # remaining replacement characters after the last \uN
+    high_surrogate = None
+    match_token = TOKEN.match
+
+    while pos < length:
+        match = match_token(data, pos)
+        if match is None:
+            pos += 1  # a lone backslash at the end of the data
+            continue
+        pos = match.end()
+        word, param, hex_code, symbol, brace, text = match.groups()
+
+        if text is not None:
+            if fallback:
+                dropped = min(fallback, len(text))
+                text = text[dropped:]
+                fallback -= dropped
+            pending += text
+            continue
+        if hex_code is not None:
+            if fallback:
+                fallback -= 1
+            else:
+                pending.append(int(hex_code, 16))
+            continue
+        if brace is not None:
+            fallback = 0
+            if brace == b'{':
+                uc_stack.append(uc)
+                if data.startswith(b'\\*', pos):
+                    pos = _skip_group(data, pos, length)
+                    uc = uc_stack.pop()
+            elif uc_stack:
+                uc = uc_stack.pop()
+            continue
+        if word is None and symbol is None:
+            continue  # line break in the source
+
+        if fallback:
+            fallback -= 1
+            continue
+        if word is not None:
+            if word in DESTINATIONS:
+                pos = _skip_group(data, pos, length)
+                if uc_stack:
+                    uc = uc_stack.pop()
+                continue
+            if word == b'u' and param is not None:
+                code = int(param)
+                if code < 0:
+                    code += 0x10000
+                fallback = uc
+                if pending:
+                    yield pending.decode(encoding, errors='replace')
+                    pending.clear()
+                if 0xd800 <= code < 0xdc00:
+                    high_surrogate = code
+                    continue
+                if high_surrogate is not None and 0xdc00 <= code < 0xe000:
+                    code = 0x10000 + ((high_surrogate - 0xd800) << 10) + (code - 0xdc00)
+                high_surrogate = None
+                yield chr(code) if not 0xd800 <= code < 0xe000 else '\ufffd'
+                continue
+            if word == b'uc' and param is not None:
+                uc = max(0, int(param))
+                continue
+            if word == b'bin' and param is not None:
+                pos += int(param)
+                continue
+            if word == b'ansicpg' and param is not None:
+                encoding = _code_page(param, encoding)
+                continue
+            if word in CHARACTER_SETS:
+                encoding = CHARACTER_SETS[word]
+                continue
+            replacement = SPECIAL_CHARACTERS.get(word)
+        else:
+            replacement = SPECIAL_CHARACTERS.get(symbol)
+
+        if replacement is None:
+            continue  # formatting
+        if replacement in ('\\', '{', '}'):
+            pending += replacement.encode()
+            continue
+        if pending:
+            yield pending.decode(encoding, errors='replace')
+            pending.clear()
+        yield replacement
+
+    if pending:
+        yield pending.decode(encoding, errors='replace')
+
+
+def _code_page(param, current):
+    encoding = f'cp{int(param)}'
+    try:
+        codecs.lookup(encoding)
+    except LookupError:
+        return current
+    return encoding
+
+
+def rtf_to_text(data):
+    """Plain text of an RTF document given as bytes"""
+    return ''.join(iter_rtf_text(data))
@@ -0,0 +1,284 @@
+import logging
+import multiprocessing
+import os
+import queue
+import signal
+import threading
+
+try:
+    import resource
+except ImportError:  # not available on Windows; limits are then skipped
+    resource = None
+
+from django.conf import settings
+from django.core.signals import setting_changed
+
+from .admission import get_admission_settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EXTRACTION_SANDBOX = {
+    'ENABLED': False,
+    # None sizes the pool to RESUME_ADMISSION['MAX_CONCURRENT_EXTRACTIONS'],
+    # so every extraction the gate admits finds a worker
+    'WORKERS': None,
+    'CPU_TIME': 20,  # seconds of CPU per extraction (RLIMIT_CPU)
+    'WALL_TIME': 30.0,  # seconds before the worker is killed
+    'MEMORY_LIMIT': 512 * 1024 * 1024,  # bytes of address space on top of the forked image (RLIMIT_AS)
+    'MAX_TASKS_PER_WORKER': 200,
+    'ACQUIRE_TIMEOUT': 30.0,  # seconds to wait for an idle worker
+    'RETRY_AFTER': 5,  # seconds a client is told to wait when no worker became free
+}
+
+# Settings the pool is sized from or the workers read; workers keep the
+# values they were forked with
+WORKER_SETTINGS = {
+    'RESUME_EXTRACTION_SANDBOX', 'RESUME_ADMISSION', 'RESUME_PDF_EXTRACTION', 'RESUME_TEXT_DECODING'
+}
+
+_in_sandbox = False
+
+
+def get_sandbox_settings():
+    """Merge RESUME_EXTRACTION_SANDBOX from settings over the defaults"""
+    options = dict(DEFAULT_EXTRACTION_SANDBOX)
+    options.update(getattr(settings, 'RESUME_EXTRACTION_SANDBOX', {}))
+    return options
+
+
+def in_sandbox():
+    """True inside a sandbox worker process"""
+    return _in_sandbox
+
+
+class SandboxError(Exception):
+    """Extraction failed inside the sandbox"""
+
+
+class SandboxTimeout(SandboxError):
+    """The worker exceeded its wall-time limit and was killed"""
+
+
+class SandboxWorkerDied(SandboxError):
+    """The worker was killed by a resource limit or crashed"""
+
+
+class SandboxBusy(SandboxError):
+    """No worker became idle within the acquire timeout"""
+
+    def __init__(self, message, retry_after):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def _address_space():
+    """Current virtual memory size of this process in bytes, or 0 if unknown"""
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[0]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return 0
+
+
+def _worker_main(conn, memory_limit):
+    global _in_sandbox
+    _in_sandbox = True
+    # Ctrl-C goes to the parent, which shuts the pool down
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    if resource is not None and memory_limit:
+        # The forked image is already mapped, so the limit is on top of it
+        limit = _address_space() + memory_limit
+        _, hard = resource.getrlimit(resource.RLIMIT_AS)
+        if hard != resource.RLIM_INFINITY:
+            limit = min(limit, hard)
+        resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, OSError):
+            break
+        if message is None:
+            break
+        func, args, cpu_time = message
+
+        if resource is not None and cpu_time:
+            # RLIMIT_CPU counts the whole life of the process, so each task
+            # gets a fresh allowance on top of what has been used so far
+            usage = resource.getrusage(resource.RUSAGE_SELF)
+            used = int(usage.ru_utime + usage.ru_stime) + 1
+            _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+            soft = used + cpu_time
+            if hard != resource.RLIM_INFINITY:
+                soft = min(soft, hard)
+            resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+        # Replies are (outcome, value, exiting)
+        try:
+            conn.send(('ok', func(*args), False))
+        except MemoryError:
+            # The heap may be fragmented beyond use; let the pool replace us
+            conn.send(('error', 'MemoryError: extraction exceeded the memory limit', True))
+            break
+        except Exception as e:
+            conn.send(('error', f"{type(e).__name__}: {e}", False))
+    conn.close()
+
+
+class SandboxWorker:
+    def __init__(self, context, memory_limit):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn, memory_limit), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.tasks = 0
+
+    def stop(self, kill=False):
+        if kill:
+            self.process.kill()
+        else:
+            try:
+                self.conn.send(None)
+            except (OSError, ValueError):
+                self.process.kill()
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+    def describe_exit(self):
+        self.process.join(timeout=5)
+        code = self.process.exitcode
+        if code is not None and code < 0:
+            try:
+                return f"killed by {signal.Signals(-code).name}"
+            except ValueError:
+                return f"killed by signal {-code}"
+        return f"exited with code {code}"
+
+
+class SandboxPool:
+    """Pre-forked worker processes that run extractors under resource limits
+
+    Workers are forked once and reused. Each call runs in an idle worker
+    with RLIMIT_CPU and RLIMIT_AS applied; a worker that overruns the wall
+    time is killed, and a worker that dies (for example on SIGXCPU) is
+    replaced so later calls still find a warm process.
+    """
+
+    def __init__(self, workers=2, cpu_time=20, wall_time=30.0, memory_limit=512 * 1024 * 1024,
+                 max_tasks_per_worker=200, acquire_timeout=30.0, retry_after=5):
+        self.size = max(1, workers)
+        self.cpu_time = cpu_time
+        self.wall_time = wall_time
+        self.memory_limit = memory_limit
+        self.max_tasks_per_worker = max_tasks_per_worker
+        self.acquire_timeout = acquire_timeout
+        self.retry_after = retry_after
+        self.context = multiprocessing.get_context('fork')
+        self.idle = queue.Queue()
+        self.workers = []
+        self._lock = threading.Lock()
+        for _ in range(self.size):
+            self._spawn()
+
+    @classmethod
+    def from_settings(cls):
+        options = get_sandbox_settings()
+        return cls(
+            workers=options['WORKERS'] or get_admission_settings()['MAX_CONCURRENT_EXTRACTIONS'],
+            cpu_time=options['CPU_TIME'],
+            wall_time=options['WALL_TIME'],
+            memory_limit=options['MEMORY_LIMIT'],
+            max_tasks_per_worker=options['MAX_TASKS_PER_WORKER'],
+            acquire_timeout=options['ACQUIRE_TIMEOUT'],
+            retry_after=options['RETRY_AFTER'],
+        )
+
+    def _spawn(self):
+        worker = SandboxWorker(self.context, self.memory_limit)
+        with self._lock:
+            self.workers.append(worker)
+        self.idle.put(worker)
+
+    def _retire(self, worker, kill=False):
+        with self._lock:
+            if worker in self.workers:
+                self.workers.remove(worker)
+        worker.stop(kill=kill)
+        self._spawn()
+
+    def run(self, func, *args):
+        """Run func(*args) in a worker and return its result"""
+        try:
+            worker = self.idle.get(timeout=self.acquire_timeout)
+        except queue.Empty:
+            raise SandboxBusy(
+                f"No extraction worker became free within {self.acquire_timeout}s", self.retry_after
+            )
+
+        reusable = False
+        try:
+            try:
+                worker.conn.send((func, args, self.cpu_time))
+            except (OSError, ValueError):
+                raise SandboxWorkerDied(f"Extraction worker {worker.describe_exit()}")
+            if not worker.conn.poll(self.wall_time):
+                raise SandboxTimeout(f"Extraction exceeded the {self.wall_time}s time limit")
+            try:
+                outcome, value, exiting = worker.conn.recv()
+            except (EOFError, OSError):
+                # SIGXCPU, SIGKILL from the OOM killer, or a crash in C code
+                raise SandboxWorkerDied(f"Extraction worker {worker.describe_exit()}")
+            reusable = not exiting
+        finally:
+            worker.tasks += 1
+            if not reusable:
+                logger.warning("Replacing extraction worker %s", worker.process.pid)
+                self._retire(worker, kill=True)
+            elif worker.tasks >= self.max_tasks_per_worker:
+                self._retire(worker)
+            else:
+                self.idle.put(worker)
+
+        if outcome == 'error':
+            raise SandboxError(value)
+        return value
+
+    def shutdown(self):
+        with self._lock:
+            workers, self.workers = self.workers, []
+        for worker in workers:
+            worker.stop()
+
+
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+
+def get_sandbox_pool():
+    """Return this process's pool, forking the workers on first use"""
+    global _pool, _pool_pid
+    with _pool_lock:
+        # A forked web or Celery worker must not share its parent's pipes
+        if _pool is None or _pool_pid != os.getpid():
+            _pool = SandboxPool.from_settings()
+            _pool_pid = os.getpid()
+        return _pool
+
+
+def reset_sandbox_pool(setting=None, **kwargs):
+    """Stop the workers; the next extraction forks fresh ones"""
+    global _pool
+    if setting is not None and setting not in WORKER_SETTINGS:
+        return
+    with _pool_lock:
+        if _pool is not None and _pool_pid == os.getpid():
+            _pool.shutdown()
+        _pool = None
+
+
+setting_changed.connect(reset_sandbox_pool)
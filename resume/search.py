@@ -0,0 +1,161 @@
+import re
+
+from django.conf import settings
+from django.db import connection
+
+from .models import Resume
+
+# Columns: owner ("u<user id>", indexed so MATCH narrows to one user) and a
+# plaintext copy of parsed_content for ranking and snippets
+FTS_TABLE = 'resume_resume_fts'
+SNIPPET_TOKENS = 16
+
+DEFAULT_SEARCH = {
+    # Without FTS5, parsed_content is decompressed and scanned in Python, so
+    # only this many of the user's most recent resumes are searched
+    'FALLBACK_SCAN_LIMIT': 1000,
+}
+
+
+def get_search_settings():
+    """Merge RESUME_SEARCH from settings over the defaults"""
+    options = dict(DEFAULT_SEARCH)
+    options.update(getattr(settings, 'RESUME_SEARCH', {}))
+    return options
+
+
+def fts_available():
+    """Full-text search uses FTS5 on SQLite and falls back elsewhere"""
+    return connection.vendor == 'sqlite'
+
+
+def build_match_query(query):
+    """Turn free text into an FTS5 query that cannot raise a syntax error
+
+    Every term is quoted and the terms are ANDed; a trailing ``*`` keeps its
+    prefix-match meaning.
+    """
+    terms = []
+    for term in query.split():
+        prefix = term.endswith('*')
+        term = term.rstrip('*').replace('"', '""')
+        if term:
+            terms.append(f'"{term}"*' if prefix else f'"{term}"')
+    return ' '.join(terms)
+
+
+def owner_token(user_id):
+    return f'u{user_id}'
+
+
+def index_resume(resume_id, user_id, content):
+    """Insert or replace the FTS row for one resume"""
+    if not fts_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [resume_id])
+        if content:
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE} (rowid, owner, parsed_content) VALUES (%s, %s, %s)",
+                [resume_id, owner_token(user_id), content]
+            )
+
+
+def index_resumes(resumes):
+    """Index freshly bulk-created resumes, which skip the post_save signal"""
+    if not fts_available():
+        return
+    rows = [
+        (resume.id, owner_token(resume.user_id), resume.parsed_content)
+        for resume in resumes if resume.parsed_content
+    ]
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f"INSERT INTO {FTS_TABLE} (rowid, owner, parsed_content) VALUES (%s, %s, %s)",
+            rows
+        )
+
+
+def remove_resume(resume_id):
+    if not fts_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [resume_id])
+
+
+def search_resumes(user, query, limit=20):
+    """Rank a user's resumes against a query
+
+    Returns dicts with ``resume_id``, ``filename``, ``rank`` (BM25, lower is
+    better; None on the fallback path) and ``snippet`` with matches wrapped
+    in ``<mark>`` tags.
+    """
+    if fts_available():
+        return _search_fts(user, query, limit)
+    return _search_fallback(user, query, limit)
+
+
+def _search_fts(user, query, limit):
+    match = build_match_query(query)
+    if not match:
+        return []
+    # The owner term makes FTS intersect with this user's documents before
+    # ranking; query terms only match the content column. The owner column
+    # gets zero weight so it does not affect BM25.
+    match = f'owner : "{owner_token(user.pk)}" AND parsed_content : ({match})'
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT rowid, bm25({FTS_TABLE}, 0.0, 1.0), "
+            f"snippet({FTS_TABLE}, 1, '<mark>', '</mark>', '...', {SNIPPET_TOKENS}) "
+            f"FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s "
+            f"ORDER BY bm25({FTS_TABLE}, 0.0, 1.0) LIMIT %s",
+            [match, limit]
+        )
+        rows = cursor.fetchall()
+
+    filenames = dict(
+        Resume.objects.filter(id__in=[row[0] for row in rows]).values_list('id', 'original_filename')
+    )
+    return [
+        {"resume_id": resume_id, "filename": filenames.get(resume_id), "rank": rank, "snippet": snippet}
+        for resume_id, rank, snippet in rows
+    ]
+
+
+def _search_fallback(user, query, limit):
+    terms = [term.rstrip('*').lower() for term in query.split() if term.rstrip('*')]
+    if not terms:
+        return []
+
+    # parsed_content is stored compressed, so matching happens after decoding
+    # rather than with a database LIKE. That costs a read and a decompression
+    # per resume, so the scan is capped at the most recent ones; older
+    # resumes are only searchable on backends with FTS.
+    results = []
+    resumes = (
+        Resume.objects.filter(user=user, parsed_content__isnull=False)
+        .only('id', 'original_filename', 'parsed_content')
+        .order_by('-uploaded_at', '-id')
+    )[:get_search_settings()['FALLBACK_SCAN_LIMIT']]
+    for resume in resumes.iterator(chunk_size=200):
+        content = resume.parsed_content
+        lowered = content.lower()
+        if all(term in lowered for term in terms):
+            results.append({
+                "resume_id": resume.id,
+                "filename": resume.original_filename,
+                "rank": None,
+                "snippet": _make_snippet(content, terms),
+            })
+            if len(results) >= limit:
+                break
+    return results
+
+
+def _make_snippet(content, terms, radius=60):
+    pattern = re.compile('|'.join(re.escape(term) for term in terms), re.IGNORECASE)
+    found = pattern.search(content)
+    start = max(0, found.start() - radius) if found else 0
+    window = content[start:start + radius * 2]
+    snippet = pattern.sub(lambda match: f"<mark>{match.group(0)}</mark>", window)
+    return ('...' if start else '') + snippet + ('...' if start + radius * 2 < len(content) else '')
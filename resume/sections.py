@@ -0,0 +1,157 @@
+import re
+
+from .enums import QuestionCategory
+
+# Normalised heading text -> category. Headings mapped to None still end the
+# previous section but are not kept (education, contact details, ...).
+SECTION_HEADINGS = {
+    'skills': QuestionCategory.SKILLS.value,
+    'technical skills': QuestionCategory.SKILLS.value,
+    'key skills': QuestionCategory.SKILLS.value,
+    'core competencies': QuestionCategory.SKILLS.value,
+    'technologies': QuestionCategory.SKILLS.value,
+    'tech stack': QuestionCategory.SKILLS.value,
+    'tools and technologies': QuestionCategory.SKILLS.value,
+    'experience': QuestionCategory.EXPERIENCE.value,
+    'work experience': QuestionCategory.EXPERIENCE.value,
+    'professional experience': QuestionCategory.EXPERIENCE.value,
+    'employment history': QuestionCategory.EXPERIENCE.value,
+    'work history': QuestionCategory.EXPERIENCE.value,
+    'employment': QuestionCategory.EXPERIENCE.value,
+    'internships': QuestionCategory.INTERNSHIPS.value,
+    'internship': QuestionCategory.INTERNSHIPS.value,
+    'internship experience': QuestionCategory.INTERNSHIPS.value,
+    'projects': QuestionCategory.PROJECTS.value,
+    'personal projects': QuestionCategory.PROJECTS.value,
+    'academic projects': QuestionCategory.PROJECTS.value,
+    'key projects': QuestionCategory.PROJECTS.value,
+    'soft skills': QuestionCategory.SOFT_SKILLS.value,
+    'interpersonal skills': QuestionCategory.SOFT_SKILLS.value,
+    'strengths': QuestionCategory.SOFT_SKILLS.value,
+    'summary': None,
+    'profile': None,
+    'objective': None,
+    'education': None,
+    'certifications': None,
+    'awards': None,
+    'achievements': None,
+    'publications': None,
+    'languages': None,
+    'interests': None,
+    'hobbies': None,
+    'references': None,
+    'contact': None,
+}
+MAX_HEADING_LENGTH = 40
+HEADING_DECORATION = re.compile(r"^[\s#*=_|•·\-]+|[\s#*=_|•·:\-]+$")
+WHITESPACE = re.compile(r"\s+")
+INLINE_WHITESPACE = re.compile(r"[^\S\n]+")
+BULLETS = '-*•·'
+
+
+def normalize_section_text(text):
+    """Collapse whitespace within lines and drop blank lines, keeping line breaks"""
+    lines = (INLINE_WHITESPACE.sub(' ', line).strip() for line in text.splitlines())
+    return '\n'.join(line for line in lines if line)
+
+
+def section_lines(text):
+    """Non-empty lines of a section body with bullet markers stripped"""
+    lines = (line.strip().lstrip(BULLETS).strip() for line in text.splitlines())
+    return [line for line in lines if line]
+
+
+class Section:
+    """A run of resume text under one recognised heading"""
+
+    def __init__(self, category, heading, start, end, text):
+        self.category = category
+        self.heading = heading
+        self.start = start  # offsets into parsed_content, body only
+        self.end = end
+        self.text = text
+
+    @property
+    def normalized_text(self):
+        return normalize_section_text(self.text)
+
+    def lines(self):
+        """Non-empty lines with bullet markers stripped"""
+        return section_lines(self.text)
+
+    def __repr__(self):
+        return f"<Section {self.category} {self.start}:{self.end}>"
+
+
+def match_heading(line):
+    """Category for a heading line, None for an ignored heading, False otherwise"""
+    if len(line) > MAX_HEADING_LENGTH:
+        return False
+    key = WHITESPACE.sub(' ', HEADING_DECORATION.sub('', line)).lower().replace('&', 'and')
+    return SECTION_HEADINGS.get(key, False)
+
+
+def segment_resume(text):
+    """Split resume text into Sections in a single pass over its lines
+
+    A heading is a short line whose text (ignoring case, decoration and a
+    trailing colon) is a known section name. Text before the first heading
+    and under ignored headings is dropped.
+    """
+    sections = []
+    if not text:
+        return sections
+
+    current = None  # (category, heading, body start)
+    position = 0
+    length = len(text)
+    while position < length:
+        line_end = text.find('\n', position)
+        if line_end == -1:
+            line_end = length
+        category = match_heading(text[position:line_end].strip())
+        if category is not False:
+            if current and current[0]:
+                sections.append(_close_section(text, current, position))
+            current = (category, text[position:line_end].strip(), line_end + 1)
+        position = line_end + 1
+
+    if current and current[0]:
+        sections.append(_close_section(text, current, length))
+    return sections
+
+
+def _close_section(text, current, end):
+    category, heading, start = current
+    start = min(start, end)
+    body = text[start:end].rstrip()
+    return Section(category, heading, start, start + len(body), body)
+
+
+def build_sections(resume_id, text):
+    """Unsaved ResumeSection rows for one resume's parsed_content"""
+    from .models import ResumeSection
+
+    return [
+        ResumeSection(
+            resume_id=resume_id,
+            category=section.category,
+            heading=section.heading[:100],
+            position=position,
+            start_offset=section.start,
+            end_offset=section.end,
+            text=section.normalized_text,
+        )
+        for position, section in enumerate(segment_resume(text))
+    ]
+
+
+def index_sections(resumes):
+    """Replace the stored sections of saved Resume instances in bulk"""
+    from .models import ResumeSection
+
+    rows = []
+    for resume in resumes:
+        rows.extend(build_sections(resume.id, str(resume.parsed_content or '')))
+    ResumeSection.objects.filter(resume__in=[resume.id for resume in resumes]).delete()
+    ResumeSection.objects.bulk_create(rows, batch_size=500)
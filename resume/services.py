@@ -1 +1,744 @@
+import hashlib
+import io
+import logging
+import multiprocessing
+import os
+import re
+import threading
+import time
+import zipfile
+import zlib
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from datetime import timedelta
 
+import numpy as np
+import PyPDF2
+from scipy import sparse
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.db.models import Count, Max
+from django.utils import timezone
+
+from .admission import get_extraction_gate
+from .enums import FileType, ProcessingStatus
+from .executor import ExtractionQueueFull
+from .sandbox import SandboxBusy
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PDF_EXTRACTION = {
+    'ENGINE': 'parallel',  # 'parallel' or 'serial'
+    'MAX_WORKERS': min(4, os.cpu_count() or 1),
+    'PAGES_PER_CHUNK': 8,
+    'MAX_PAGES': 100,
+    'MAX_CHARS': 500000,
+    'TIME_BUDGET': 10.0,  # seconds
+}
+
+
+def get_pdf_extraction_settings():
+    """Merge RESUME_PDF_EXTRACTION from settings over the defaults"""
+    options = dict(DEFAULT_PDF_EXTRACTION)
+    options.update(getattr(settings, 'RESUME_PDF_EXTRACTION', {}))
+    return options
+
+
+def _extract_page_range(source, start, stop, deadline, max_chars):
+    """Extract the text of pages [start, stop) and time each page
+
+    ``source`` is either an open PdfReader or the raw PDF bytes, so the same
+    function serves the in-process path and the process pool workers.
+    """
+    if isinstance(source, bytes):
+        source = PyPDF2.PdfReader(io.BytesIO(source))
+
+    texts = []
+    timings = []
+    chars = 0
+    for index in range(start, stop):
+        if time.time() >= deadline or chars >= max_chars:
+            break
+        started = time.perf_counter()
+        text = source.pages[index].extract_text() or ''
+        timings.append((index + 1, time.perf_counter() - started))
+        texts.append(text)
+        chars += len(text)
+    return start, texts, timings
+
+
+class PDFExtractionResult:
+    """Text and bookkeeping produced by a PDFExtractionEngine run"""
+
+    def __init__(self, text, page_count, page_timings, truncated_by=None):
+        self.text = text
+        self.page_count = page_count
+        self.page_timings = page_timings  # [(page_number, seconds), ...]
+        self.truncated_by = truncated_by  # 'pages', 'chars', 'time' or None
+
+    @property
+    def pages_extracted(self):
+        return len(self.page_timings)
+
+    @property
+    def truncated(self):
+        return self.truncated_by is not None
+
+    def summary(self):
+        return {
+            "page_count": self.page_count,
+            "pages_extracted": self.pages_extracted,
+            "truncated_by": self.truncated_by,
+            "extraction_seconds": round(sum(seconds for _, seconds in self.page_timings), 4),
+        }
+
+
+class PDFExtractionEngine:
+    """Budgeted PDF text extraction, optionally fanned out over a process pool
+
+    Pages are split into contiguous ranges of ``pages_per_chunk`` pages. In
+    parallel mode each range is parsed by a pool worker; small documents and
+    the serial engine run in-process. Page, character and wall-time budgets
+    apply to both paths.
+    """
+
+    _executor = None
+    _executor_workers = None
+    _executor_lock = threading.Lock()
+
+    def __init__(self, engine='parallel', max_workers=None, pages_per_chunk=8,
+                 max_pages=100, max_chars=500000, time_budget=10.0):
+        if engine not in ('parallel', 'serial'):
+            raise ValueError(f"Unknown PDF extraction engine: {engine}")
+        self.engine = engine
+        self.max_workers = max_workers or 1
+        self.pages_per_chunk = max(1, pages_per_chunk)
+        self.max_pages = max_pages
+        self.max_chars = max_chars
+        self.time_budget = time_budget
+
+    @classmethod
+    def from_settings(cls):
+        options = get_pdf_extraction_settings()
+        return cls(
+            engine=options['ENGINE'],
+            max_workers=options['MAX_WORKERS'],
+            pages_per_chunk=options['PAGES_PER_CHUNK'],
+            max_pages=options['MAX_PAGES'],
+            max_chars=options['MAX_CHARS'],
+            time_budget=options['TIME_BUDGET'],
+        )
+
+    @classmethod
+    def get_executor(cls, max_workers):
+        """Return the shared worker pool, creating it on first use"""
+        with cls._executor_lock:
+            if cls._executor is None or cls._executor_workers != max_workers:
+                if cls._executor is not None:
+                    cls._executor.shutdown(wait=False, cancel_futures=True)
+                cls._executor = ProcessPoolExecutor(
+                    max_workers=max_workers,
+                    mp_context=multiprocessing.get_context('fork'),
+                )
+                cls._executor_workers = max_workers
+            return cls._executor
+
+    def extract(self, file_obj):
+        """Extract text from a PDF file object within the configured budgets"""
+        file_obj.seek(0)
+        pdf_bytes = file_obj.read()
+        reader = PyPDF2.PdfReader(io.BytesIO(pdf_bytes))
+        page_count = len(reader.pages)
+        deadline = time.time() + self.time_budget
+
+        truncated_by = None
+        pages_to_read = page_count
+        if self.max_pages is not None and page_count > self.max_pages:
+            pages_to_read = self.max_pages
+            truncated_by = 'pages'
+
+        ranges = [
+            (start, min(start + self.pages_per_chunk, pages_to_read))
+            for start in range(0, pages_to_read, self.pages_per_chunk)
+        ]
+        if self.engine == 'parallel' and self.max_workers > 1 and len(ranges) > 1:
+            chunks = self._extract_parallel(pdf_bytes, ranges, deadline)
+        else:
+            chunks = self._extract_serial(reader, ranges, deadline)
+
+        texts = []
+        page_timings = []
+        chars = 0
+        for _, chunk_texts, chunk_timings in sorted(chunks, key=lambda chunk: chunk[0]):
+            texts.extend(chunk_texts)
+            page_timings.extend(chunk_timings)
+            chars += sum(len(text) for text in chunk_texts)
+
+        if len(page_timings) < pages_to_read and truncated_by is None:
+            truncated_by = 'chars' if chars >= self.max_chars else 'time'
+
+        # Join once instead of growing a string page by page
+        text = "\n".join(texts).strip()
+        if len(text) > self.max_chars:
+            text = text[:self.max_chars]
+            truncated_by = truncated_by or 'chars'
+
+        result = PDFExtractionResult(text, page_count, page_timings, truncated_by)
+        logger.debug("PDF extraction %s, page timings: %s", result.summary(), page_timings)
+        return result
+
+    def _extract_serial(self, reader, ranges, deadline):
+        chunks = []
+        chars = 0
+        for start, stop in ranges:
+            chunk = _extract_page_range(reader, start, stop, deadline, self.max_chars - chars)
+            chunks.append(chunk)
+            chars += sum(len(text) for text in chunk[1])
+            if len(chunk[2]) < stop - start:
+                break
+        return chunks
+
+    def _extract_parallel(self, pdf_bytes, ranges, deadline):
+        executor = self.get_executor(self.max_workers)
+        pending = {
+            executor.submit(_extract_page_range, pdf_bytes, start, stop, deadline, self.max_chars)
+            for start, stop in ranges
+        }
+        chunks = []
+        while pending:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            chunks.extend(future.result() for future in done)
+
+        # Workers stop on their own at the deadline; drop whatever never started
+        for future in pending:
+            future.cancel()
+
+        # Keep only the contiguous run of pages from the start of the document
+        chunks.sort(key=lambda chunk: chunk[0])
+        contiguous = []
+        expected_start = 0
+        for chunk in chunks:
+            start, texts, timings = chunk
+            if start != expected_start:
+                break
+            contiguous.append(chunk)
+            expected_start = start + len(timings)
+        return contiguous
+
+
+def compute_content_hash(file_obj):
+    """SHA-256 hex digest of an uploaded file, read chunk by chunk"""
+    digest = hashlib.sha256()
+    if hasattr(file_obj, 'chunks'):
+        for chunk in file_obj.chunks():
+            digest.update(chunk)
+    else:
+        file_obj.seek(0)
+        for chunk in iter(lambda: file_obj.read(64 * 1024), b''):
+            digest.update(chunk)
+    file_obj.seek(0)
+    return digest.hexdigest()
+
+
+class ExtractionCache:
+    """Content-addressed cache of parsed resume text
+
+    An in-process LRU sits in front of a lookup on ``Resume.content_hash``.
+    With RESUME_DEDUP_SCOPE = 'user' a digest only matches the uploader's own
+    resumes; the default 'global' scope reuses content across users.
+    """
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.reset_stats()
+
+    def reset_stats(self):
+        with self._lock:
+            self._reset_stats()
+
+    def _reset_stats(self):
+        self.memory_hits = 0
+        self.database_hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._reset_stats()
+
+    def stats(self):
+        with self._lock:
+            memory_hits, database_hits, misses = self.memory_hits, self.database_hits, self.misses
+            bytes_saved, entries = self.bytes_saved, len(self._entries)
+        lookups = memory_hits + database_hits + misses
+        return {
+            "memory_hits": memory_hits,
+            "database_hits": database_hits,
+            "misses": misses,
+            "hit_rate": round((memory_hits + database_hits) / lookups, 4) if lookups else 0.0,
+            "bytes_saved": bytes_saved,
+            "entries": entries,
+        }
+
+    def _key(self, digest, user_id):
+        if getattr(settings, 'RESUME_DEDUP_SCOPE', 'global') == 'user':
+            return (user_id, digest)
+        return (None, digest)
+
+    def get(self, digest, user_id=None, file_size=0):
+        """Return cached parsed content for a digest, or None on a miss"""
+        from .models import Resume
+
+        key = self._key(digest, user_id)
+        with self._lock:
+            content = self._entries.get(key)
+            if content is not None:
+                self._entries.move_to_end(key)
+                self.memory_hits += 1
+                self.bytes_saved += file_size
+                return content
+
+        queryset = Resume.objects.filter(
+            content_hash=digest,
+            processing_status=ProcessingStatus.COMPLETED.value,
+            parsed_content__isnull=False
+        )
+        if key[0] is not None:
+            queryset = queryset.filter(user_id=key[0])
+        content = queryset.values_list('parsed_content', flat=True).first()
+        if content is not None:
+            content = str(content)  # CompressedValue -> text
+
+        # Batch uploads look up from several threads; every counter moves under the lock
+        with self._lock:
+            if content is None:
+                self.misses += 1
+                return None
+            self.database_hits += 1
+            self.bytes_saved += file_size
+        self._remember(key, content)
+        return content
+
+    def set(self, digest, content, user_id=None):
+        if content is not None:
+            self._remember(self._key(digest, user_id), content)
+
+    def _remember(self, key, content):
+        with self._lock:
+            self._entries[key] = content
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+extraction_cache = ExtractionCache(max_entries=getattr(settings, 'RESUME_DEDUP_CACHE_SIZE', 256))
+
+
+class BatchItem:
+    """One file of a batch upload and the outcome of extracting it"""
+
+    def __init__(self, file_name, file_obj=None, error=None):
+        self.file_name = file_name
+        self.file_extension = os.path.splitext(file_name)[1].lower()
+        self.file_obj = file_obj
+        self.file_size = file_obj.size if file_obj is not None else None
+        self.error = error
+        self.content = None
+        self.content_hash = None
+        self.deduplicated = False
+
+
+def iter_archive_members(archive_file):
+    """Yield a BatchItem per file in a ZIP upload without extracting to disk
+
+    Members are decompressed straight into memory one at a time. Each one is
+    read with a hard cap so a member that lies about its size in the
+    central directory still cannot inflate past RESUME_MAX_UPLOAD_SIZE.
+    """
+    from .uploadhandlers import HEADER_SIZE, describe_rejection
+
+    max_size = settings.RESUME_MAX_UPLOAD_SIZE
+    with zipfile.ZipFile(archive_file) as archive:
+        for info in archive.infolist():
+            file_name = os.path.basename(info.filename)
+            # Skip folders and OS metadata such as __MACOSX/._resume.pdf
+            if info.is_dir() or not file_name or file_name.startswith('.') or info.filename.startswith('__MACOSX/'):
+                continue
+
+            file_extension = os.path.splitext(file_name)[1].lower()
+            if not FileType.is_supported(file_extension):
+                yield BatchItem(file_name, error=describe_rejection('unsupported_type', file_name))
+                continue
+            if info.file_size > max_size:
+                yield BatchItem(file_name, error=describe_rejection('too_large', file_name))
+                continue
+
+            with archive.open(info) as member:
+                data = member.read(max_size + 1)
+            if len(data) > max_size:
+                yield BatchItem(file_name, error=describe_rejection('too_large', file_name))
+            elif not FileType.matches_signature(file_extension, data[:HEADER_SIZE]):
+                yield BatchItem(file_name, error=describe_rejection('content_mismatch', file_name))
+            else:
+                yield BatchItem(file_name, ContentFile(data, name=file_name))
+
+
+def extract_batch(items, extractor_class, user_id=None, max_workers=None):
+    """Extract every valid BatchItem concurrently on a thread pool
+
+    Each item gets its own ``extractor_class`` instance (the upload view), so
+    the regular extraction methods are reused. Dedup cache lookups stay on
+    the calling thread so pool threads never open database connections.
+    Multi-page PDFs additionally fan out over the PDF engine's process pool.
+
+    Every extraction holds a slot of the process's ExtractionGate, like a
+    single upload. ExtractionQueueFull or SandboxBusy cancels the items not
+    yet started and propagates, so the caller can turn the batch away.
+    """
+    pending = []
+    for item in items:
+        if item.error is not None:
+            continue
+        item.content_hash = compute_content_hash(item.file_obj)
+        cached = extraction_cache.get(item.content_hash, user_id, item.file_size)
+        if cached is not None:
+            item.content = cached
+            item.deduplicated = True
+        else:
+            pending.append(item)
+
+    gate = get_extraction_gate()
+
+    def run(item):
+        with gate.slot():
+            try:
+                item.content = extractor_class().extract_content_from_file(item.file_obj, item.file_extension)
+            except SandboxBusy:
+                raise
+            except Exception as e:
+                item.error = str(e)
+
+    max_workers = max_workers or getattr(settings, 'RESUME_BATCH_WORKERS', 4)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = [pool.submit(run, item) for item in pending]
+        try:
+            for future in futures:
+                future.result()
+        except (ExtractionQueueFull, SandboxBusy):
+            pool.shutdown(cancel_futures=True)
+            raise
+
+    for item in pending:
+        if item.error is None:
+            extraction_cache.set(item.content_hash, item.content, user_id)
+    return items
+
+
+DEFAULT_PURGE = {
+    'RETENTION_DAYS': 7,  # FAILED resumes older than this are deleted
+    'STUCK_TIMEOUT_MINUTES': 60,  # PENDING/PROCESSING longer than this become FAILED
+    'BATCH_SIZE': 500,
+    'TIME_BUDGET': 30.0,  # seconds per run
+}
+
+
+class PurgeReport:
+    """What a ResumePurgeEngine run did"""
+
+    def __init__(self):
+        self.deleted = 0
+        self.reaped = 0
+        self.batches = 0
+        self.elapsed = 0.0
+        self.completed = False  # False when the time budget ran out first
+
+    @property
+    def rows_per_second(self):
+        return round(self.deleted / self.elapsed, 1) if self.elapsed else 0.0
+
+    def as_dict(self):
+        return {
+            "deleted": self.deleted,
+            "reaped": self.reaped,
+            "batches": self.batches,
+            "elapsed": round(self.elapsed, 3),
+            "rows_per_second": self.rows_per_second,
+            "completed": self.completed,
+        }
+
+
+class ResumePurgeEngine:
+    """Delete expired FAILED resumes in bounded primary-key batches
+
+    Each batch is its own short transaction, so the table is never locked for
+    the whole backlog. A run stops when its time budget is spent and records
+    the last deleted id in the cache; the next run continues from there and
+    the checkpoint is cleared once the backlog is drained. Before purging,
+    resumes stuck in PENDING/PROCESSING past the timeout are marked FAILED.
+    """
+
+    checkpoint_key = 'resume:purge:checkpoint'
+
+    def __init__(self, retention_days=7, stuck_timeout_minutes=60, batch_size=500, time_budget=30.0):
+        self.retention = timedelta(days=retention_days)
+        self.stuck_timeout = timedelta(minutes=stuck_timeout_minutes)
+        self.batch_size = batch_size
+        self.time_budget = time_budget
+
+    @classmethod
+    def from_settings(cls):
+        options = dict(DEFAULT_PURGE)
+        options.update(getattr(settings, 'RESUME_PURGE', {}))
+        return cls(
+            retention_days=options['RETENTION_DAYS'],
+            stuck_timeout_minutes=options['STUCK_TIMEOUT_MINUTES'],
+            batch_size=options['BATCH_SIZE'],
+            time_budget=options['TIME_BUDGET'],
+        )
+
+    def run(self):
+        report = PurgeReport()
+        started = time.perf_counter()
+        deadline = started + self.time_budget
+        now = timezone.now()
+
+        report.reaped = self.reap_stuck(now - self.stuck_timeout, deadline)
+        if time.perf_counter() < deadline:
+            report.completed = self.purge_failed(now - self.retention, deadline, report)
+
+        report.elapsed = time.perf_counter() - started
+        logger.info("Resume purge %s", report.as_dict())
+        return report
+
+    def reap_stuck(self, cutoff, deadline):
+        """Mark resumes that never finished processing as FAILED"""
+        from .models import Resume
+
+        stuck = Resume.objects.filter(
+            processing_status__in=[ProcessingStatus.PENDING.value, ProcessingStatus.PROCESSING.value],
+            uploaded_at__lt=cutoff
+        )
+        reaped = 0
+        while time.perf_counter() < deadline:
+            batch = list(stuck.order_by('id').only('id', 'file')[:self.batch_size])
+            if not batch:
+                break
+            # Spooled async uploads will never be read now
+            for resume in batch:
+                if resume.file:
+                    resume.file.delete(save=False)
+            reaped += Resume.objects.filter(id__in=[resume.id for resume in batch]).update(
+                file=None,
+                processing_status=ProcessingStatus.FAILED.value,
+                error_message="Processing timed out",
+                processed_at=timezone.now()
+            )
+        return reaped
+
+    def purge_failed(self, cutoff, deadline, report):
+        """Delete FAILED resumes older than the cutoff; True once none are left"""
+        from .models import Resume
+
+        checkpoint = cache.get(self.checkpoint_key, 0)
+        expired = Resume.objects.filter(
+            processing_status=ProcessingStatus.FAILED.value,
+            uploaded_at__lt=cutoff
+        )
+        while time.perf_counter() < deadline:
+            ids = list(expired.filter(id__gt=checkpoint).order_by('id').values_list('id', flat=True)[:self.batch_size])
+            if not ids:
+                cache.delete(self.checkpoint_key)
+                return True
+            with transaction.atomic():
+                # Cascades to GeneratedQuestion; only ids are loaded for the collector
+                Resume.objects.filter(id__in=ids).only('id').delete()
+            report.deleted += len(ids)
+            report.batches += 1
+            checkpoint = ids[-1]
+            cache.set(self.checkpoint_key, checkpoint, None)
+        return False
+
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]")
+
+MAX_HASHED_COLUMNS = 500000
+
+
+class HashedColumns(dict):
+    """Memo of token -> hashed column, filled on first sight of a token"""
+
+    def __init__(self, n_features):
+        super().__init__()
+        self.mask = n_features - 1
+
+    def __missing__(self, token):
+        column = self[token] = zlib.crc32(token.encode()) & self.mask
+        return column
+
+
+_column_memos = {}
+
+
+def _hashed_columns(n_features):
+    """Per-width memo shared by all vectorizers; callers clear it past MAX_HASHED_COLUMNS"""
+    if n_features not in _column_memos:
+        _column_memos[n_features] = HashedColumns(n_features)
+    return _column_memos[n_features]
+
+
+class HashedTfidfVectorizer:
+    """TF-IDF over hashed word unigrams and bigrams
+
+    Tokens are hashed with CRC32 into ``n_features`` columns, so there is no
+    vocabulary to build or keep in sync and vectors from different processes
+    agree. Term frequencies are log-scaled and rows are L2-normalised, which
+    makes a dot product a cosine similarity.
+    """
+
+    def __init__(self, n_features=2 ** 18, bigrams=True):
+        self.n_features = n_features
+        self.bigrams = bigrams
+        self.idf = None
+
+    def tokens(self, text):
+        words = TOKEN_PATTERN.findall(text.lower())
+        if self.bigrams:
+            return words + [f"{first} {second}" for first, second in zip(words, words[1:])]
+        return words
+
+    def counts(self, texts):
+        """Sparse (len(texts), n_features) matrix of 1 + log(term count)"""
+        indptr = [0]
+        indices = []
+        columns = _hashed_columns(self.n_features)
+        for text in texts:
+            # map() over the memo keeps the per-token loop in C for known tokens
+            indices.extend(map(columns.__getitem__, self.tokens(text or '')))
+            indptr.append(len(indices))
+        if len(columns) > MAX_HASHED_COLUMNS:
+            columns.clear()
+        data = np.ones(len(indices), dtype=np.float32)
+        matrix = sparse.csr_matrix(
+            (data, np.asarray(indices, dtype=np.int32), np.asarray(indptr, dtype=np.int64)),
+            shape=(len(texts), self.n_features)
+        )
+        matrix.sum_duplicates()
+        matrix.data = 1 + np.log(matrix.data)
+        return matrix
+
+    def fit_transform(self, texts):
+        matrix = self.counts(texts)
+        document_frequency = np.bincount(matrix.indices, minlength=self.n_features)
+        self.idf = (np.log((1 + len(texts)) / (1 + document_frequency)) + 1).astype(np.float32)
+        return self._weight(matrix)
+
+    def transform(self, texts):
+        return self._weight(self.counts(texts))
+
+    def _weight(self, matrix):
+        matrix = matrix.multiply(self.idf).tocsr()
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+        norms[norms == 0] = 1
+        return sparse.diags(1 / norms).dot(matrix).tocsr()
+
+
+class JobMatcher:
+    """Score resumes against every active JobPosition with one sparse product
+
+    The job matrix is built once per process and reused while the job
+    positions are unchanged. Each use compares the row count and latest
+    updated_at of all positions with the ones the matrix was built from;
+    that one aggregate query reads the database every process shares, so a
+    change saved by any web or Celery process is picked up by all of them.
+    """
+
+    def __init__(self, chunk_size=2000):
+        self.chunk_size = chunk_size
+        self._lock = threading.Lock()
+        self._version = None
+        self._vectorizer = None
+        self._matrix = None
+        self._jobs = []
+
+    def current_version(self):
+        """(count, latest updated_at) over all positions, active or not
+
+        Edits and deactivations move updated_at and deletions change the
+        count; QuerySet.update() must set updated_at itself to be noticed.
+        """
+        from .models import JobPosition
+
+        stats = JobPosition.objects.aggregate(count=Count('id'), updated=Max('updated_at'))
+        return stats['count'], stats['updated']
+
+    def get_job_matrix(self):
+        """Return (vectorizer, (job columns, job matrix), job rows), rebuilding if stale"""
+        from .models import JobPosition
+
+        version = self.current_version()
+        with self._lock:
+            if self._matrix is None or self._version != version:
+                jobs = list(
+                    JobPosition.objects.filter(is_active=True)
+                    .order_by('id')
+                    .values('id', 'title', 'department', 'description')
+                )
+                vectorizer = HashedTfidfVectorizer()
+                matrix = vectorizer.fit_transform(
+                    [f"{job['title']} {job['department']} {job['description']}" for job in jobs]
+                )
+                # Only columns some job uses can contribute to a score, so keep
+                # the job side as a small dense (job terms x jobs) block
+                columns = np.unique(matrix.indices)
+                self._matrix = (columns, matrix[:, columns].T.toarray())
+                self._vectorizer, self._jobs = vectorizer, jobs
+                self._version = version
+            return self._vectorizer, self._matrix, self._jobs
+
+    def top_matches(self, texts, k=5):
+        """Top-k (job, score) pairs for each text, best first"""
+        vectorizer, (columns, job_matrix), jobs = self.get_job_matrix()
+        if not jobs:
+            return [[] for _ in texts]
+        k = min(k, len(jobs))
+
+        matches = []
+        for start in range(0, len(texts), self.chunk_size):
+            # Chunking bounds the dense score block to chunk_size x len(jobs)
+            resumes = vectorizer.transform(texts[start:start + self.chunk_size])
+            scores = resumes[:, columns].dot(job_matrix)
+            best = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            for row, candidates in enumerate(best):
+                ordered = candidates[np.argsort(-scores[row, candidates])]
+                matches.append([
+                    (jobs[column], float(scores[row, column]))
+                    for column in ordered
+                    if scores[row, column] > 0
+                ])
+        return matches
+
+    def match_resumes(self, resumes, k=5):
+        """Map resume id -> top-k matches for a Resume queryset, streamed in chunks"""
+        results = {}
+        batch_ids = []
+        batch_texts = []
+        for resume in resumes.filter(parsed_content__isnull=False).only('id', 'parsed_content').iterator(chunk_size=self.chunk_size):
+            batch_ids.append(resume.id)
+            batch_texts.append(resume.parsed_content)
+            if len(batch_ids) >= self.chunk_size:
+                results.update(zip(batch_ids, self.top_matches(batch_texts, k)))
+                batch_ids, batch_texts = [], []
+        if batch_ids:
+            results.update(zip(batch_ids, self.top_matches(batch_texts, k)))
+        return results
+
+
+job_matcher = JobMatcher()
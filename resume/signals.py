@@ -0,0 +1,68 @@
+from functools import partial
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from .authentication import token_cache
+from .fields import CompressedValue
+from .models import Resume
+from .questions import question_cache
+from .search import index_resume, remove_resume
+from .sections import index_sections
+
+
+def parsed_content_saved(instance, update_fields):
+    """Whether a save may have written a new parsed_content"""
+    if update_fields is not None and 'parsed_content' not in update_fields:
+        return False
+    if 'parsed_content' in instance.get_deferred_fields():
+        return False
+    # Loaded but never read, so it cannot have changed
+    return not isinstance(instance.__dict__.get('parsed_content'), CompressedValue)
+
+
+@receiver(post_save, sender=Resume)
+def update_search_index(sender, instance, update_fields=None, **kwargs):
+    """Keep the full-text index in step with parsed_content"""
+    if parsed_content_saved(instance, update_fields):
+        index_resume(instance.id, instance.user_id, instance.parsed_content)
+
+
+@receiver(post_save, sender=Resume)
+def update_section_index(sender, instance, created=False, update_fields=None, **kwargs):
+    """Re-segment parsed_content into ResumeSection rows whenever it is written"""
+    if not parsed_content_saved(instance, update_fields):
+        return
+    if created and not instance.parsed_content:
+        return  # nothing to segment and nothing stored yet
+    index_sections([instance])
+
+
+@receiver(post_delete, sender=Resume)
+def remove_from_search_index(sender, instance, **kwargs):
+    remove_resume(instance.id)
+
+
+@receiver(post_delete, sender=Resume)
+def invalidate_resume_questions(sender, instance, **kwargs):
+    """Stop serving cached questions of a deleted resume"""
+    # Bound now: the deleted instance's pk is cleared before the commit
+    transaction.on_commit(partial(question_cache.invalidate, [instance.id]))
+
+
+@receiver(post_delete, sender=Token)
+def invalidate_deleted_token(sender, instance, **kwargs):
+    """Revoked tokens (and tokens of deleted users) stop working at once"""
+    token_cache.invalidate(instance.key)
+
+
+@receiver(post_save, sender=get_user_model())
+def invalidate_user_tokens(sender, instance, update_fields=None, **kwargs):
+    """Drop cached credentials holding an outdated copy of the user"""
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return  # every login saves last_login; nothing auth depends on
+    keys = list(Token.objects.filter(user_id=instance.pk).values_list('key', flat=True))
+    token_cache.invalidate(*keys)
@@ -1,22 +1,109 @@
-import os
+import io
+
 from celery import shared_task
 from django.utils import timezone
-from datetime import timedelta
 from .enums import ProcessingStatus
+from .metrics import metrics
 
 @shared_task
+@metrics.timed('resume_task_duration_seconds', task='cleanup_failed_resumes')
 def cleanup_failed_resumes():
     """Clean up resumes that failed processing after a certain time"""
+    from .services import ResumePurgeEngine
+
+    # Deletes in bounded batches within a time budget; the next run resumes
+    report = ResumePurgeEngine.from_settings().run()
+
+    return (
+        f"Cleaned up {report.deleted} failed resumes "
+        f"({report.rows_per_second} rows/sec, {'complete' if report.completed else 'partial'}), "
+        f"reaped {report.reaped} stuck resumes"
+    )
+
+
+@shared_task
+@metrics.timed('resume_task_duration_seconds', task='process_resume')
+def process_resume(resume_id):
+    """Extract content for a resume that was uploaded in async mode"""
     from .models import Resume
-    
-    # Delete resumes that failed more than 7 days ago
-    cutoff_date = timezone.now() - timedelta(days=7)
-    failed_resumes = Resume.objects.filter(
-        processing_status=ProcessingStatus.FAILED.value,
-        uploaded_at__lt=cutoff_date
+    from .services import extraction_cache
+    from .views import ResumeUploadView
+
+    # Claim the record so a duplicate delivery does not extract it twice
+    claimed = Resume.objects.filter(
+        id=resume_id,
+        processing_status=ProcessingStatus.PENDING.value
+    ).update(processing_status=ProcessingStatus.PROCESSING.value)
+    if not claimed:
+        metrics.inc('resume_tasks_total', task='process_resume', status='skipped')
+        return f"Resume {resume_id} is not pending"
+
+    stages = metrics.stage_timer(task='process_resume')
+    resume = Resume.objects.get(id=resume_id)
+    try:
+        with stages('read'):
+            file_obj = io.BytesIO(resume.file.read())
+            resume.file.close()
+        with stages('extract'):
+            content = ResumeUploadView().extract_content_from_file(file_obj, resume.file_type)
+    except Exception as e:
+        resume.processing_status = ProcessingStatus.FAILED.value
+        resume.error_message = str(e)
+    else:
+        resume.set_parsed_content(content)
+        resume.processing_status = ProcessingStatus.COMPLETED.value
+        resume.is_processed = True
+        if resume.content_hash:
+            extraction_cache.set(resume.content_hash, content, resume.user_id)
+    finally:
+        # The stored upload is only needed until extraction has run
+        if resume.file:
+            resume.file.delete(save=False)
+
+    resume.processed_at = timezone.now()
+    with stages('persist'):
+        resume.save(update_fields=[
+            'file', 'parsed_content', 'content_preview', 'content_length',
+            'processing_status', 'error_message', 'processed_at', 'is_processed'
+        ])
+    metrics.inc('resume_tasks_total', task='process_resume', status=resume.processing_status)
+    metrics.inc('resume_uploads_total', file_type=resume.file_type, status=resume.processing_status)
+
+    return f"Processed resume {resume_id}: {resume.processing_status}"
+
+
+@shared_task
+@metrics.timed('resume_task_duration_seconds', task='generate_questions')
+def generate_questions(resume_id, job_position_id):
+    """Generate interview questions for one resume and job position"""
+    from .models import JobPosition, Resume
+    from .questions import question_generator
+
+    resume = Resume.objects.only('id', 'parsed_content', 'processing_status').get(id=resume_id)
+    if resume.processing_status != ProcessingStatus.COMPLETED.value:
+        return f"Resume {resume_id} is not processed"
+    job_position = JobPosition.objects.get(id=job_position_id)
+
+    questions = question_generator.regenerate(resume, job_position)
+
+    return f"Generated {len(questions)} questions for resume {resume_id}"
+
+
+@shared_task
+@metrics.timed('resume_task_duration_seconds', task='generate_questions_batch')
+def generate_questions_batch(job_position_id, resume_ids=None):
+    """Generate interview questions for many resumes against one job position"""
+    from .models import JobPosition, Resume
+    from .questions import question_generator
+
+    job_position = JobPosition.objects.get(id=job_position_id)
+    resumes = Resume.objects.all()
+    if resume_ids is not None:
+        resumes = resumes.filter(id__in=resume_ids)
+
+    report = question_generator.generate_batch(resumes, job_position)
+
+    return (
+        f"Generated {report['questions']} questions for {report['resumes']} resumes "
+        f"({report['resumes_per_second']} resumes/sec, {report['questions_per_second']} questions/sec)"
     )
-    
-    count = failed_resumes.count()
-    failed_resumes.delete()
-    
-    return f"Cleaned up {count} failed resumes"
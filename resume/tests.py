@@ -1,3 +1,1801 @@
-from django.test import TestCase
+import csv
+import hashlib
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import zipfile
+from datetime import timedelta
+from unittest.mock import patch
 
-# Create your tests here.
+import chardet
+
+from django.contrib.auth.models import User
+from docx import Document
+from docx.oxml import parse_xml
+from django.core.cache import cache, caches
+from django.core.management import call_command
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.utils.http import http_date
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from resume.admin import EstimatedCountPaginator, GeneratedQuestionAdmin, JobPositionAdmin, ResumeAdmin
+from resume.admission import ExtractionGate, parse_rate
+from resume.authentication import CachedTokenAuthentication, TokenCache, token_cache
+from resume.checks import check_question_cache_is_shared
+from resume.corpus import build_doc, build_rtf, generate_corpus, make_pdf
+from resume.decoding import ExtensionEncodingCache, TextDecoder
+from resume.enums import FileType, ProcessingStatus, QuestionCategory
+from resume.executor import BoundedExecutor, ExtractionQueueFull
+from resume.extractors import registry as extractors
+from resume.fields import PLAIN, ZLIB, decompress_text
+from resume.indexes import PrefixIndex
+from resume.management.commands.benchmark_extraction import percentile
+from resume.metrics import NULL_TIMER, MetricsRegistry, metrics
+from resume.models import GeneratedQuestion, JobPosition, Resume, ResumeSection
+from resume.questions import KeywordMatcher, QuestionCache, QuestionGenerator, question_cache
+from resume.rtf import rtf_to_text
+from resume.word import doc_to_text, docx_to_text
+from resume.sandbox import (
+    SandboxBusy, SandboxError, SandboxPool, SandboxTimeout, SandboxWorkerDied, get_sandbox_pool, reset_sandbox_pool
+)
+from resume.sections import segment_resume
+from resume.services import (
+    ExtractionCache, JobMatcher, PDFExtractionEngine, ResumePurgeEngine, extraction_cache
+)
+from resume.tasks import (
+    cleanup_failed_resumes, generate_questions, generate_questions_batch, process_resume
+)
+
+
+# In-memory stand-ins, so tests never touch the on-disk shared cache
+TEST_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'tests-default'},
+    'shared': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'tests-shared'},
+}
+
+
+@override_settings(CACHES=TEST_CACHES)
+class ResumeTestCase(TestCase):
+    def setUp(self):
+        extraction_cache.clear()
+        cache.clear()  # throttle buckets
+        caches['shared'].clear()  # question cache
+        self.user = User.objects.create_user(username='candidate', password='secret')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def upload(self, name='resume.txt', content=b'Python developer', **extra):
+        data = {'resume': SimpleUploadedFile(name, content)}
+        data.update(extra)
+        return self.client.post('/api/upload/', data, format='multipart')
+
+
+class ResumeUploadTests(ResumeTestCase):
+    def test_sync_upload_extracts_inline(self):
+        response = self.upload()
+
+        self.assertEqual(response.status_code, 201)
+        resume = Resume.objects.get(id=response.data['resume_id'])
+        self.assertEqual(resume.parsed_content, 'Python developer')
+        self.assertEqual(resume.processing_status, ProcessingStatus.COMPLETED.value)
+        self.assertIsNotNone(resume.processed_at)
+
+    def test_unsupported_extension_is_rejected(self):
+        response = self.upload(name='resume.exe')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Resume.objects.exists())
+
+
+class ResumeUploadHandlerTests(ResumeTestCase):
+    def test_content_hash_is_computed_while_streaming(self):
+        response = self.upload()
+
+        resume = Resume.objects.get(id=response.data['resume_id'])
+        self.assertEqual(resume.content_hash, hashlib.sha256(b'Python developer').hexdigest())
+
+    def test_magic_bytes_must_match_extension(self):
+        response = self.upload(name='resume.pdf', content=b'MZ\x90\x00 not really a pdf')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('does not match', response.data['error'])
+        self.assertFalse(Resume.objects.exists())
+
+    def test_unsupported_extension_is_never_buffered(self):
+        with patch('django.core.files.uploadhandler.MemoryFileUploadHandler.receive_data_chunk') as receive:
+            response = self.upload(name='resume.exe')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('supported_types', response.data)
+        receive.assert_not_called()
+
+    @override_settings(RESUME_MAX_UPLOAD_SIZE=100)
+    def test_oversized_upload_is_aborted_mid_stream(self):
+        response = self.upload(content=b'x' * 1000)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('too large', response.data['error'])
+        self.assertFalse(Resume.objects.exists())
+
+
+# Extractors for the sandbox tests; module level so workers can unpickle them
+def extract_pid(data, extension):
+    return str(os.getpid())
+
+
+def extract_forever(data, extension):
+    while True:
+        pass
+
+
+def extract_slowly(data, extension):
+    time.sleep(10)
+
+
+def extract_everything(data, extension):
+    return bytearray(1 << 36)
+
+
+class ExtractionSandboxTests(ResumeTestCase):
+    def make_pool(self, **options):
+        pool = SandboxPool(**options)
+        self.addCleanup(pool.shutdown)
+        return pool
+
+    def test_registry_is_keyed_by_file_type(self):
+        self.assertEqual(set(extractors.file_types()), set(FileType))
+        self.assertEqual(extractors.get('.PDF').__name__, 'extract_pdf')
+        self.assertEqual(extractors.get('.xyz').__name__, 'extract_generic')
+
+    def test_warm_workers_are_reused(self):
+        pool = self.make_pool(workers=1)
+
+        self.assertEqual(pool.run(extract_pid, b'', '.txt'), pool.run(extract_pid, b'', '.txt'))
+        self.assertNotEqual(pool.run(extract_pid, b'', '.txt'), str(os.getpid()))
+
+    def test_cpu_limit_kills_worker_and_pool_recovers(self):
+        pool = self.make_pool(workers=1, cpu_time=1, wall_time=20)
+        before = pool.run(extract_pid, b'', '.txt')
+
+        with self.assertRaisesMessage(SandboxWorkerDied, 'SIGXCPU'):
+            pool.run(extract_forever, b'', '.txt')
+
+        self.assertNotEqual(pool.run(extract_pid, b'', '.txt'), before)
+
+    def test_wall_time_limit(self):
+        pool = self.make_pool(workers=1, wall_time=0.5)
+
+        with self.assertRaises(SandboxTimeout):
+            pool.run(extract_slowly, b'', '.txt')
+        self.assertTrue(pool.run(extract_pid, b'', '.txt'))
+
+    def test_memory_limit(self):
+        pool = self.make_pool(workers=1, memory_limit=64 * 1024 * 1024)
+
+        with self.assertRaisesMessage(SandboxError, 'MemoryError'):
+            pool.run(extract_everything, b'', '.txt')
+        self.assertTrue(pool.run(extract_pid, b'', '.txt'))
+
+    @override_settings(RESUME_EXTRACTION_SANDBOX={'ENABLED': True, 'WORKERS': 1, 'CPU_TIME': 1})
+    def test_pathological_upload_fails_instead_of_hanging(self):
+        with patch.dict(extractors._extractors, {FileType.TXT: extract_forever}):
+            response = self.upload()
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('SIGXCPU', response.data['error'])
+        self.assertFalse(Resume.objects.exists())
+        # The replacement worker serves the next upload
+        self.assertEqual(self.upload(content=b'Django developer').status_code, 201)
+
+    @override_settings(RESUME_EXTRACTION_SANDBOX={'ENABLED': True})
+    def test_busy_sandbox_returns_429(self):
+        with patch('resume.extractors.get_sandbox_pool') as get_pool:
+            get_pool.return_value.run.side_effect = SandboxBusy("No extraction worker became free", 4)
+            response = self.upload()
+            batch = self.client.post('/api/upload/batch/', {
+                'files': [SimpleUploadedFile('a.txt', b'Go'), SimpleUploadedFile('b.txt', b'Rust')]
+            }, format='multipart')
+
+        for result in (response, batch):
+            self.assertEqual(result.status_code, 429)
+            self.assertEqual(result['Retry-After'], '4')
+        self.assertFalse(Resume.objects.exists())
+
+    @override_settings(RESUME_ADMISSION={'MAX_CONCURRENT_EXTRACTIONS': 3})
+    def test_pool_is_sized_from_the_gate(self):
+        pool = SandboxPool.from_settings()
+        self.addCleanup(pool.shutdown)
+        self.assertEqual(pool.size, 3)
+
+    def test_only_sandbox_settings_restart_the_pool(self):
+        self.addCleanup(reset_sandbox_pool)
+        pool = get_sandbox_pool()
+
+        with override_settings(RESUME_METRICS={'ENABLED': False}):
+            self.assertIs(get_sandbox_pool(), pool)
+        with override_settings(RESUME_EXTRACTION_SANDBOX={'WORKERS': 1}):
+            self.assertIsNot(get_sandbox_pool(), pool)
+
+
+class ExtractionCacheTests(ResumeTestCase):
+    def test_reupload_reuses_parsed_content(self):
+        first = self.upload()
+        second = self.upload()
+
+        self.assertFalse(first.data['deduplicated'])
+        self.assertTrue(second.data['deduplicated'])
+        first_resume, second_resume = Resume.objects.order_by('id')
+        self.assertEqual(first_resume.content_hash, second_resume.content_hash)
+        self.assertEqual(second_resume.parsed_content, 'Python developer')
+        self.assertEqual(extraction_cache.stats()['memory_hits'], 1)
+        self.assertEqual(extraction_cache.stats()['misses'], 1)
+
+    def test_database_layer_serves_after_lru_is_cleared(self):
+        self.upload()
+        extraction_cache.clear()
+
+        response = self.upload()
+
+        self.assertTrue(response.data['deduplicated'])
+        self.assertEqual(extraction_cache.stats()['database_hits'], 1)
+
+    def test_counters_are_exact_across_threads(self):
+        cache = ExtractionCache()
+
+        def look_up():
+            try:
+                for index in range(25):
+                    cache.get(f'missing-{index}')
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=look_up) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(cache.stats()['misses'], 200)
+
+    def test_lru_evicts_oldest_entry(self):
+        cache = ExtractionCache(max_entries=2)
+        cache.set('a', 'A')
+        cache.set('b', 'B')
+        cache.get('a')
+        cache.set('c', 'C')
+
+        self.assertEqual(list(cache._entries), [(None, 'a'), (None, 'c')])
+
+    @override_settings(RESUME_DEDUP_SCOPE='user')
+    def test_user_scope_does_not_share_across_users(self):
+        self.upload()
+        other = User.objects.create_user(username='other', password='secret')
+        self.client.force_authenticate(user=other)
+
+        response = self.upload()
+
+        self.assertFalse(response.data['deduplicated'])
+
+
+class ResumeListTests(ResumeTestCase):
+    def setUp(self):
+        super().setUp()
+        for index in range(5):
+            Resume.objects.create(
+                user=self.user,
+                original_filename=f'resume{index}.txt',
+                file_type='.pdf' if index % 2 else '.txt',
+                parsed_content='x' * 1000,
+                processing_status=ProcessingStatus.COMPLETED.value
+            )
+        # Give several rows the same timestamp so the id tiebreak is exercised
+        Resume.objects.filter(id__in=Resume.objects.order_by('id').values('id')[1:4]).update(
+            uploaded_at=timezone.now()
+        )
+
+    def test_pages_cover_every_resume_once_in_order(self):
+        seen = []
+        cursor = None
+        while True:
+            params = {'page_size': 2}
+            if cursor:
+                params['cursor'] = cursor
+            response = self.client.get('/api/list/', params)
+            self.assertEqual(response.status_code, 200)
+            seen.extend(resume['id'] for resume in response.data['resumes'])
+            cursor = response.data['next_cursor']
+            if not cursor:
+                break
+
+        expected = list(Resume.objects.order_by('-uploaded_at', '-id').values_list('id', flat=True))
+        self.assertEqual(seen, expected)
+
+    def test_query_does_not_select_parsed_content(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get('/api/list/')
+
+        resume_queries = [query['sql'] for query in queries if 'resume_resume' in query['sql']]
+        self.assertEqual(len(resume_queries), 1)
+        self.assertNotIn('parsed_content', resume_queries[0])
+
+    def test_filters(self):
+        response = self.client.get('/api/list/', {'file_type': 'pdf', 'status': 'completed'})
+
+        self.assertEqual(response.data['count'], 2)
+        self.assertTrue(all(resume['file_type'] == '.pdf' for resume in response.data['resumes']))
+
+    def test_invalid_cursor_and_filter_are_rejected(self):
+        self.assertEqual(self.client.get('/api/list/', {'cursor': 'garbage'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/list/', {'status': 'bogus'}).status_code, 400)
+
+
+class ResumeStatusTests(ResumeTestCase):
+    def setUp(self):
+        super().setUp()
+        response = self.upload(content=b'A' * 800)
+        self.url = f"/api/status/{response.data['resume_id']}/"
+
+    def test_preview_comes_from_precomputed_column(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.data['content_preview'], 'A' * 500 + '...')
+        self.assertEqual(response.data['content_length'], 800)
+        resume_query = [query['sql'] for query in queries if 'resume_resume' in query['sql']][0]
+        self.assertNotIn('parsed_content', resume_query)
+
+    def test_matching_etag_returns_not_modified(self):
+        first = self.client.get(self.url)
+
+        second = self.client.get(self.url, HTTP_IF_NONE_MATCH=first['ETag'])
+
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(second['ETag'], first['ETag'])
+
+    def test_etag_changes_with_status(self):
+        first = self.client.get(self.url)
+        Resume.objects.update(processing_status=ProcessingStatus.FAILED.value, error_message='boom')
+
+        second = self.client.get(self.url, HTTP_IF_NONE_MATCH=first['ETag'])
+
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.data['error_message'], 'boom')
+
+    def test_if_modified_since_alone_never_hides_a_change(self):
+        first = self.client.get(self.url)
+        self.assertNotIn('Last-Modified', first)
+        Resume.objects.update(processing_status=ProcessingStatus.PROCESSING.value)
+
+        second = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=http_date(time.time() + 60))
+
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.data['status'], ProcessingStatus.PROCESSING.value)
+
+
+class AsyncViewTests(ResumeTestCase):
+    def test_async_endpoints_match_sync(self):
+        response = self.client.post('/api/async/upload/', {'resume': SimpleUploadedFile('resume.txt', b'Python developer')})
+
+        self.assertEqual(response.status_code, 201)
+        resume_id = response.data['resume_id']
+        self.assertEqual(Resume.objects.get(id=resume_id).parsed_content, 'Python developer')
+        sync_status = self.client.get(f'/api/status/{resume_id}/')
+        async_status = self.client.get(f'/api/async/status/{resume_id}/')
+        self.assertEqual(async_status.data, sync_status.data)
+        self.assertEqual(async_status['ETag'], sync_status['ETag'])
+        self.assertEqual(self.client.get('/api/async/list/').data, self.client.get('/api/list/').data)
+        self.assertEqual(self.client.get('/api/async/status/999/').status_code, 404)
+
+    def test_async_upload_shares_the_extraction_gate(self):
+        gate = ExtractionGate(max_concurrent=1, queue_size=0, retry_after=7)
+        with patch('resume.views.get_extraction_gate', return_value=gate), gate.slot():
+            response = self.client.post('/api/async/upload/', {'resume': SimpleUploadedFile('resume.txt', b'Go')})
+
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '7')
+        self.assertFalse(Resume.objects.exists())
+
+    def test_executor_rejects_beyond_capacity(self):
+        executor = BoundedExecutor(workers=1, queue_size=1, retry_after=3)
+        release = threading.Event()
+        try:
+            running = executor.submit(release.wait)
+            executor.submit(release.wait)
+            with self.assertRaises(ExtractionQueueFull):
+                executor.submit(release.wait)
+            release.set()
+            running.result(timeout=5)
+            executor.submit(int).result(timeout=5)
+        finally:
+            release.set()
+            executor.shutdown()
+
+    def test_saturated_executor_returns_429(self):
+        executor = BoundedExecutor(workers=1, queue_size=0, retry_after=3)
+        release = threading.Event()
+        executor.submit(release.wait)
+        try:
+            with patch('resume.views.get_extraction_executor', return_value=executor):
+                response = self.client.post('/api/async/upload/', {'resume': SimpleUploadedFile('resume.txt', b'Go')})
+        finally:
+            release.set()
+            executor.shutdown()
+
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '3')
+        self.assertFalse(Resume.objects.exists())
+
+
+class AdmissionControlTests(ResumeTestCase):
+    THROTTLES = {'THROTTLES': {'upload': {'RATE': '6/min', 'BURST': 2}}}
+
+    def test_parse_rate(self):
+        self.assertEqual(parse_rate('30/min'), 0.5)
+        self.assertEqual(parse_rate('2/s'), 2)
+        self.assertEqual(parse_rate('24/day'), 24 / 86400)
+
+    def test_upload_is_throttled_per_user_after_burst(self):
+        with override_settings(RESUME_ADMISSION=self.THROTTLES):
+            statuses = [self.upload(content=f'Python {index}'.encode()).status_code for index in range(3)]
+            self.assertEqual(statuses, [201, 201, 429])
+            response = self.upload(content=b'Go')
+            self.assertEqual(int(response['Retry-After']), 10)
+            # Other users and other scopes have their own buckets
+            self.assertEqual(self.client.get('/api/list/').status_code, 200)
+            self.client.force_authenticate(user=User.objects.create_user(username='other'))
+            self.assertEqual(self.upload(content=b'Rust').status_code, 201)
+
+    def test_bucket_refills_over_time(self):
+        with override_settings(RESUME_ADMISSION=self.THROTTLES):
+            with patch('resume.admission.time.time', return_value=1000.0):
+                self.upload(content=b'a'), self.upload(content=b'b')
+                self.assertEqual(self.upload(content=b'c').status_code, 429)
+            with patch('resume.admission.time.time', return_value=1010.0):
+                self.assertEqual(self.upload(content=b'd').status_code, 201)
+                self.assertEqual(self.upload(content=b'e').status_code, 429)
+
+    def test_anonymous_clients_are_throttled_per_ip(self):
+        self.client.force_authenticate(user=None)
+        with override_settings(RESUME_ADMISSION=self.THROTTLES):
+            addresses = ['10.0.0.1', '10.0.0.1', '10.0.0.1', '10.0.0.2']
+            statuses = [
+                self.client.post(
+                    '/api/upload/', {'resume': SimpleUploadedFile('resume.exe', b'x')}, REMOTE_ADDR=address
+                ).status_code
+                for address in addresses
+            ]
+        self.assertEqual(statuses, [400, 400, 429, 400])
+
+    def test_gate_caps_concurrency_and_queue(self):
+        gate = ExtractionGate(max_concurrent=2, queue_size=1, queue_timeout=5, retry_after=3)
+        release = threading.Event()
+        lock = threading.Lock()
+        running, peak, outcomes = [0], [0], []
+
+        def extract():
+            try:
+                with gate.slot():
+                    with lock:
+                        running[0] += 1
+                        peak[0] = max(peak[0], running[0])
+                    release.wait(5)
+                    with lock:
+                        running[0] -= 1
+                outcomes.append('done')
+            except ExtractionQueueFull as e:
+                outcomes.append(e.retry_after)
+
+        threads = [threading.Thread(target=extract) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        deadline = time.monotonic() + 5
+        while gate.waiting < 1 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        # Two running and one waiting: a fourth is turned away at once
+        extract()
+        self.assertEqual(outcomes, [3])
+        release.set()
+        for thread in threads:
+            thread.join(5)
+        self.assertEqual(outcomes, [3, 'done', 'done', 'done'])
+        self.assertEqual(peak[0], 2)
+
+    def test_gate_times_out_waiters(self):
+        gate = ExtractionGate(max_concurrent=1, queue_size=1, queue_timeout=0.05)
+        with gate.slot():
+            with self.assertRaises(ExtractionQueueFull):
+                with gate.slot():
+                    pass
+        self.assertEqual(gate.waiting, 0)
+        with gate.slot():
+            pass
+
+    def test_saturated_gate_returns_429(self):
+        gate = ExtractionGate(max_concurrent=1, queue_size=0, retry_after=7)
+        with patch('resume.views.get_extraction_gate', return_value=gate), gate.slot():
+            response = self.upload()
+
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '7')
+        self.assertFalse(Resume.objects.exists())
+
+    def batch_upload(self, count):
+        files = [SimpleUploadedFile(f'{index}.txt', f'Python {index}'.encode()) for index in range(count)]
+        return self.client.post('/api/upload/batch/', {'files': files}, format='multipart')
+
+    def test_batch_items_each_hold_a_slot(self):
+        gate = ExtractionGate(max_concurrent=1, queue_size=8, queue_timeout=5)
+        lock = threading.Lock()
+        running, peak = [0], [0]
+
+        def extract(file_obj, file_extension):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.02)
+            with lock:
+                running[0] -= 1
+            return file_obj.read().decode()
+
+        with patch('resume.services.get_extraction_gate', return_value=gate), \
+                patch('resume.views.ResumeUploadView.extract_content_from_file', side_effect=extract):
+            response = self.batch_upload(4)
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['created'], 4)
+        self.assertEqual(peak[0], 1)
+
+    def test_saturated_gate_turns_batch_away(self):
+        gate = ExtractionGate(max_concurrent=1, queue_size=0, retry_after=7)
+        with patch('resume.services.get_extraction_gate', return_value=gate), gate.slot():
+            response = self.batch_upload(3)
+
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '7')
+        self.assertFalse(Resume.objects.exists())
+
+
+class CachedTokenAuthenticationTests(ResumeTestCase):
+    def setUp(self):
+        super().setUp()
+        token_cache.clear()
+        self.token = Token.objects.create(user=self.user)
+        self.resume = Resume.objects.create(user=self.user, original_filename='resume.txt', parsed_content='Go')
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+    def poll(self):
+        # Rejections are 403: SessionAuthentication is the first authenticator
+        return self.client.get(f'/api/status/{self.resume.id}/')
+
+    def test_warm_token_skips_the_token_query(self):
+        with self.assertNumQueries(2):
+            self.assertEqual(self.poll().status_code, 200)
+        with self.assertNumQueries(1):
+            self.assertEqual(self.poll().status_code, 200)
+
+    def test_deleted_token_and_inactive_user_are_rejected(self):
+        self.poll()
+        self.token.delete()
+        self.assertEqual(self.poll().status_code, 403)
+
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        self.poll()
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.poll().status_code, 403)
+
+    def test_local_tier_is_bounded_and_expires(self):
+        cache = TokenCache(max_entries=2, local_ttl=60)
+        for key in ('a', 'b', 'c'):
+            cache.set(key, (key, key))
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.get('c'), ('c', 'c'))
+
+        expired = TokenCache(local_ttl=0)
+        expired.set('a', ('a', 'a'))
+        self.assertIsNone(expired.get('a'))
+
+    @override_settings(RESUME_TOKEN_CACHE={'SHARED_CACHE': 'default'})
+    def test_cached_credentials_hold_no_password_and_are_not_shared(self):
+        authentication = CachedTokenAuthentication()
+        authentication.authenticate_credentials(self.token.key)
+
+        self.assertNotIn(self.user.password, repr(cache.get(token_cache.shared_key(self.token.key))))
+        with self.assertNumQueries(0):
+            first, first_token = authentication.authenticate_credentials(self.token.key)
+            second, _ = authentication.authenticate_credentials(self.token.key)
+        self.assertIsNot(first, second)
+        self.assertEqual((first.pk, first.username, first_token.key), (self.user.pk, 'candidate', self.token.key))
+        self.assertIs(first_token.user, first)
+
+        first.first_name = 'Ada'
+        first.save()
+        self.assertEqual(second.first_name, '')
+        self.assertTrue(User.objects.get(pk=self.user.pk).check_password('secret'))
+
+    @override_settings(RESUME_TOKEN_CACHE={'SHARED_CACHE': 'default'})
+    def test_shared_tier_serves_other_processes(self):
+        self.poll()
+        token_cache.clear()  # as seen by a process that has not met this token
+
+        with self.assertNumQueries(1):
+            self.assertEqual(self.poll().status_code, 200)
+        self.token.delete()
+        token_cache.clear()
+        self.assertEqual(self.poll().status_code, 403)
+
+    def test_benchmark_command_reports_fewer_queries(self):
+        output = io.StringIO()
+        call_command('benchmark_auth', users=3, requests=30, json=True, stdout=output)
+
+        results = json.loads(output.getvalue())
+        self.assertEqual(results['token']['auth_queries_per_request'], 1.0)
+        self.assertEqual(results['cached_token']['auth_queries_per_request'], 0.1)
+
+
+class ResumeAdminTests(ResumeTestCase):
+    def setUp(self):
+        super().setUp()
+        self.admin_user = User.objects.create_superuser(username='admin', password='secret')
+        self.client.force_login(self.admin_user)
+
+    def create_resumes(self, count, prefix='resume'):
+        for index in range(count):
+            owner = User.objects.create_user(username=f'{prefix}-owner-{index}')
+            Resume.objects.create(user=owner, original_filename=f'{prefix}-{index}.pdf', parsed_content='x' * 5000)
+
+    def changelist(self, **params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/admin/resume/resume/', params)
+        self.assertEqual(response.status_code, 200)
+        return response, [query['sql'] for query in queries.captured_queries]
+
+    def test_changelist_queries_do_not_grow_with_rows(self):
+        self.create_resumes(3)
+        _, few = self.changelist()
+        self.create_resumes(30, prefix='more')
+        response, many = self.changelist()
+
+        self.assertEqual(len(few), len(many))
+        self.assertContains(response, 'more-owner-29')
+        resume_query = next(sql for sql in many if 'FROM "resume_resume"' in sql and 'LIMIT' in sql)
+        self.assertNotIn('parsed_content', resume_query)
+
+    @patch.object(EstimatedCountPaginator, 'exact_limit', 5)
+    def test_large_tables_use_the_estimate(self):
+        self.create_resumes(8)
+        _, queries = self.changelist()
+
+        self.assertFalse(any('COUNT(' in sql for sql in queries))
+        self.assertTrue(any('MAX(rowid)' in sql for sql in queries))
+
+    @patch.object(EstimatedCountPaginator, 'count_limit', 5)
+    def test_filtered_counts_are_bounded(self):
+        self.create_resumes(8)
+        paginator = EstimatedCountPaginator(Resume.objects.filter(processing_status='pending').order_by('id'), 2)
+
+        self.assertEqual(paginator.count, 5)
+
+    def test_search_is_an_indexed_prefix_match(self):
+        self.create_resumes(3)
+        self.create_resumes(2, prefix='cv')
+
+        response, _ = self.changelist(q='cv-')
+        self.assertEqual(response.context['cl'].result_count, 2)
+        response, _ = self.changelist(q='resume-owner-1')
+        self.assertEqual([resume.original_filename for resume in response.context['cl'].result_list], ['resume-1.pdf'])
+
+        queryset, _ = ResumeAdmin(Resume, None).get_search_results(None, Resume.objects.all(), 'cv-')
+        with connection.cursor() as cursor:
+            sql, params = queryset.query.sql_with_params()
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            plan = ' '.join(str(row) for row in cursor.fetchall())
+        self.assertIn('resume_filename_idx', plan)
+
+    def test_job_position_search_uses_indexes(self):
+        JobPosition.objects.create(title='Backend Engineer', department='Platform', description='Python')
+        JobPosition.objects.create(title='Designer', department='Product', description='Backend')
+
+        response = self.client.get('/admin/resume/jobposition/', {'q': 'Backend'})
+        self.assertEqual([job.title for job in response.context['cl'].result_list], ['Backend Engineer'])
+        response = self.client.get('/admin/resume/jobposition/', {'q': 'Product'})
+        self.assertEqual([job.title for job in response.context['cl'].result_list], ['Designer'])
+
+        queryset, _ = JobPositionAdmin(JobPosition, None).get_search_results(None, JobPosition.objects.all(), 'Back')
+        with connection.cursor() as cursor:
+            sql, params = queryset.query.sql_with_params()
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            plan = ' '.join(str(row) for row in cursor.fetchall())
+        self.assertIn('job_title_prefix_idx', plan)
+        self.assertIn('job_department_title_idx', plan)
+
+    def test_question_search_uses_indexes(self):
+        self.create_resumes(1, prefix='cv')
+        backend = JobPosition.objects.create(title='Backend Engineer', department='Platform', description='Python')
+        designer = JobPosition.objects.create(title='Designer', department='Product', description='Figma')
+        for job in (backend, designer):
+            GeneratedQuestion.objects.create(
+                resume=Resume.objects.get(), job_position=job, category=QuestionCategory.SKILLS.value,
+                question_text=f'About {job.title}?'
+            )
+
+        response = self.client.get('/admin/resume/generatedquestion/', {'q': 'Backend'})
+        self.assertEqual([question.job_position for question in response.context['cl'].result_list], [backend])
+        response = self.client.get('/admin/resume/generatedquestion/', {'q': 'cv-'})
+        self.assertEqual(response.context['cl'].result_count, 2)
+
+        queryset, _ = GeneratedQuestionAdmin(GeneratedQuestion, None).get_search_results(
+            None, GeneratedQuestion.objects.all(), 'cv-'
+        )
+        with connection.cursor() as cursor:
+            sql, params = queryset.query.sql_with_params()
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            plan = ' '.join(str(row) for row in cursor.fetchall())
+        self.assertIn('resume_filename_idx', plan)
+        self.assertIn('job_title_prefix_idx', plan)
+        self.assertNotIn('SCAN resume_generatedquestion', plan)
+
+    def test_prefix_index_uses_pattern_ops_on_postgresql(self):
+        index = PrefixIndex(fields=['original_filename'], name='resume_filename_idx')
+
+        self.assertEqual(index.for_vendor('postgresql').opclasses, ['varchar_pattern_ops'])
+        self.assertEqual(index.for_vendor('mysql').fields, ['original_filename'])
+
+    def test_change_form_does_not_load_parsed_content(self):
+        self.create_resumes(1)
+        resume = Resume.objects.get()
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(f'/admin/resume/resume/{resume.id}/change/')
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(any('parsed_content' in query['sql'] for query in queries.captured_queries))
+
+
+class ResumeExportTests(ResumeTestCase):
+    def setUp(self):
+        super().setUp()
+        self.job = JobPosition.objects.create(title='Engineer', description='Build things', department='R&D')
+        start = timezone.now() - timedelta(days=10)
+        self.resumes = []
+        for index in range(5):
+            resume = Resume.objects.create(
+                user=self.user,
+                original_filename=f'resume-{index}.txt',
+                file_type='.txt',
+                parsed_content=f'Python developer {index}',
+                processing_status='completed' if index % 2 == 0 else 'failed',
+            )
+            Resume.objects.filter(id=resume.id).update(uploaded_at=start + timedelta(days=index))
+            GeneratedQuestion.objects.create(
+                resume=resume, job_position=self.job, category=QuestionCategory.SKILLS.value,
+                question_text=f'Question {index}'
+            )
+            self.resumes.append(resume)
+        other = User.objects.create_user(username='other')
+        Resume.objects.create(user=other, original_filename='other.txt', parsed_content='Go')
+        self.start = start
+
+    def export(self, **params):
+        response = self.client.get('/api/export/', params)
+        self.assertEqual(response.status_code, 200)
+        return b''.join(response.streaming_content).decode()
+
+    def test_ndjson_streams_own_resumes_oldest_first(self):
+        records = [json.loads(line) for line in self.export().splitlines()]
+
+        self.assertEqual([record['original_filename'] for record in records], [f'resume-{i}.txt' for i in range(5)])
+        self.assertNotIn('parsed_content', records[0])
+        self.assertNotIn('questions', records[0])
+
+        records = [json.loads(line) for line in self.export(include='content,questions').splitlines()]
+        self.assertEqual(records[2]['parsed_content'], 'Python developer 2')
+        self.assertEqual(records[2]['questions'][0]['question_text'], 'Question 2')
+        self.assertEqual(records[2]['questions'][0]['job_position'], 'Engineer')
+
+    def test_filters_and_cursor(self):
+        records = [json.loads(line) for line in self.export(status='completed').splitlines()]
+        self.assertEqual([record['id'] for record in records], [self.resumes[i].id for i in (0, 2, 4)])
+
+        since = (self.start + timedelta(days=1)).isoformat()
+        until = (self.start + timedelta(days=3)).date().isoformat()
+        records = [json.loads(line) for line in self.export(since=since, until=until).splitlines()]
+        self.assertEqual([record['id'] for record in records], [self.resumes[1].id, self.resumes[2].id])
+
+        cursor = json.loads(self.export().splitlines()[2])['cursor']
+        records = [json.loads(line) for line in self.export(cursor=cursor).splitlines()]
+        self.assertEqual([record['id'] for record in records], [self.resumes[3].id, self.resumes[4].id])
+
+        self.assertEqual(self.client.get('/api/export/', {'cursor': '!'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/export/', {'since': 'yesterday'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/export/', {'output': 'xml'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/export/', {'include': 'files'}).status_code, 400)
+
+    def test_csv_has_header_and_json_questions(self):
+        response = self.client.get('/api/export/', {'output': 'csv', 'include': 'questions'})
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        rows = list(csv.DictReader(io.StringIO(b''.join(response.streaming_content).decode())))
+
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(rows[0]['file_size'], '')
+        self.assertEqual(json.loads(rows[0]['questions'])[0]['question_text'], 'Question 0')
+
+    def test_queries_do_not_grow_with_rows(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.export(include='questions')
+        # Resumes and their questions, each in one query per chunk
+        self.assertEqual(sum('FROM "resume_' in query['sql'] for query in queries.captured_queries), 2)
+
+    def test_command_exports_everyone(self):
+        stdout = io.StringIO()
+        call_command('export_resumes', '--include-content', '--chunk-size', '2', stdout=stdout)
+        records = [json.loads(line) for line in stdout.getvalue().splitlines()]
+
+        self.assertEqual(len(records), 6)
+        self.assertEqual(records[-1]['parsed_content'], 'Go')
+
+        stdout = io.StringIO()
+        call_command('export_resumes', '--cursor', records[3]['cursor'], '--format', 'csv', stdout=stdout)
+        self.assertEqual(len(list(csv.DictReader(io.StringIO(stdout.getvalue())))), 2)
+
+
+class ResumeSearchTests(ResumeTestCase):
+    def setUp(self):
+        super().setUp()
+        self.upload(name='backend.txt', content=b'Senior Python developer. Python, Django and PostgreSQL.')
+        self.upload(name='frontend.txt', content=b'Frontend engineer with React and some Python scripting.')
+        other = User.objects.create_user(username='other', password='secret')
+        Resume.objects.create(user=other, original_filename='other.txt', parsed_content='Python expert')
+
+    def search(self, query):
+        return self.client.get('/api/search/', {'q': query})
+
+    def test_results_are_ranked_and_scoped_to_user(self):
+        response = self.search('python')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([result['filename'] for result in response.data['results']], ['backend.txt', 'frontend.txt'])
+        self.assertIn('<mark>Python</mark>', response.data['results'][0]['snippet'])
+
+    def test_terms_are_anded_and_prefix_matching(self):
+        self.assertEqual(self.search('python react').data['count'], 1)
+        self.assertEqual(self.search('postgres*').data['count'], 1)
+
+    def test_owner_token_is_not_searchable_text(self):
+        self.assertEqual(self.search(f'u{self.user.pk}').data['count'], 0)
+
+    def test_query_syntax_is_escaped(self):
+        response = self.search('"python AND (')
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_deleted_resumes_leave_the_index(self):
+        Resume.objects.filter(original_filename='backend.txt').delete()
+
+        self.assertEqual(self.search('django').data['count'], 0)
+
+    def test_fallback_without_fts(self):
+        with patch('resume.search.fts_available', return_value=False):
+            response = self.search('django')
+
+        self.assertEqual(response.data['count'], 1)
+        self.assertIsNone(response.data['results'][0]['rank'])
+        self.assertIn('<mark>Django</mark>', response.data['results'][0]['snippet'])
+
+    @override_settings(RESUME_SEARCH={'FALLBACK_SCAN_LIMIT': 1})
+    def test_fallback_scans_only_recent_resumes(self):
+        with patch('resume.search.fts_available', return_value=False):
+            # backend.txt is the older of the two, so it is past the cap
+            self.assertEqual(self.search('django').data['count'], 0)
+            self.assertEqual(self.search('react').data['count'], 1)
+
+
+class ResumeBatchUploadTests(ResumeTestCase):
+    def make_zip(self, members):
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+            for name, data in members.items():
+                archive.writestr(name, data)
+        return buffer.getvalue()
+
+    def test_multiple_files_with_per_file_status(self):
+        response = self.client.post('/api/upload/batch/', {'files': [
+            SimpleUploadedFile('one.txt', b'Go developer'),
+            SimpleUploadedFile('two.txt', b'Rust developer'),
+            SimpleUploadedFile('virus.exe', b'MZ'),
+        ]}, format='multipart')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['created'], 2)
+        self.assertEqual(response.data['failed'], 1)
+        statuses = {result['filename']: result['status'] for result in response.data['results']}
+        self.assertEqual(statuses, {'one.txt': 'completed', 'two.txt': 'completed', 'virus.exe': 'failed'})
+        self.assertEqual(
+            {resume.parsed_content for resume in Resume.objects.all()},
+            {'Go developer', 'Rust developer'}
+        )
+
+    def test_zip_archive_members_are_extracted_and_indexed(self):
+        archive = self.make_zip({
+            'batch/alice.txt': b'Kotlin engineer',
+            'batch/bob.pdf': make_pdf(['Haskell engineer']),
+            'batch/broken.pdf': b'this is not a pdf',
+            'batch/notes.md': b'# ignored',
+            '__MACOSX/batch/._alice.txt': b'metadata',
+        })
+
+        response = self.client.post('/api/upload/batch/', {
+            'archive': SimpleUploadedFile('resumes.zip', archive)
+        }, format='multipart')
+
+        self.assertEqual(response.status_code, 201)
+        results = {result['filename']: result for result in response.data['results']}
+        self.assertEqual(set(results), {'alice.txt', 'bob.pdf', 'broken.pdf', 'notes.md'})
+        self.assertEqual(results['bob.pdf']['status'], 'completed')
+        self.assertIn('does not match', results['broken.pdf']['error'])
+        self.assertIn('Unsupported', results['notes.md']['error'])
+        self.assertEqual(Resume.objects.get(original_filename='bob.pdf').parsed_content, 'Haskell engineer')
+        self.assertEqual(self.client.get('/api/search/', {'q': 'haskell'}).data['count'], 1)
+
+    @override_settings(RESUME_MAX_UPLOAD_SIZE=10)
+    def test_oversized_archive_member_is_rejected(self):
+        archive = self.make_zip({'big.txt': b'x' * 100})
+
+        response = self.client.post('/api/upload/batch/', {
+            'archive': SimpleUploadedFile('resumes.zip', archive)
+        }, format='multipart')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('too large', response.data['results'][0]['error'])
+
+    def test_batch_is_persisted_with_one_insert(self):
+        files = [SimpleUploadedFile(f'{index}.txt', f'Resume {index}'.encode()) for index in range(10)]
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.post('/api/upload/batch/', {'files': files}, format='multipart')
+
+        inserts = [query for query in queries if query['sql'].startswith('INSERT INTO "resume_resume"')]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(Resume.objects.count(), 10)
+
+
+class ResumePurgeTests(ResumeTestCase):
+    backlog = 5000
+
+    def setUp(self):
+        super().setUp()
+        cache.delete(ResumePurgeEngine.checkpoint_key)
+        self.job = JobPosition.objects.create(title='Engineer', description='Build things', department='R&D')
+        Resume.objects.bulk_create([
+            Resume(
+                user=self.user,
+                original_filename=f'failed{index}.pdf',
+                parsed_content='x' * 200,
+                processing_status=ProcessingStatus.FAILED.value
+            )
+            for index in range(self.backlog)
+        ], batch_size=1000)
+        GeneratedQuestion.objects.bulk_create([
+            GeneratedQuestion(resume_id=resume_id, job_position=self.job, category='skills', question_text='Why?')
+            for resume_id in Resume.objects.values_list('id', flat=True)[:500]
+        ])
+        Resume.objects.update(uploaded_at=timezone.now() - timedelta(days=30))
+        self.keep = Resume.objects.create(
+            user=self.user,
+            original_filename='recent.pdf',
+            processing_status=ProcessingStatus.FAILED.value
+        )
+
+    def test_backlog_is_purged_in_batches(self):
+        report = ResumePurgeEngine(batch_size=500).run()
+
+        self.assertTrue(report.completed)
+        self.assertEqual(report.deleted, self.backlog)
+        self.assertEqual(report.batches, self.backlog // 500)
+        self.assertGreater(report.rows_per_second, 0)
+        self.assertEqual(list(Resume.objects.values_list('id', flat=True)), [self.keep.id])
+        self.assertFalse(GeneratedQuestion.objects.exists())
+
+    def test_run_resumes_from_checkpoint_when_budget_runs_out(self):
+        engine = ResumePurgeEngine(batch_size=1000, time_budget=10.0)
+        # The clock jumps past the budget right after the first purge batch
+        clock = iter([0.0, 0.0, 0.0, 0.0] + [100.0] * 10)
+        with patch('resume.services.time.perf_counter', lambda: next(clock)):
+            first = engine.run()
+
+        self.assertFalse(first.completed)
+        self.assertEqual(first.deleted, 1000)
+        self.assertEqual(cache.get(ResumePurgeEngine.checkpoint_key), Resume.objects.order_by('id').first().id - 1)
+
+        second = engine.run()
+
+        self.assertTrue(second.completed)
+        self.assertEqual(first.deleted + second.deleted, self.backlog)
+        self.assertIsNone(cache.get(ResumePurgeEngine.checkpoint_key))
+
+    def test_stuck_resumes_are_reaped(self):
+        stuck = Resume.objects.create(
+            user=self.user,
+            original_filename='stuck.pdf',
+            processing_status=ProcessingStatus.PROCESSING.value
+        )
+        Resume.objects.filter(id=stuck.id).update(uploaded_at=timezone.now() - timedelta(hours=2))
+
+        report = ResumePurgeEngine().run()
+
+        stuck.refresh_from_db()
+        self.assertEqual(report.reaped, 1)
+        self.assertEqual(stuck.processing_status, ProcessingStatus.FAILED.value)
+        self.assertEqual(stuck.error_message, 'Processing timed out')
+
+    def test_task_reports_rate(self):
+        result = cleanup_failed_resumes.apply().get()
+
+        self.assertIn(f'Cleaned up {self.backlog} failed resumes', result)
+        self.assertIn('rows/sec', result)
+
+
+class CompressedTextFieldTests(ResumeTestCase):
+    def stored_bytes(self, resume):
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT parsed_content FROM resume_resume WHERE id = %s', [resume.id])
+            return bytes(cursor.fetchone()[0])
+
+    def create(self, content):
+        return Resume.objects.create(user=self.user, original_filename='resume.txt', parsed_content=content)
+
+    def test_large_values_are_compressed_and_round_trip(self):
+        content = 'Experienced Python developer. ' * 200
+        resume = self.create(content)
+
+        stored = self.stored_bytes(resume)
+        self.assertEqual(stored[:1], ZLIB)
+        self.assertLess(len(stored), len(content) // 10)
+        self.assertEqual(Resume.objects.get(id=resume.id).parsed_content, content)
+
+    def test_small_values_are_stored_plain(self):
+        resume = self.create('short')
+
+        self.assertEqual(self.stored_bytes(resume), PLAIN + b'short')
+        self.assertEqual(Resume.objects.get(id=resume.id).parsed_content, 'short')
+
+    def test_decompression_waits_for_attribute_access(self):
+        resume = self.create('x' * 5000)
+
+        with patch('resume.fields.decompress_text', wraps=decompress_text) as decompress:
+            loaded = Resume.objects.get(id=resume.id)
+            loaded.original_filename = 'renamed.txt'
+            loaded.save()
+            self.assertEqual(decompress.call_count, 0)
+
+            self.assertEqual(len(loaded.parsed_content), 5000)
+            loaded.parsed_content
+            self.assertEqual(decompress.call_count, 1)
+
+        self.assertEqual(Resume.objects.get(id=resume.id).parsed_content, 'x' * 5000)
+
+    def test_legacy_text_values_pass_through(self):
+        self.assertEqual(decompress_text('already text'), 'already text')
+
+    def test_benchmark_command_reports_ratio(self):
+        output = io.StringIO()
+        call_command('benchmark_compression', documents=5, size=3000, json=True, stdout=output)
+
+        results = json.loads(output.getvalue())
+        self.assertEqual(results['documents'], 5)
+        self.assertGreater(results['algorithms']['zlib-6']['ratio'], 2)
+
+
+class ExtractionBenchmarkTests(ResumeTestCase):
+    def test_corpus_is_reproducible_and_extractable(self):
+        corpus = generate_corpus(8, sizes=(1500,))
+
+        self.assertEqual([document['data'] for document in corpus], [document['data'] for document in generate_corpus(8, sizes=(1500,))])
+        self.assertEqual({document['extension'] for document in corpus}, {'.pdf', '.docx', '.txt', '.rtf'})
+        self.assertEqual([document['encoding'] for document in corpus if document['extension'] == '.txt'], ['utf-8', 'utf-16'])
+        for document in corpus:
+            response = self.upload(document['name'], document['data'])
+            self.assertEqual(response.status_code, 201, document['name'])
+
+    def test_percentile_is_nearest_rank(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 0.50), 50)
+        self.assertEqual(percentile(values, 0.95), 95)
+        self.assertEqual(percentile(values, 0.99), 99)
+        self.assertEqual(percentile(values, 0.07), 7)
+        self.assertEqual(percentile(list(range(1, 21)), 0.95), 19)
+        self.assertEqual(percentile(list(range(1, 23)), 0.50), 11)
+        self.assertEqual(percentile([5], 0.99), 5)
+        self.assertEqual(percentile([], 0.5), 0.0)
+
+    def test_benchmark_command_emits_json(self):
+        output = io.StringIO()
+        call_command('benchmark_extraction', documents=4, sizes='1500', iterations=1, json=True, stdout=output)
+
+        results = json.loads(output.getvalue())
+        self.assertEqual(set(results['extraction']), {'.pdf', '.docx', '.txt', '.rtf'})
+        self.assertEqual(results['endpoints']['upload']['runs'], 4)
+        self.assertLessEqual(results['extraction']['.pdf']['p50_ms'], results['extraction']['.pdf']['p99_ms'])
+        # Endpoint runs are rolled back
+        self.assertFalse(Resume.objects.exists())
+
+
+class MetricsTests(ResumeTestCase):
+    def setUp(self):
+        super().setUp()
+        metrics.reset()
+        self.addCleanup(metrics.reset)
+
+    def test_disabled_by_default(self):
+        self.upload()
+
+        self.assertIs(metrics.stage_timer(view='upload'), NULL_TIMER)
+        self.assertEqual(metrics.snapshot(), {'counters': [], 'histograms': []})
+        self.user.is_staff = True
+        self.user.save()
+        self.assertEqual(self.client.get('/metrics').status_code, 404)
+
+    @override_settings(RESUME_METRICS={'ENABLED': True, 'TOKEN': 'scrape-secret'})
+    def test_scrapes_need_staff_or_the_token(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 403)
+        anonymous = APIClient()
+        self.assertEqual(anonymous.get('/metrics').status_code, 403)
+        self.assertEqual(anonymous.get('/metrics', HTTP_AUTHORIZATION='Bearer wrong').status_code, 403)
+        self.assertEqual(anonymous.get('/metrics', HTTP_AUTHORIZATION='Bearer scrape-secret').status_code, 200)
+        with override_settings(RESUME_METRICS={'ENABLED': True}):
+            # No token configured: the empty bearer credential must not match
+            self.assertEqual(anonymous.get('/metrics', HTTP_AUTHORIZATION='Bearer ').status_code, 403)
+
+    @override_settings(RESUME_METRICS={'ENABLED': True})
+    def test_upload_and_status_are_instrumented(self):
+        resume_id = self.upload().data['resume_id']
+        self.client.get(f'/api/status/{resume_id}/')
+        self.upload('resume.exe')
+        self.user.is_staff = True
+        self.user.save()
+
+        response = self.client.get('/metrics')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        body = response.content.decode()
+        for stage in ('detect', 'extract', 'persist'):
+            self.assertIn(f'resume_stage_duration_seconds_count{{stage="{stage}",view="upload"}} 1', body)
+        # The rejected upload was still read
+        self.assertIn('resume_stage_duration_seconds_count{stage="read",view="upload"} 2', body)
+        self.assertIn('resume_uploads_total{file_type=".txt",status="completed"} 1', body)
+        self.assertIn('resume_upload_rejections_total{reason="unsupported_type"} 1', body)
+        self.assertIn('resume_status_polls_total{status="completed"} 1', body)
+        self.assertIn('resume_request_duration_seconds_bucket{view="upload",le="+Inf"} 2', body)
+
+    @override_settings(RESUME_METRICS={'ENABLED': True})
+    def test_client_extensions_do_not_become_labels(self):
+        archive = io.BytesIO()
+        with zipfile.ZipFile(archive, 'w') as zip_file:
+            for index in range(3):
+                zip_file.writestr(f'member.x{index}', b'data')
+            zip_file.writestr('resume.txt', b'Python developer')
+        self.client.post('/api/upload/batch/', {
+            'archive': SimpleUploadedFile('resumes.zip', archive.getvalue()),
+            'files': [SimpleUploadedFile('cv.EVIL', b'data')],
+        }, format='multipart')
+
+        labels = {dict(key)['file_type'] for name, key, _ in metrics.snapshot()['counters'] if name == 'resume_uploads_total'}
+        self.assertEqual(labels, {'unsupported', '.txt'})
+
+    def test_multiprocess_snapshots_are_summed(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        worker = MetricsRegistry()  # stands in for another process
+
+        with override_settings(RESUME_METRICS={'ENABLED': True, 'MULTIPROCESS_DIR': directory, 'FLUSH_INTERVAL': 60}):
+            worker.inc('resume_tasks_total', task='process_resume', status='completed')
+            worker.observe('resume_task_duration_seconds', 0.2, task='process_resume')
+            worker.inc('resume_tasks_total', task='process_resume', status='completed')
+            metrics.inc('resume_tasks_total', task='process_resume', status='completed')
+            body = metrics.render()
+
+        # The worker flushed on its first update only; later ones wait for the interval
+        self.assertIn('resume_tasks_total{status="completed",task="process_resume"} 2', body)
+        self.assertNotIn('resume_task_duration_seconds', body)
+        with override_settings(RESUME_METRICS={'ENABLED': True, 'MULTIPROCESS_DIR': directory}):
+            worker.flush()
+            body = metrics.render()
+        self.assertIn('resume_tasks_total{status="completed",task="process_resume"} 3', body)
+        self.assertIn('resume_task_duration_seconds_bucket{task="process_resume",le="0.25"} 1', body)
+
+    def test_snapshots_of_exited_processes_are_folded(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        exited = subprocess.Popen([sys.executable, '-c', 'pass'])
+        exited.wait()
+        snapshot = {'counters': [['resume_tasks_total', [['status', 'completed']], 2]], 'histograms': []}
+        for suffix in (1, 2):
+            with open(os.path.join(directory, f'metrics-{exited.pid}-{suffix}.json'), 'w') as output:
+                json.dump(snapshot, output)
+
+        with override_settings(RESUME_METRICS={'ENABLED': True, 'MULTIPROCESS_DIR': directory}):
+            metrics.inc('resume_tasks_total', status='completed')
+            first = metrics.render()
+            second = metrics.render()
+
+        self.assertIn('resume_tasks_total{status="completed"} 5', first)
+        self.assertEqual(first, second)
+        self.assertEqual(
+            sorted(name for name in os.listdir(directory) if name.endswith('.json')),
+            ['aggregate.json', metrics._snapshot_name]
+        )
+
+
+class TextDecoderTests(ResumeTestCase):
+    def test_fast_paths(self):
+        decoder = TextDecoder()
+
+        result = decoder.decode('Zürich résumé'.encode('utf-16'))
+        self.assertEqual((result.text, result.method), ('Zürich résumé', 'bom'))
+        result = decoder.decode('Zürich résumé'.encode('utf-8'))
+        self.assertEqual((result.text, result.method), ('Zürich résumé', 'utf-8'))
+
+    def test_detection_uses_a_bounded_sample(self):
+        # The only 8-bit text sits in the middle of the buffer
+        raw = b'a' * 100000 + 'Montréal, Malmö, Zürich, São Paulo. '.encode('latin-1') * 20 + b'b' * 100000
+        decoder = TextDecoder(sample_size=4096)
+
+        with patch('resume.decoding.chardet.detect', wraps=chardet.detect) as detect:
+            result = decoder.decode(raw)
+
+        self.assertLessEqual(len(detect.call_args.args[0]), 4096)
+        self.assertEqual(result.method, 'sample')
+        self.assertEqual(result.text, raw.decode('latin-1'))
+
+    def test_generic_extraction_caches_encoding_per_extension(self):
+        decoder = TextDecoder(cache=ExtensionEncodingCache())
+        raw = 'Müller, Malmö'.encode('cp1252') * 50
+
+        decoder.decode(raw, '.dat')
+        with patch('resume.decoding.chardet.detect') as detect:
+            result = decoder.decode(raw, '.dat')
+
+        detect.assert_not_called()
+        self.assertEqual((result.method, result.text), ('cached', raw.decode('cp1252')))
+        self.assertTrue(decoder.looks_binary(b'\x00\x01\x02' * 100))
+        self.assertFalse(decoder.looks_binary('text'.encode('utf-16')))
+
+    def test_benchmark_command_matches_legacy(self):
+        output = io.StringIO()
+        call_command('benchmark_decoding', sizes='65536', repeat=1, json=True, stdout=output)
+
+        results = json.loads(output.getvalue())
+        self.assertEqual(len(results), 4)
+        self.assertTrue(all(row['matches_legacy'] for row in results))
+
+
+class RTFExtractionTests(ResumeTestCase):
+    def test_destinations_are_skipped(self):
+        raw = (
+            b"{\\rtf1\\ansi{\\fonttbl{\\f0 Arial;}}{\\colortbl;\\red0\\green0\\blue0;}"
+            b"{\\*\\generator Writer;}{\\pict\\pngblip 89504e47{7b}0d0a}"
+            b"{\\field{\\*\\fldinst HYPERLINK x}{\\fldrslt Portfolio}}\\par\\bin3 {}}Python}"
+        )
+
+        self.assertEqual(rtf_to_text(raw), 'Portfolio\nPython')
+
+    def test_escapes(self):
+        raw = b"{\\rtf1\\ansi\\ansicpg1251 Caf\\'e9 \\uc2\\u8212\\'96\\'97 \\uc1\\u-10179?\\u-8704? \\{x\\}\\tab y}"
+
+        self.assertEqual(rtf_to_text(raw), 'Caf\u0439 \u2014 \U0001f600 {x}\ty')
+
+    def test_round_trip_with_pictures(self):
+        text = 'Zoë Müller \u2014 {Senior} C\\C++ developer\nSkills: Python, Go'
+
+        self.assertEqual(rtf_to_text(build_rtf(text, pictures=3, picture_bytes=4096)).strip(), text)
+
+    def test_upload_stores_plain_text(self):
+        response = self.upload(name='resume.rtf', content=build_rtf('Python developer', pictures=1, picture_bytes=4096))
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Resume.objects.get(id=response.data['resume_id']).parsed_content, 'Python developer')
+
+    def test_plain_text_named_rtf_is_rejected(self):
+        response = self.upload(name='resume.rtf', content=b'Python developer')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('does not match its extension', response.data['error'])
+        self.assertFalse(Resume.objects.exists())
+
+    def test_benchmark_command_matches_regex(self):
+        output = io.StringIO()
+        call_command('benchmark_rtf', sizes='262144', repeat=1, json=True, stdout=output)
+
+        results = json.loads(output.getvalue())
+        self.assertTrue(results[0]['matches_regex'])
+        self.assertLess(results[0]['text_chars'], results[0]['previous_stored_chars'])
+
+
+TEXT_BOX = (
+    '<w:p xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" '
+    'xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006"><w:r><mc:AlternateContent>'
+    '<mc:Choice Requires="wps"><w:drawing><w:txbxContent><w:p><w:r><w:t>Kubernetes</w:t></w:r></w:p>'
+    '</w:txbxContent></w:drawing></mc:Choice><mc:Fallback><w:pict><w:txbxContent><w:p><w:r>'
+    '<w:t>Kubernetes</w:t></w:r></w:p></w:txbxContent></w:pict></mc:Fallback></mc:AlternateContent></w:r></w:p>'
+)
+
+
+class WordExtractionTests(ResumeTestCase):
+    def build_docx(self):
+        document = Document()
+        document.sections[0].header.paragraphs[0].text = 'Jane Doe'
+        document.sections[0].footer.paragraphs[0].text = 'Page 1'
+        document.add_paragraph('Skills')
+        table = document.add_table(rows=2, cols=2)
+        table.cell(0, 0).text = 'Python'
+        table.cell(0, 1).text = 'Django'
+        table.cell(1, 0).text = 'Go'
+        table.cell(1, 1).add_paragraph('gRPC')
+        body = document.element.body
+        body.insert(len(body) - 1, parse_xml(TEXT_BOX))
+        output = io.BytesIO()
+        document.save(output)
+        return output.getvalue()
+
+    def test_docx_includes_headers_tables_and_text_boxes(self):
+        self.assertEqual(
+            docx_to_text(self.build_docx()),
+            'Jane Doe\nSkills\nPython\tDjango\nGo\tgRPC\nKubernetes\nPage 1\n'
+        )
+
+    def test_doc_piece_table(self):
+        self.assertEqual(doc_to_text(build_doc('Jane Doe\nPython, Django')), 'Jane Doe\nPython, Django\n')
+        self.assertEqual(doc_to_text(build_doc('Zoë Müller \u2014 Go')), 'Zoë Müller \u2014 Go\n')
+
+    def test_doc_upload(self):
+        response = self.upload(name='resume.doc', content=build_doc('Python developer\nDjango'))
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Resume.objects.get(id=response.data['resume_id']).parsed_content, 'Python developer\nDjango')
+
+    def test_docx_renamed_to_doc_upload(self):
+        response = self.upload(name='resume.doc', content=self.build_docx())
+
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(Resume.objects.get(id=response.data['resume_id']).parsed_content.startswith('Jane Doe\nSkills'))
+
+
+class JobMatcherTests(ResumeTestCase):
+    def setUp(self):
+        super().setUp()
+        self.backend = JobPosition.objects.create(
+            title='Backend Engineer', department='Platform',
+            description='Python, Django, PostgreSQL, Celery and REST APIs'
+        )
+        self.frontend = JobPosition.objects.create(
+            title='Frontend Engineer', department='Web',
+            description='React, TypeScript, CSS and accessibility'
+        )
+        JobPosition.objects.create(title='Archived', department='Old', description='Python Django', is_active=False)
+
+    def test_endpoint_ranks_jobs_for_resume(self):
+        response = self.upload(content=b'Python developer: Django, Celery, PostgreSQL. Some React.')
+
+        matches = self.client.get(f"/api/matches/{response.data['resume_id']}/").data['matches']
+
+        self.assertEqual([match['title'] for match in matches], ['Backend Engineer', 'Frontend Engineer'])
+        self.assertGreater(matches[0]['score'], matches[1]['score'])
+
+    def test_job_matrix_is_cached_until_a_job_changes(self):
+        matcher = JobMatcher()
+        matcher.top_matches(['python'])
+
+        with self.assertNumQueries(1):  # the version check
+            matcher.top_matches(['python'])
+
+        self.frontend.description = 'Python and React'
+        self.frontend.save()
+        with self.assertNumQueries(2):
+            matcher.top_matches(['python'])
+
+    def test_changes_from_other_processes_are_seen(self):
+        matcher = JobMatcher()
+        self.assertEqual([job['title'] for job, _ in matcher.top_matches(['react'])[0]], ['Frontend Engineer'])
+
+        # No signal reaches this process; only the database changes
+        JobPosition.objects.filter(id=self.frontend.id).update(is_active=False, updated_at=timezone.now())
+        self.assertEqual(matcher.top_matches(['react'])[0], [])
+        JobPosition.objects.filter(id=self.backend.id).delete()
+        self.assertEqual(matcher.top_matches(['python'])[0], [])
+
+    def test_batch_matching_is_chunked(self):
+        texts = ['Python Django developer', 'React TypeScript engineer', 'Chef'] * 5
+        for index, text in enumerate(texts):
+            Resume.objects.create(user=self.user, original_filename=f'{index}.txt', parsed_content=text)
+
+        chunked = JobMatcher(chunk_size=4).match_resumes(Resume.objects.all(), k=1)
+        whole = JobMatcher(chunk_size=100).match_resumes(Resume.objects.all(), k=1)
+
+        self.assertEqual(chunked, whole)
+        best = {
+            Resume.objects.get(id=resume_id).parsed_content: [job['title'] for job, _ in matches]
+            for resume_id, matches in chunked.items()
+        }
+        self.assertEqual(best['Python Django developer'], ['Backend Engineer'])
+        self.assertEqual(best['React TypeScript engineer'], ['Frontend Engineer'])
+        self.assertEqual(best['Chef'], [])
+
+
+SAMPLE_RESUME = """Jane Doe
+jane@example.com
+
+Technical Skills:
+Python, Django, PostgreSQL, Docker
+
+EXPERIENCE
+Backend Developer, Acme Corp (2019 - 2023)
+- Built billing APIs in Django
+
+Projects
+- Resume parser using Python and Celery
+
+SOFT SKILLS
+Leadership and communication
+
+Education
+BSc Computer Science
+"""
+
+
+class QuestionGenerationTests(ResumeTestCase):
+    def setUp(self):
+        super().setUp()
+        self.job = JobPosition.objects.create(
+            title='Backend Engineer', department='Platform',
+            description='Python, Django, Kubernetes and JavaScript'
+        )
+
+    def create_resume(self, content=SAMPLE_RESUME, **fields):
+        fields.setdefault('processing_status', ProcessingStatus.COMPLETED.value)
+        return Resume.objects.create(
+            user=self.user, original_filename='resume.txt', parsed_content=content, **fields
+        )
+
+    def test_segment_resume(self):
+        sections = segment_resume(SAMPLE_RESUME)
+
+        self.assertEqual([section.category for section in sections], ['skills', 'experience', 'projects', 'soft_skills'])
+        skills = sections[0]
+        self.assertEqual(SAMPLE_RESUME[skills.start:skills.end], 'Python, Django, PostgreSQL, Docker')
+        self.assertEqual(sections[1].lines(), ['Backend Developer, Acme Corp (2019 - 2023)', 'Built billing APIs in Django'])
+        # Education is a known heading, so it ends the soft skills section
+        self.assertEqual(sections[3].normalized_text, 'Leadership and communication')
+
+    def test_keyword_matcher_respects_word_boundaries(self):
+        matcher = KeywordMatcher(['Java', 'JavaScript', 'C++', 'Machine Learning'])
+
+        found = matcher.find('JavaScript and java; some C++ and machine learning, MachineLearning')
+
+        self.assertEqual(found, {'JavaScript': 1, 'Java': 1, 'C++': 1, 'Machine Learning': 1})
+
+    def test_regenerate_replaces_questions_in_bulk(self):
+        resume = self.create_resume()
+        generator = QuestionGenerator()
+
+        generator.regenerate(resume, self.job)
+        with self.assertNumQueries(5):  # sections, savepoint, delete, insert, release
+            generator.regenerate(resume, self.job)
+
+        questions = GeneratedQuestion.objects.filter(resume=resume, job_position=self.job)
+        by_category = {}
+        for question in questions:
+            by_category.setdefault(question.category, []).append((question.priority, question.question_text))
+        self.assertEqual(
+            set(by_category), {'skills', 'experience', 'projects', 'soft_skills', 'hr'}
+        )
+        skills = sorted(by_category['skills'])
+        shared = [text for priority, text in skills if priority == 1]
+        self.assertEqual(len(shared), 2)
+        self.assertTrue(any('Python' in text for text in shared))
+        self.assertTrue(any('Kubernetes' in text and priority == 2 for priority, text in skills))
+        self.assertTrue(any('Acme Corp' in text for _, text in by_category['experience']))
+        self.assertTrue(any('leadership' in text for _, text in by_category['soft_skills']))
+        self.assertLessEqual(max(len(items) for items in by_category.values()), 5)
+
+    def test_generate_questions_task(self):
+        resume = self.create_resume()
+        pending = self.create_resume(processing_status=ProcessingStatus.PENDING.value)
+
+        result = generate_questions(resume.id, self.job.id)
+
+        self.assertIn('Generated', result)
+        self.assertTrue(GeneratedQuestion.objects.filter(resume=resume).exists())
+        self.assertEqual(generate_questions(pending.id, self.job.id), f"Resume {pending.id} is not processed")
+
+    def test_batch_generation_reports_throughput(self):
+        resumes = [self.create_resume() for _ in range(5)]
+        self.create_resume(processing_status=ProcessingStatus.FAILED.value)
+        report = QuestionGenerator(batch_size=2).generate_batch(Resume.objects.all(), self.job)
+
+        self.assertEqual(report['resumes'], 5)
+        self.assertEqual(report['questions'], GeneratedQuestion.objects.count())
+        self.assertGreater(report['resumes_per_second'], 0)
+
+        # Rerunning replaces rather than duplicates
+        message = generate_questions_batch(self.job.id, [resume.id for resume in resumes[:2]])
+        self.assertIn('2 resumes', message)
+        self.assertEqual(report['questions'], GeneratedQuestion.objects.count())
+
+
+class ResumeQuestionsTests(ResumeTestCase):
+    def setUp(self):
+        super().setUp()
+        self.job = JobPosition.objects.create(
+            title='Backend Engineer', department='Platform',
+            description='Python, Django, Kubernetes and JavaScript'
+        )
+        self.resume = Resume.objects.create(
+            user=self.user, original_filename='resume.txt', parsed_content=SAMPLE_RESUME,
+            processing_status=ProcessingStatus.COMPLETED.value
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            QuestionGenerator().regenerate(self.resume, self.job)
+
+    def questions(self, resume_id=None, job_position_id=None):
+        return self.client.get(f'/api/questions/{resume_id or self.resume.id}/{job_position_id or self.job.id}/')
+
+    def test_grouped_in_one_query_then_cached(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.questions()
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(response.status_code, 200)
+
+        categories = response.data['categories']
+        self.assertEqual([group['category'] for group in categories], [category.value for category in QuestionCategory])
+        self.assertEqual(response.data['count'], GeneratedQuestion.objects.count())
+        self.assertEqual(response.data['job_position']['title'], 'Backend Engineer')
+        skills = categories[0]['questions']
+        self.assertEqual([question['priority'] for question in skills], sorted(question['priority'] for question in skills))
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.questions().data, response.data)
+
+    def test_pair_lookup_uses_composite_index(self):
+        queryset = GeneratedQuestion.objects.filter(
+            resume_id=self.resume.id, job_position_id=self.job.id
+        ).order_by('category', 'priority')
+        with connection.cursor() as cursor:
+            sql, params = queryset.query.sql_with_params()
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            plan = ' '.join(str(row) for row in cursor.fetchall())
+        self.assertIn('question_pair_idx', plan)
+        self.assertNotIn('TEMP B-TREE', plan)
+
+    def test_regeneration_and_deletion_invalidate(self):
+        self.questions()
+        GeneratedQuestion.objects.filter(category='hr').update(question_text='Changed behind the cache')
+        self.assertNotEqual(self.questions().data['categories'][-1]['questions'][0]['question_text'], 'Changed behind the cache')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            QuestionGenerator().generate_batch(Resume.objects.all(), self.job)
+        with self.assertNumQueries(1):
+            self.questions()
+
+        # Another pair for the same resume keeps its entry
+        other_job = JobPosition.objects.create(title='Frontend Engineer', department='Web', description='React')
+        self.questions(job_position_id=other_job.id)
+        with self.captureOnCommitCallbacks(execute=True):
+            QuestionGenerator().regenerate(self.resume, self.job)
+        with self.assertNumQueries(0):
+            self.questions(job_position_id=other_job.id)
+
+        self.questions()
+        resume_id = self.resume.id
+        with self.captureOnCommitCallbacks(execute=True):
+            self.resume.delete()
+        self.assertEqual(self.questions(resume_id=resume_id).status_code, 404)
+
+    def test_empty_missing_and_foreign(self):
+        other_job = JobPosition.objects.create(title='Frontend Engineer', department='Web', description='React')
+        response = self.questions(job_position_id=other_job.id)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 0)
+        self.assertEqual(self.questions(job_position_id=999).status_code, 404)
+        self.assertEqual(self.questions(resume_id=999).status_code, 404)
+
+        self.questions()  # cached for the owner
+        self.client.force_authenticate(user=User.objects.create_user(username='other'))
+        self.assertEqual(self.questions().status_code, 404)
+        question_cache.invalidate([self.resume.id])
+        self.assertEqual(self.questions().status_code, 404)
+
+    def test_invalidation_reaches_other_processes(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        # Two aliases on one location stand in for two processes' connections
+        shared = {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': directory}
+        with override_settings(CACHES={'default': shared, 'web': shared, 'worker': shared}):
+            web, worker = QuestionCache(cache='web'), QuestionCache(cache='worker')
+            _, key = web.get(self.resume.id, self.job.id)
+            web.set(key, {'count': 1})
+            self.assertEqual(worker.get(self.resume.id, self.job.id)[0], {'count': 1})
+
+            worker.invalidate([self.resume.id], self.job.id)
+            self.assertIsNone(web.get(self.resume.id, self.job.id)[0])
+
+    def test_process_local_cache_is_rejected(self):
+        self.assertEqual([error.id for error in check_question_cache_is_shared(None)], ['resume.E001'])
+        shared = dict(TEST_CACHES, shared={
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': tempfile.gettempdir()
+        })
+        with override_settings(CACHES=shared):
+            self.assertEqual(check_question_cache_is_shared(None), [])
+
+
+class ResumeSectionTests(ResumeTestCase):
+    def test_upload_stores_sections(self):
+        response = self.upload(content=SAMPLE_RESUME.encode())
+
+        resume = Resume.objects.get(id=response.data['resume_id'])
+        sections = list(resume.sections.all())
+        self.assertEqual([section.category for section in sections], ['skills', 'experience', 'projects', 'soft_skills'])
+        experience = sections[1]
+        self.assertEqual(experience.heading, 'EXPERIENCE')
+        self.assertEqual(
+            resume.parsed_content[experience.start_offset:experience.end_offset],
+            'Backend Developer, Acme Corp (2019 - 2023)\n- Built billing APIs in Django'
+        )
+
+    def test_sections_follow_parsed_content(self):
+        resume = Resume.objects.create(user=self.user, original_filename='a.txt', parsed_content=SAMPLE_RESUME)
+        resume.set_parsed_content('Projects\n  Chess   engine\n\n  in Rust')
+        resume.save(update_fields=['parsed_content', 'content_preview', 'content_length'])
+
+        self.assertEqual(list(ResumeSection.objects.values_list('category', 'text')), [('projects', 'Chess engine\nin Rust')])
+
+        # Saves that do not touch parsed_content leave the sections alone
+        reloaded = Resume.objects.get(id=resume.id)
+        with self.assertNumQueries(1):
+            reloaded.save(update_fields=['error_message'])
+
+    def test_batch_upload_indexes_sections(self):
+        response = self.client.post('/api/upload/batch/', {
+            'files': [
+                SimpleUploadedFile('a.txt', SAMPLE_RESUME.encode()),
+                SimpleUploadedFile('b.txt', b'Skills: none listed'),
+            ]
+        }, format='multipart')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(ResumeSection.objects.count(), 4)
+
+    def test_sections_endpoint_filters_by_category(self):
+        resume_id = self.upload(content=SAMPLE_RESUME.encode()).data['resume_id']
+
+        response = self.client.get(f'/api/sections/{resume_id}/', {'category': 'projects'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(response.data['sections'][0]['text'], '- Resume parser using Python and Celery')
+        self.assertEqual(self.client.get(f'/api/sections/{resume_id}/', {'category': 'hobbies'}).status_code, 400)
+
+        other = User.objects.create_user(username='other', password='secret')
+        self.client.force_authenticate(user=other)
+        self.assertEqual(self.client.get(f'/api/sections/{resume_id}/').status_code, 404)
+
+
+class AsyncResumeProcessingTests(ResumeTestCase):
+    def setUp(self):
+        super().setUp()
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        # Celery reads its configuration from Django settings, so this also
+        # runs queued tasks in-process
+        settings_override = override_settings(
+            MEDIA_ROOT=self.media_root,
+            RESUME_ASYNC_PROCESSING=True,
+            CELERY_TASK_ALWAYS_EAGER=True
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def test_async_upload_returns_accepted_and_completes(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.upload(**{'async': 'true'})
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data['status'], ProcessingStatus.PENDING.value)
+        resume = Resume.objects.get(id=response.data['resume_id'])
+        self.assertEqual(resume.processing_status, ProcessingStatus.COMPLETED.value)
+        self.assertEqual(resume.parsed_content, 'Python developer')
+        self.assertEqual(resume.content_preview, 'Python developer')
+        self.assertTrue(resume.is_processed)
+        self.assertIsNotNone(resume.processed_at)
+        self.assertFalse(resume.file)
+
+    def test_async_failure_records_error(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.upload(name='resume.pdf', content=b'%PDF-1.4 truncated', **{'async': 'true'})
+
+        resume = Resume.objects.get(id=response.data['resume_id'])
+        self.assertEqual(resume.processing_status, ProcessingStatus.FAILED.value)
+        self.assertIn('PDF', resume.error_message)
+        self.assertIsNotNone(resume.processed_at)
+
+    def test_clients_can_only_opt_out(self):
+        self.assertEqual(self.upload(content=b'Go', **{'async': 'false'}).status_code, 201)
+        with override_settings(RESUME_ASYNC_PROCESSING=False):
+            # Nothing may be consuming the queue, so the request is served inline
+            response = self.upload(content=b'Rust', **{'async': 'true'})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Resume.objects.get(id=response.data['resume_id']).parsed_content, 'Rust')
+
+    def test_task_skips_records_that_are_not_pending(self):
+        resume = Resume.objects.create(
+            user=self.user,
+            original_filename='resume.txt',
+            processing_status=ProcessingStatus.COMPLETED.value
+        )
+
+        result = process_resume.apply(args=[resume.id]).get()
+
+        self.assertIn('not pending', result)
+
+
+class PDFExtractionEngineTests(TestCase):
+    def setUp(self):
+        extraction_cache.clear()
+        self.pdf = io.BytesIO(make_pdf([f"Page {number}" for number in range(1, 21)]))
+
+    def test_parallel_matches_serial(self):
+        serial = PDFExtractionEngine(engine='serial', pages_per_chunk=3).extract(self.pdf)
+        parallel = PDFExtractionEngine(engine='parallel', max_workers=2, pages_per_chunk=3).extract(self.pdf)
+
+        self.assertEqual(parallel.text, serial.text)
+        self.assertEqual(serial.text.splitlines()[0], 'Page 1')
+        self.assertEqual(serial.text.splitlines()[-1], 'Page 20')
+        self.assertEqual([page for page, _ in parallel.page_timings], list(range(1, 21)))
+        self.assertFalse(parallel.truncated)
+
+    def test_page_budget(self):
+        result = PDFExtractionEngine(engine='serial', max_pages=5).extract(self.pdf)
+
+        self.assertEqual(result.page_count, 20)
+        self.assertEqual(result.pages_extracted, 5)
+        self.assertEqual(result.truncated_by, 'pages')
+        self.assertEqual(result.text.splitlines()[-1], 'Page 5')
+
+    def test_char_budget(self):
+        result = PDFExtractionEngine(engine='parallel', max_workers=2, pages_per_chunk=4, max_chars=20).extract(self.pdf)
+
+        self.assertEqual(result.truncated_by, 'chars')
+        self.assertLessEqual(len(result.text), 20)
+        self.assertTrue(result.text.startswith('Page 1'))
+
+    def test_time_budget(self):
+        result = PDFExtractionEngine(engine='serial', time_budget=0).extract(self.pdf)
+
+        self.assertEqual(result.pages_extracted, 0)
+        self.assertEqual(result.truncated_by, 'time')
+
+    @override_settings(RESUME_PDF_EXTRACTION={'ENGINE': 'serial', 'MAX_PAGES': 2})
+    def test_upload_uses_configured_engine(self):
+        user = User.objects.create_user(username='candidate', password='secret')
+        client = APIClient()
+        client.force_authenticate(user=user)
+
+        response = client.post('/api/upload/', {
+            'resume': SimpleUploadedFile('resume.pdf', self.pdf.getvalue())
+        }, format='multipart')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['pdf_extraction']['pages_extracted'], 2)
+        self.assertEqual(Resume.objects.get().parsed_content, 'Page 1\nPage 2')
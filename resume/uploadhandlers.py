@@ -0,0 +1,95 @@
+import hashlib
+import os
+
+from django.conf import settings
+from django.core.files.uploadhandler import FileUploadHandler, SkipFile
+
+from .enums import FileType
+
+HEADER_SIZE = 1024
+ARCHIVE_EXTENSION = '.zip'
+ARCHIVE_SIGNATURE = b'PK\x03\x04'
+REJECTION_REASONS = ('unsupported_type', 'content_mismatch', 'too_large')
+
+
+def get_upload_results(request, field_name):
+    """Return what ResumeUploadHandler recorded for each file in a field
+
+    Each entry is a dict with ``file_name``, ``content_hash`` and ``error``
+    (None, 'unsupported_type', 'content_mismatch' or 'too_large'), in upload
+    order. Rejected files are absent from ``request.FILES``.
+    """
+    return getattr(request, 'resume_upload_results', {}).get(field_name, [])
+
+
+def describe_rejection(reason, file_name):
+    """Human-readable message for an upload validation failure"""
+    file_extension = os.path.splitext(file_name)[1].lower()
+    if reason == 'too_large':
+        limit = settings.RESUME_MAX_ARCHIVE_SIZE if file_extension == ARCHIVE_EXTENSION else settings.RESUME_MAX_UPLOAD_SIZE
+        return f"File size too large. Maximum size is {limit // (1024 * 1024)}MB"
+    if reason == 'content_mismatch':
+        return f"File content does not match its extension: {file_extension}"
+    return f"Unsupported file type: {file_extension}"
+
+
+class ResumeUploadHandler(FileUploadHandler):
+    """Validate uploads while they stream in, before anything is buffered
+
+    Runs ahead of Django's memory/temporary-file handlers. The extension and
+    magic bytes are checked on the first chunk and the size on every chunk,
+    and the SHA-256 digest is built incrementally so views do not have to
+    read the file again to hash it. A rejected file is skipped without being
+    stored while the rest of the request is parsed. ZIP archives for batch
+    uploads are accepted with their own size limit.
+    """
+
+    def handle_raw_input(self, input_data, META, content_length, boundary, encoding=None):
+        self.request.resume_upload_results = {}
+
+    def new_file(self, field_name, file_name, *args, **kwargs):
+        super().new_file(field_name, file_name, *args, **kwargs)
+        self.extension = os.path.splitext(file_name)[1].lower()
+        self.received = 0
+        self.checked_header = False
+        self.digest = hashlib.sha256()
+        self.result = {"file_name": file_name, "content_hash": None, "error": None}
+        self.request.resume_upload_results.setdefault(field_name, []).append(self.result)
+
+        self.is_archive = self.extension == ARCHIVE_EXTENSION
+        if self.is_archive:
+            self.max_size = settings.RESUME_MAX_ARCHIVE_SIZE
+        else:
+            self.max_size = settings.RESUME_MAX_UPLOAD_SIZE
+
+    def receive_data_chunk(self, raw_data, start):
+        # Raising SkipFile from new_file() would make Django close the previous
+        # file's buffer, so unsupported types are refused on their first chunk
+        if not self.is_archive and not FileType.is_supported(self.extension):
+            self.reject('unsupported_type')
+
+        self.received += len(raw_data)
+        if self.received > self.max_size:
+            self.reject('too_large')
+
+        if not self.checked_header:
+            self.checked_header = True
+            header = raw_data[:HEADER_SIZE]
+            if self.is_archive:
+                matches = header.startswith(ARCHIVE_SIGNATURE)
+            else:
+                matches = FileType.matches_signature(self.extension, header)
+            if not matches:
+                self.reject('content_mismatch')
+
+        self.digest.update(raw_data)
+        return raw_data
+
+    def file_complete(self, file_size):
+        self.result["content_hash"] = self.digest.hexdigest()
+        # Let the next handler build the uploaded file object
+        return None
+
+    def reject(self, reason):
+        self.result["error"] = reason
+        raise SkipFile()
@@ -1,11 +1,23 @@
 from django.urls import path
-from .views import ResumeUploadView, ResumeStatusView, ResumeListView, SupportedFileTypesView
+from .views import AsyncResumeListView, AsyncResumeStatusView, AsyncResumeUploadView, ResumeUploadView, ResumeBatchUploadView, ResumeStatusView, ResumeListView, ResumeExportView, ResumeMatchView, ResumeQuestionsView, ResumeSearchView, ResumeSectionsView, SupportedFileTypesView
 
 app_name = 'resume'
 
 urlpatterns = [
     path(r'upload/', ResumeUploadView.as_view(), name='resume_upload'),
+    path(r'upload/batch/', ResumeBatchUploadView.as_view(), name='resume_batch_upload'),
     path(r'status/<int:resume_id>/', ResumeStatusView.as_view(), name='resume_status'),
     path(r'list/', ResumeListView.as_view(), name='resume_list'),
+    path(r'export/', ResumeExportView.as_view(), name='resume_export'),
+    path(r'search/', ResumeSearchView.as_view(), name='resume_search'),
+    path(r'sections/<int:resume_id>/', ResumeSectionsView.as_view(), name='resume_sections'),
+    path(r'matches/<int:resume_id>/', ResumeMatchView.as_view(), name='resume_matches'),
+    path(
+        r'questions/<int:resume_id>/<int:job_position_id>/', ResumeQuestionsView.as_view(), name='resume_questions'
+    ),
+    # Native async variants for ASGI deployments
+    path(r'async/upload/', AsyncResumeUploadView.as_view(), name='resume_async_upload'),
+    path(r'async/status/<int:resume_id>/', AsyncResumeStatusView.as_view(), name='resume_async_status'),
+    path(r'async/list/', AsyncResumeListView.as_view(), name='resume_async_list'),
     path(r'supported-types/', SupportedFileTypesView.as_view(), name='supported_file_types'),
 ] 
\ No newline at end of file
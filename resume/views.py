@@ -1,24 +1,110 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import transaction
+from django.http import HttpResponse, StreamingHttpResponse
 from django.shortcuts import render
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
 from rest_framework import status
-from resume.models import Resume
-from resume.enums import FileType, ProcessingStatus
+from resume.models import GeneratedQuestion, JobPosition, Resume, ResumeSection
+from resume.admission import get_extraction_gate
+from resume.enums import FileType, ProcessingStatus, QuestionCategory
+from resume.executor import ExtractionQueueFull, get_extraction_executor
+from resume.export import FORMATS, export_queryset, iter_export, parse_export_time
+from resume.extractors import registry as extractors
+from resume.metrics import ScrapePermission, metrics
+from resume.pagination import InvalidCursor, akeyset_page, keyset_page
+from resume.questions import question_cache
+from resume.sandbox import SandboxBusy
+from resume.search import index_resumes, search_resumes
+from resume.sections import index_sections
+from resume.services import (
+    BatchItem, compute_content_hash, extract_batch, extraction_cache, iter_archive_members,
+    job_matcher
+)
+from resume.tasks import process_resume
+from resume.uploadhandlers import REJECTION_REASONS, describe_rejection, get_upload_results
 import os
 import io
-import PyPDF2
-from docx import Document
-import chardet
+import zipfile
 
 # Create your views here.
 
+def file_type_label(file_extension):
+    """Metric label for an upload's type; client-chosen extensions never become series"""
+    return file_extension if FileType.is_supported(file_extension) else 'unsupported'
+
+
+def busy_response(error):
+    """429 for an upload turned away because extraction is saturated
+
+    error is an ExtractionQueueFull or SandboxBusy, both with retry_after.
+    """
+    metrics.inc('resume_upload_rejections_total', reason='busy')
+    return Response(
+        {"error": str(error)},
+        status=status.HTTP_429_TOO_MANY_REQUESTS,
+        headers={'Retry-After': str(error.retry_after)}
+    )
+
+
 class ResumeUploadView(APIView):
     permission_classes = [AllowAny]
+    throttle_scope = 'upload'
 
+    @metrics.timed('resume_request_duration_seconds', view='upload')
     def post(self, request, **kwargs):
         user = request.user
-        resume_file = request.FILES.get('resume')
+        stages = metrics.stage_timer(view='upload')
+        prepared = self.prepare_upload(request, stages)
+        if isinstance(prepared, Response):
+            return prepared
+        resume_file, file_extension, content_hash, cached_content = prepared
+
+        if cached_content is None and self.use_async_processing(request):
+            return self.queue_for_processing(user, resume_file, file_extension, content_hash)
+
+        try:
+            if cached_content is not None:
+                content = cached_content
+            else:
+                # Extract content from file in memory, once a slot is free
+                with get_extraction_gate().slot(), stages('extract'):
+                    content = self.extract_content_from_file(resume_file, file_extension)
+                extraction_cache.set(content_hash, content, user.pk)
+
+            # Create resume object without saving the file
+            with stages('persist'):
+                resume_obj = self.completed_resume(user, resume_file, file_extension, content_hash, content)
+                resume_obj.save(force_insert=True)
+            return self.created_response(resume_obj, resume_file, file_extension, content, cached_content is not None)
+
+        except (ExtractionQueueFull, SandboxBusy) as e:
+            return busy_response(e)
+        except Exception as e:
+            return self.failed_response(file_extension, e)
+
+    def prepare_upload(self, request, stages):
+        """Validate the upload and look up its parsed content by hash
+
+        Returns a rejection Response, or a (resume_file, file_extension,
+        content_hash, cached_content) tuple.
+        """
+        with stages('read'):
+            # Parsing the multipart body is where the upload is actually read
+            resume_file = request.FILES.get('resume')
+
+        # ResumeUploadHandler has already validated the stream while parsing
+        upload_results = get_upload_results(request, 'resume')
+        for result in upload_results:
+            if result["error"]:
+                return self.rejection_response(result["error"], result["file_name"])
 
         if not resume_file:
             return Response(
@@ -26,195 +112,714 @@ class ResumeUploadView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        # Validate file size (e.g., max 10MB)
-        max_size = 10 * 1024 * 1024  # 10MB
-        if resume_file.size > max_size:
-            return Response(
-                {"error": "File size too large. Maximum size is 10MB"}, 
-                status=status.HTTP_400_BAD_REQUEST
-            )
+        with stages('detect'):
+            # Fallback checks for requests that bypassed the upload handler
+            if resume_file.size > settings.RESUME_MAX_UPLOAD_SIZE:
+                return self.rejection_response('too_large', resume_file.name)
 
-        # Get file extension and validate
-        file_extension = os.path.splitext(resume_file.name)[1].lower()
-        
-        if not FileType.is_supported(file_extension):
+            # Get file extension and validate
+            file_extension = os.path.splitext(resume_file.name)[1].lower()
+
+            if not FileType.is_supported(file_extension):
+                return self.rejection_response('unsupported_type', resume_file.name)
+
+            # Identical uploads reuse previously parsed content instead of re-extracting
+            if upload_results and upload_results[0]["content_hash"]:
+                content_hash = upload_results[0]["content_hash"]
+            else:
+                content_hash = compute_content_hash(resume_file)
+            cached_content = extraction_cache.get(content_hash, request.user.pk, resume_file.size)
+
+        return resume_file, file_extension, content_hash, cached_content
+
+    def completed_resume(self, user, resume_file, file_extension, content_hash, content):
+        """Unsaved Resume for an upload extracted inline"""
+        resume_obj = Resume(
+            user=user,
+            file=None,  # Don't save the file
+            original_filename=resume_file.name,
+            file_type=file_extension,
+            file_size=resume_file.size,
+            content_hash=content_hash,
+            processing_status=ProcessingStatus.COMPLETED.value,
+            processed_at=timezone.now(),
+            is_processed=True,
+        )
+        resume_obj.set_parsed_content(content)  # Save the extracted content directly
+        return resume_obj
+
+    def created_response(self, resume_obj, resume_file, file_extension, content, deduplicated):
+        metrics.inc(
+            'resume_uploads_total', file_type=file_type_label(file_extension), status=ProcessingStatus.COMPLETED.value
+        )
+        return Response({
+            "message": "Resume processed successfully",
+            "resume_id": resume_obj.id,
+            "status": ProcessingStatus.COMPLETED.value,
+            "file_type": file_extension,
+            "file_type_display": FileType.get_display_name(file_extension),
+            "file_size": resume_file.size,
+            "content_length": len(content) if content else 0,
+            "deduplicated": deduplicated,
+            "pdf_extraction": getattr(self, 'pdf_extraction', None)
+        }, status=status.HTTP_201_CREATED)
+
+    def failed_response(self, file_extension, error):
+        metrics.inc(
+            'resume_uploads_total', file_type=file_type_label(file_extension), status=ProcessingStatus.FAILED.value
+        )
+        return Response({
+            "error": f"Error processing file: {str(error)}"
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    def rejection_response(self, reason, file_name):
+        """Build the 400 response for a file that failed upload validation"""
+        metrics.inc('resume_upload_rejections_total', reason=reason if reason in REJECTION_REASONS else 'invalid')
+        file_extension = os.path.splitext(file_name)[1].lower()
+        response_data = {"error": describe_rejection(reason, file_name)}
+        if reason == 'content_mismatch':
+            response_data["file_type_display"] = FileType.get_display_name(file_extension)
+        elif reason == 'unsupported_type':
             supported_types = FileType.get_supported_extensions()
-            return Response({
-                "error": f"Unsupported file type: {file_extension}",
-                "supported_types": supported_types,
-                "supported_types_display": [FileType.get_display_name(ext) for ext in supported_types]
-            }, status=status.HTTP_400_BAD_REQUEST)
-        
-        try:
-            # Extract content from file in memory
-            content = self.extract_content_from_file(resume_file, file_extension)
-            
-            # Create resume object without saving the file
-            resume_obj = Resume.objects.create(
+            response_data["supported_types"] = supported_types
+            response_data["supported_types_display"] = [FileType.get_display_name(ext) for ext in supported_types]
+        return Response(response_data, status=status.HTTP_400_BAD_REQUEST)
+
+    def use_async_processing(self, request):
+        """Check whether this upload should be extracted by a Celery worker
+
+        Clients can only opt out: without RESUME_ASYNC_PROCESSING there may
+        be no worker consuming the queue, so async=true is ignored.
+        """
+        if not settings.RESUME_ASYNC_PROCESSING:
+            return False
+        requested = request.data.get('async', request.query_params.get('async'))
+        if requested is None:
+            return True
+        return str(requested).lower() in ('1', 'true', 'yes')
+
+    def queue_for_processing(self, user, resume_file, file_extension, content_hash=None):
+        """Store the upload and hand extraction off to a Celery worker"""
+        with transaction.atomic():
+            resume_obj = Resume(
                 user=user,
-                file=None,  # Don't save the file
                 original_filename=resume_file.name,
                 file_type=file_extension,
                 file_size=resume_file.size,
-                parsed_content=content,  # Save the extracted content directly
-                processing_status=ProcessingStatus.COMPLETED.value,
-                is_processed=True
+                content_hash=content_hash,
+                processing_status=ProcessingStatus.PENDING.value,
             )
+            resume_obj.file.save(resume_file.name, resume_file, save=False)
+            resume_obj.save()
+            # Only enqueue once the row is visible to the worker
+            transaction.on_commit(lambda: process_resume.delay(resume_obj.id))
+        metrics.inc(
+            'resume_uploads_total', file_type=file_type_label(file_extension), status=ProcessingStatus.PENDING.value
+        )
 
-            return Response({
-                "message": "Resume processed successfully",
-                "resume_id": resume_obj.id,
-                "status": ProcessingStatus.COMPLETED.value,
-                "file_type": file_extension,
-                "file_type_display": FileType.get_display_name(file_extension),
-                "file_size": resume_file.size,
-                "content_length": len(content) if content else 0
-            }, status=status.HTTP_201_CREATED)
-            
-        except Exception as e:
-            return Response({
-                "error": f"Error processing file: {str(e)}"
-            }, status=status.HTTP_400_BAD_REQUEST)
+        return Response({
+            "message": "Resume queued for processing",
+            "resume_id": resume_obj.id,
+            "status": ProcessingStatus.PENDING.value,
+            "file_type": file_extension,
+            "file_type_display": FileType.get_display_name(file_extension),
+            "file_size": resume_file.size
+        }, status=status.HTTP_202_ACCEPTED)
+
+    def gated_extract(self, file_obj, file_extension):
+        """extract_content_from_file once an ExtractionGate slot is free"""
+        with get_extraction_gate().slot():
+            return self.extract_content_from_file(file_obj, file_extension)
 
     def extract_content_from_file(self, file_obj, file_extension):
         """Extract content from file object in memory"""
         try:
-            if file_extension == FileType.PDF.value:
-                return self.extract_pdf_text_from_memory(file_obj)
-            elif file_extension in [FileType.DOC.value, FileType.DOCX.value]:
-                return self.extract_word_text_from_memory(file_obj, file_extension)
-            elif file_extension in [FileType.TXT.value, FileType.RTF.value]:
-                return self.extract_text_file_from_memory(file_obj)
-            else:
-                return self.extract_generic_text_from_memory(file_obj)
+            result = extractors.extract(file_obj, file_extension)
+        except SandboxBusy:
+            raise  # the upload is turned away, not failed
         except Exception as e:
             raise Exception(f"Error extracting content: {str(e)}")
+        if file_extension == FileType.PDF.value:
+            self.pdf_extraction = result.details
+        return result.text
 
-    def extract_pdf_text_from_memory(self, file_obj):
-        """Extract text from PDF file in memory"""
-        try:
-            file_obj.seek(0)  # Reset file pointer
-            pdf_reader = PyPDF2.PdfReader(file_obj)
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
-            return text.strip()
-        except Exception as e:
-            raise Exception(f"Error extracting PDF text: {str(e)}")
+class ResumeBatchUploadView(APIView):
+    permission_classes = [IsAuthenticated]
+    throttle_scope = 'batch_upload'
 
-    def extract_word_text_from_memory(self, file_obj, file_extension):
-        """Extract text from Word document in memory"""
-        try:
-            file_obj.seek(0)  # Reset file pointer
-            if file_extension == FileType.DOCX.value:
-                doc = Document(file_obj)
-                text = ""
-                for paragraph in doc.paragraphs:
-                    text += paragraph.text + "\n"
-                return text.strip()
+    @metrics.timed('resume_request_duration_seconds', view='batch_upload')
+    def post(self, request, **kwargs):
+        """Upload many resumes as repeated 'files' parts and/or a ZIP 'archive'"""
+        user = request.user
+        uploaded_files = request.FILES.getlist('files')
+        archive = request.FILES.get('archive')
+
+        # Files the upload handler refused never reach request.FILES
+        items = [
+            BatchItem(result["file_name"], error=describe_rejection(result["error"], result["file_name"]))
+            for field_name in ('files', 'archive')
+            for result in get_upload_results(request, field_name)
+            if result["error"]
+        ]
+        for uploaded_file in uploaded_files:
+            if FileType.is_supported(os.path.splitext(uploaded_file.name)[1]):
+                items.append(BatchItem(uploaded_file.name, uploaded_file))
             else:
-                # For .doc files, we'll need additional libraries
-                return f"Word document (.doc) processing not yet implemented for {file_obj.name}"
-        except Exception as e:
-            raise Exception(f"Error extracting Word document text: {str(e)}")
+                items.append(BatchItem(uploaded_file.name, error=describe_rejection('unsupported_type', uploaded_file.name)))
 
-    def extract_text_file_from_memory(self, file_obj):
-        """Extract text from plain text file in memory"""
-        try:
-            file_obj.seek(0)  # Reset file pointer
-            raw_data = file_obj.read()
-            
-            # Detect encoding
-            detected = chardet.detect(raw_data)
-            encoding = detected['encoding'] or 'utf-8'
-            
-            # Decode with detected encoding
-            return raw_data.decode(encoding).strip()
-        except Exception as e:
-            raise Exception(f"Error extracting text file content: {str(e)}")
+        if archive:
+            try:
+                items.extend(iter_archive_members(archive))
+            except zipfile.BadZipFile:
+                return Response(
+                    {"error": "Archive is not a valid ZIP file"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+        if not items:
+            return Response(
+                {"error": "No files provided"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(items) > settings.RESUME_MAX_BATCH_FILES:
+            return Response(
+                {"error": f"Too many files. Maximum per batch is {settings.RESUME_MAX_BATCH_FILES}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
 
-    def extract_generic_text_from_memory(self, file_obj):
-        """Try to extract text from unknown file types in memory"""
+        stages = metrics.stage_timer(view='batch_upload')
         try:
-            file_obj.seek(0)  # Reset file pointer
-            raw_data = file_obj.read()
-            
-            # Try to decode with different encodings
-            encodings = ['utf-8', 'latin-1', 'cp1252', 'iso-8859-1']
-            
-            for encoding in encodings:
-                try:
-                    content = raw_data.decode(encoding)
-                    # Check if content looks like text (not too many null bytes)
-                    if content.count('\x00') < len(content) * 0.1:
-                        return content.strip()
-                except UnicodeDecodeError:
-                    continue
-            
-            # If all text encodings fail, return binary file info
-            return f"Binary file detected. File size: {len(raw_data)} bytes. Text extraction not possible."
-            
-        except Exception as e:
-            raise Exception(f"Error processing generic file: {str(e)}")
+            with stages('extract'):
+                extract_batch(items, ResumeUploadView, user.pk)
+        except (ExtractionQueueFull, SandboxBusy) as e:
+            return busy_response(e)
+
+        processed_at = timezone.now()
+        completed = [item for item in items if item.error is None]
+        resumes = []
+        for item in completed:
+            resume = Resume(
+                user=user,
+                original_filename=item.file_name,
+                file_type=item.file_extension,
+                file_size=item.file_size,
+                content_hash=item.content_hash,
+                processing_status=ProcessingStatus.COMPLETED.value,
+                processed_at=processed_at,
+                is_processed=True
+            )
+            resume.set_parsed_content(item.content)
+            resumes.append(resume)
+        with stages('persist'), transaction.atomic():
+            Resume.objects.bulk_create(resumes, batch_size=100)
+            index_resumes(resumes)
+            index_sections(resumes)
+
+        resume_ids = {id(item): resume.id for item, resume in zip(completed, resumes)}
+        results = []
+        for item in items:
+            metrics.inc(
+                'resume_uploads_total',
+                file_type=file_type_label(os.path.splitext(item.file_name)[1].lower()),
+                status=ProcessingStatus.COMPLETED.value if item.error is None else ProcessingStatus.FAILED.value
+            )
+            if item.error is None:
+                results.append({
+                    "filename": item.file_name,
+                    "status": ProcessingStatus.COMPLETED.value,
+                    "resume_id": resume_ids[id(item)],
+                    "file_type": item.file_extension,
+                    "content_length": len(item.content) if item.content else 0,
+                    "deduplicated": item.deduplicated
+                })
+            else:
+                results.append({
+                    "filename": item.file_name,
+                    "status": ProcessingStatus.FAILED.value,
+                    "error": item.error
+                })
+
+        return Response({
+            "results": results,
+            "created": len(resumes),
+            "failed": len(items) - len(resumes)
+        }, status=status.HTTP_201_CREATED if resumes else status.HTTP_400_BAD_REQUEST)
 
 class ResumeStatusView(APIView):
     permission_classes = [IsAuthenticated]
+    throttle_scope = 'status'
+    # Everything the response needs except the full parsed_content
+    status_fields = [
+        'id', 'original_filename', 'file_type', 'file_size', 'processing_status',
+        'uploaded_at', 'processed_at', 'is_processed', 'content_preview',
+        'content_length', 'error_message'
+    ]
 
+    @metrics.timed('resume_request_duration_seconds', view='status')
     def get(self, request, resume_id, **kwargs):
         try:
-            resume = Resume.objects.get(id=resume_id, user=request.user)
-            
-            response_data = {
-                "resume_id": resume.id,
-                "filename": resume.original_filename,
-                "file_type": resume.file_type,
-                "file_type_display": FileType.get_display_name(resume.file_type) if resume.file_type else None,
-                "file_size": resume.file_size,
-                "status": resume.processing_status,
-                "status_display": ProcessingStatus.get_display_name(resume.processing_status),
-                "uploaded_at": resume.uploaded_at,
-                "processed_at": resume.processed_at,
-                "is_processed": resume.is_processed
-            }
-            
-            if resume.processing_status == ProcessingStatus.COMPLETED.value:
-                response_data["content_preview"] = resume.parsed_content[:500] + "..." if len(resume.parsed_content) > 500 else resume.parsed_content
-            elif resume.processing_status == ProcessingStatus.FAILED.value:
-                response_data["error_message"] = resume.error_message
-                
-            return Response(response_data, status=status.HTTP_200_OK)
-            
+            resume = Resume.objects.only(*self.status_fields).get(id=resume_id, user=request.user)
         except Resume.DoesNotExist:
             return Response(
                 {"error": "Resume not found"}, 
                 status=status.HTTP_404_NOT_FOUND
             )
+        return self.status_response(request, resume)
+
+    def status_response(self, request, resume):
+        """200 with the resume's state, or 304 if the client's copy is current"""
+        metrics.inc('resume_status_polls_total', status=resume.processing_status)
+
+        # Pollers get a 304 until the status or processed_at changes. There is
+        # no Last-Modified: no column changes on every transition (pending ->
+        # processing sets nothing), and whole seconds would hide a completion
+        # in the second of the upload, so If-Modified-Since could go stale.
+        etag = self.get_etag(resume)
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            not_modified.headers['ETag'] = etag
+            return not_modified
+
+        response_data = {
+            "resume_id": resume.id,
+            "filename": resume.original_filename,
+            "file_type": resume.file_type,
+            "file_type_display": FileType.get_display_name(resume.file_type) if resume.file_type else None,
+            "file_size": resume.file_size,
+            "status": resume.processing_status,
+            "status_display": ProcessingStatus.get_display_name(resume.processing_status),
+            "uploaded_at": resume.uploaded_at,
+            "processed_at": resume.processed_at,
+            "is_processed": resume.is_processed
+        }
+        
+        if resume.processing_status == ProcessingStatus.COMPLETED.value:
+            response_data["content_preview"] = resume.content_preview
+            response_data["content_length"] = resume.content_length
+        elif resume.processing_status == ProcessingStatus.FAILED.value:
+            response_data["error_message"] = resume.error_message
+            
+        response = Response(response_data, status=status.HTTP_200_OK)
+        response.headers['ETag'] = etag
+        return response
+
+    def get_etag(self, resume):
+        """ETag for a resume's current processing state"""
+        version = int(resume.processed_at.timestamp() * 1000000) if resume.processed_at else 0
+        return quote_etag(f"{resume.id}-{resume.processing_status}-{version}")
 
 class ResumeListView(APIView):
     permission_classes = [IsAuthenticated]
+    throttle_scope = 'list'
+    default_page_size = 20
+    max_page_size = 100
+    # Only the listed columns are read; parsed_content is never loaded here
+    list_fields = ['id', 'original_filename', 'file_type', 'processing_status', 'uploaded_at', 'is_processed']
 
+    @metrics.timed('resume_request_duration_seconds', view='list')
     def get(self, request, **kwargs):
+        resumes = self.filter_resumes(request)
+        if isinstance(resumes, Response):
+            return resumes
+
+        try:
+            rows, next_cursor = keyset_page(
+                resumes.values(*self.list_fields),
+                request.query_params.get('cursor'),
+                self.get_page_size(request)
+            )
+        except InvalidCursor:
+            return self.invalid_cursor_response()
+        return self.page_response(rows, next_cursor)
+
+    def filter_resumes(self, request):
+        """The user's resumes narrowed by the query, or a 400 Response"""
         resumes = Resume.objects.filter(user=request.user)
-        
+
+        status_filter = request.query_params.get('status')
+        if status_filter:
+            if status_filter not in [choice for choice, _ in ProcessingStatus.get_choices()]:
+                return Response(
+                    {"error": f"Unknown status: {status_filter}"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            resumes = resumes.filter(processing_status=status_filter)
+
+        file_type_filter = request.query_params.get('file_type')
+        if file_type_filter:
+            if not file_type_filter.startswith('.'):
+                file_type_filter = f".{file_type_filter}"
+            if not FileType.is_supported(file_type_filter):
+                return Response(
+                    {"error": f"Unsupported file type: {file_type_filter}"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            resumes = resumes.filter(file_type=file_type_filter.lower())
+        return resumes
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params.get('page_size', self.default_page_size))
+        except ValueError:
+            page_size = self.default_page_size
+        return max(1, min(page_size, self.max_page_size))
+
+    def invalid_cursor_response(self):
+        return Response(
+            {"error": "Invalid cursor"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    def page_response(self, rows, next_cursor):
         resume_list = []
-        for resume in resumes:
+        for resume in rows:
             resume_data = {
-                "id": resume.id,
-                "filename": resume.original_filename,
-                "file_type": resume.file_type,
-                "file_type_display": FileType.get_display_name(resume.file_type) if resume.file_type else None,
-                "status": resume.processing_status,
-                "status_display": ProcessingStatus.get_display_name(resume.processing_status),
-                "uploaded_at": resume.uploaded_at,
-                "is_processed": resume.is_processed
+                "id": resume["id"],
+                "filename": resume["original_filename"],
+                "file_type": resume["file_type"],
+                "file_type_display": FileType.get_display_name(resume["file_type"]) if resume["file_type"] else None,
+                "status": resume["processing_status"],
+                "status_display": ProcessingStatus.get_display_name(resume["processing_status"]),
+                "uploaded_at": resume["uploaded_at"],
+                "is_processed": resume["is_processed"]
             }
             resume_list.append(resume_data)
             
         return Response({
             "resumes": resume_list,
-            "count": len(resume_list)
+            "count": len(resume_list),
+            "next_cursor": next_cursor
+        }, status=status.HTTP_200_OK)
+
+class ResumeExportView(ResumeListView):
+    """Stream all of the user's resumes as NDJSON or CSV
+
+    Takes the list filters plus ``since``/``until`` (ISO dates or datetimes,
+    until exclusive), ``cursor`` (from any exported row) and ``include``
+    (``content``, ``questions`` or both, comma-separated). The format is
+    picked with ``output`` since DRF reserves ``format``.
+    """
+
+    throttle_scope = 'export'
+
+    @metrics.timed('resume_request_duration_seconds', view='export')
+    def get(self, request, **kwargs):
+        resumes = self.filter_resumes(request)
+        if isinstance(resumes, Response):
+            return resumes
+
+        export_format = request.query_params.get('output', 'ndjson')
+        if export_format not in FORMATS:
+            return Response(
+                {"error": f"Unknown output format: {export_format}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        include = {part.strip() for part in request.query_params.get('include', '').split(',') if part.strip()}
+        if include - {'content', 'questions'}:
+            return Response(
+                {"error": f"Unknown include: {', '.join(sorted(include - {'content', 'questions'}))}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            since, until = (
+                parse_export_time(request.query_params[name]) if request.query_params.get(name) else None
+                for name in ('since', 'until')
+            )
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            resumes = export_queryset(
+                resumes, since, until, request.query_params.get('cursor'),
+                include_content='content' in include, include_questions='questions' in include
+            )
+        except InvalidCursor:
+            return self.invalid_cursor_response()
+
+        response = StreamingHttpResponse(
+            iter_export(resumes, export_format, 'content' in include, 'questions' in include),
+            content_type=FORMATS[export_format]
+        )
+        response['Content-Disposition'] = f'attachment; filename="resumes.{export_format}"'
+        return response
+
+
+class AsyncAPIView(APIView):
+    """APIView whose handlers are coroutines, for serving under ASGI
+
+    Authentication, permission and throttle checks may query the database,
+    so they run in a thread; the handler itself runs on the event loop.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+            response = handler(request, *args, **kwargs)
+            if asyncio.iscoroutine(response):
+                response = await response
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+
+class AsyncResumeUploadView(AsyncAPIView, ResumeUploadView):
+    """Upload endpoint that extracts on the bounded extraction executor
+
+    The ASGI server has already buffered the body by the time the view
+    runs, so slow clients cost no thread. Extraction is awaited on the
+    executor, and 429 is returned when it is saturated.
+    """
+
+    @metrics.timed('resume_request_duration_seconds', view='async_upload')
+    async def post(self, request, **kwargs):
+        user = request.user
+        stages = metrics.stage_timer(view='async_upload')
+        prepared = await sync_to_async(self.prepare_upload)(request, stages)
+        if isinstance(prepared, Response):
+            return prepared
+        resume_file, file_extension, content_hash, cached_content = prepared
+
+        if cached_content is None and self.use_async_processing(request):
+            return await sync_to_async(self.queue_for_processing)(user, resume_file, file_extension, content_hash)
+
+        try:
+            if cached_content is not None:
+                content = cached_content
+            else:
+                with stages('extract'):
+                    # The executor thread waits for a gate slot, so sync and
+                    # async uploads share one cap per process
+                    content = await get_extraction_executor().run(
+                        self.gated_extract, resume_file, file_extension
+                    )
+                extraction_cache.set(content_hash, content, user.pk)
+
+            with stages('persist'):
+                resume_obj = self.completed_resume(user, resume_file, file_extension, content_hash, content)
+                await resume_obj.asave(force_insert=True)
+            return self.created_response(resume_obj, resume_file, file_extension, content, cached_content is not None)
+
+        except (ExtractionQueueFull, SandboxBusy) as e:
+            return busy_response(e)
+        except Exception as e:
+            return self.failed_response(file_extension, e)
+
+
+class AsyncResumeStatusView(AsyncAPIView, ResumeStatusView):
+
+    @metrics.timed('resume_request_duration_seconds', view='async_status')
+    async def get(self, request, resume_id, **kwargs):
+        try:
+            resume = await Resume.objects.only(*self.status_fields).aget(id=resume_id, user=request.user)
+        except Resume.DoesNotExist:
+            return Response(
+                {"error": "Resume not found"},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        return self.status_response(request, resume)
+
+
+class AsyncResumeListView(AsyncAPIView, ResumeListView):
+
+    @metrics.timed('resume_request_duration_seconds', view='async_list')
+    async def get(self, request, **kwargs):
+        resumes = self.filter_resumes(request)
+        if isinstance(resumes, Response):
+            return resumes
+
+        try:
+            rows, next_cursor = await akeyset_page(
+                resumes.values(*self.list_fields),
+                request.query_params.get('cursor'),
+                self.get_page_size(request)
+            )
+        except InvalidCursor:
+            return self.invalid_cursor_response()
+        return self.page_response(rows, next_cursor)
+
+class ResumeSearchView(APIView):
+    permission_classes = [IsAuthenticated]
+    default_limit = 20
+    max_limit = 100
+
+    def get(self, request, **kwargs):
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response(
+                {"error": "No search query provided"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            limit = int(request.query_params.get('limit', self.default_limit))
+        except ValueError:
+            limit = self.default_limit
+        limit = max(1, min(limit, self.max_limit))
+
+        results = search_resumes(request.user, query, limit)
+
+        return Response({
+            "query": query,
+            "results": results,
+            "count": len(results)
         }, status=status.HTTP_200_OK)
 
+class ResumeSectionsView(APIView):
+    permission_classes = [IsAuthenticated]
+    section_fields = ('category', 'heading', 'position', 'start_offset', 'end_offset', 'text')
+
+    def get(self, request, resume_id, **kwargs):
+        if not Resume.objects.filter(id=resume_id, user=request.user).exists():
+            return Response(
+                {"error": "Resume not found"},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        sections = ResumeSection.objects.filter(resume_id=resume_id)
+        category = request.query_params.get('category')
+        if category:
+            if category not in [choice for choice, _ in QuestionCategory.get_choices()]:
+                return Response(
+                    {"error": f"Invalid category '{category}'"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            sections = sections.filter(category=category)
+
+        results = list(sections.order_by('position').values(*self.section_fields))
+        return Response({
+            "resume_id": resume_id,
+            "sections": results,
+            "count": len(results)
+        }, status=status.HTTP_200_OK)
+
+class ResumeMatchView(APIView):
+    permission_classes = [IsAuthenticated]
+    default_k = 5
+    max_k = 50
+
+    def get(self, request, resume_id, **kwargs):
+        try:
+            resume = Resume.objects.only('id', 'parsed_content', 'processing_status').get(id=resume_id, user=request.user)
+        except Resume.DoesNotExist:
+            return Response(
+                {"error": "Resume not found"}, 
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        if resume.processing_status != ProcessingStatus.COMPLETED.value:
+            return Response(
+                {"error": "Resume has not been processed yet"},
+                status=status.HTTP_409_CONFLICT
+            )
+
+        try:
+            k = int(request.query_params.get('k', self.default_k))
+        except ValueError:
+            k = self.default_k
+        k = max(1, min(k, self.max_k))
+
+        matches = job_matcher.top_matches([resume.parsed_content], k)[0]
+
+        return Response({
+            "resume_id": resume.id,
+            "matches": [
+                {
+                    "job_position_id": job["id"],
+                    "title": job["title"],
+                    "department": job["department"],
+                    "score": round(score, 4)
+                }
+                for job, score in matches
+            ],
+            "count": len(matches)
+        }, status=status.HTTP_200_OK)
+
+class ResumeQuestionsView(APIView):
+    """Generated questions for one resume and job position, grouped by category
+
+    Served from question_cache when possible; otherwise one query over
+    question_pair_idx, joined to the resume to check ownership.
+    """
+
+    permission_classes = [IsAuthenticated]
+    throttle_scope = 'questions'
+
+    @metrics.timed('resume_request_duration_seconds', view='questions')
+    def get(self, request, resume_id, job_position_id, **kwargs):
+        cached, cache_key = question_cache.get(resume_id, job_position_id)
+        if cached is not None:
+            metrics.inc('resume_question_cache_total', result='hit')
+            if cached['user_id'] != request.user.pk:
+                return self.not_found("Resume not found")
+            return Response(cached['response'], status=status.HTTP_200_OK)
+        metrics.inc('resume_question_cache_total', result='miss')
+
+        questions = list(
+            GeneratedQuestion.objects.filter(
+                resume_id=resume_id, resume__user=request.user, job_position_id=job_position_id
+            ).select_related('job_position').only(
+                'category', 'question_text', 'priority', 'generated_at',
+                'job_position__title', 'job_position__department'
+            ).order_by('category', 'priority', 'id')
+        )
+        if questions:
+            job_position = questions[0].job_position
+        else:
+            # Only an empty result needs telling apart from a missing resume
+            if not Resume.objects.filter(id=resume_id, user=request.user).exists():
+                return self.not_found("Resume not found")
+            job_position = JobPosition.objects.only('title', 'department').filter(id=job_position_id).first()
+            if job_position is None:
+                return self.not_found("Job position not found")
+
+        response_data = self.group_questions(resume_id, job_position, questions)
+        question_cache.set(cache_key, {'user_id': request.user.pk, 'response': response_data})
+        return Response(response_data, status=status.HTTP_200_OK)
+
+    def not_found(self, message):
+        return Response({"error": message}, status=status.HTTP_404_NOT_FOUND)
+
+    def group_questions(self, resume_id, job_position, questions):
+        grouped = {category.value: [] for category in QuestionCategory}
+        for question in questions:
+            grouped.setdefault(question.category, []).append({
+                "id": question.id,
+                "question_text": question.question_text,
+                "priority": question.priority,
+                "generated_at": question.generated_at,
+            })
+        return {
+            "resume_id": resume_id,
+            "job_position": {
+                "id": job_position.id,
+                "title": job_position.title,
+                "department": job_position.department,
+            },
+            "categories": [
+                {
+                    "category": category,
+                    "category_display": QuestionCategory.get_display_name(category),
+                    "questions": category_questions,
+                    "count": len(category_questions),
+                }
+                for category, category_questions in grouped.items()
+            ],
+            "count": len(questions),
+        }
+
 class SupportedFileTypesView(APIView):
     permission_classes = [AllowAny]
     
@@ -234,3 +839,15 @@ class SupportedFileTypesView(APIView):
             "count": len(supported_types)
         }, status=status.HTTP_200_OK)
 
+
+class MetricsView(APIView):
+    """Prometheus scrape endpoint for the resume pipeline metrics"""
+    permission_classes = [ScrapePermission]
+
+    def get(self, request, **kwargs):
+        if not metrics.enabled:
+            return Response(
+                {"error": "Metrics are disabled"},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        return HttpResponse(metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
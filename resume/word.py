@@ -0,0 +1,300 @@
+import io
+import re
+import struct
+import zipfile
+from xml.etree.ElementTree import iterparse
+
+W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+W_BODY = f'{W}body'
+W_P = f'{W}p'
+W_T = f'{W}t'
+W_TAB = f'{W}tab'
+W_BR = f'{W}br'
+W_CR = f'{W}cr'
+W_TC = f'{W}tc'
+W_TR = f'{W}tr'
+# Text boxes are written twice: DrawingML in mc:Choice, VML in mc:Fallback
+MC_FALLBACK = '{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback'
+
+DOCUMENT_PART = 'word/document.xml'
+HEADER_FOOTER_PART = re.compile(r'^word/(header|footer)(\d*)\.xml$')
+
+# Pending separators: a stronger one replaces a weaker one
+SEPARATOR_RANK = {'': 0, ' ': 1, '\t': 2, '\n': 3}
+
+
+def _part_number(name):
+    digits = HEADER_FOOTER_PART.match(name).group(2)
+    return int(digits) if digits else 0
+
+
+def iter_part_text(stream):
+    """Yield the text of one WordprocessingML part, streaming its XML
+
+    Paragraphs end in a newline, table cells in a tab and rows in a
+    newline; paragraphs inside a cell are joined with spaces. Paragraphs
+    and rows are cleared once read, and finished blocks are dropped from
+    the body, so memory stays flat however long the document is.
+    """
+    depth = 0
+    container, container_depth = None, 0
+    fallback = 0
+    cells = 0
+    separator = ''
+
+    for event, element in iterparse(stream, events=('start', 'end')):
+        tag = element.tag
+        if event == 'start':
+            depth += 1
+            if depth == 1 or tag == W_BODY:
+                container, container_depth = element, depth
+            elif tag == MC_FALLBACK:
+                fallback += 1
+            elif tag == W_TC and not fallback:
+                cells += 1
+            continue
+
+        element_depth = depth
+        depth -= 1
+        if tag == MC_FALLBACK:
+            fallback -= 1
+        elif fallback:
+            pass
+        elif tag == W_T or tag == W_TAB or tag == W_BR or tag == W_CR:
+            text = element.text if tag == W_T else '\t' if tag == W_TAB else '\n'
+            if text:
+                if separator:
+                    yield separator
+                    separator = ''
+                yield text
+        else:
+            if tag == W_P:
+                mark = ' ' if cells else '\n'
+            elif tag == W_TC:
+                cells -= 1
+                mark = '\t'
+            elif tag == W_TR:
+                mark = '\n'
+            else:
+                mark = ''
+            if SEPARATOR_RANK[mark] > SEPARATOR_RANK[separator]:
+                separator = mark
+
+        if tag == W_P or tag == W_TR:
+            element.clear()
+        if element_depth == container_depth + 1:
+            container.clear()
+
+    if separator == '\n':
+        yield separator
+
+
+def iter_docx_text(data):
+    """Yield the text of a .docx file: headers, then the body, then footers"""
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        names = archive.namelist()
+        if DOCUMENT_PART not in names:
+            raise ValueError("Not a Word document: word/document.xml is missing")
+        parts = sorted((name for name in names if HEADER_FOOTER_PART.match(name)), key=_part_number)
+        headers = [name for name in parts if name.startswith('word/header')]
+        footers = [name for name in parts if name.startswith('word/footer')]
+
+        seen = set()
+        for name in headers + [DOCUMENT_PART] + footers:
+            with archive.open(name) as stream:
+                if name == DOCUMENT_PART:
+                    yield from iter_part_text(stream)
+                    continue
+                # Sections and first/even pages often repeat the same header
+                text = ''.join(iter_part_text(stream)).strip()
+            if text and text not in seen:
+                seen.add(text)
+                yield text + '\n'
+
+
+def docx_to_text(data):
+    """Plain text of a .docx file given as bytes"""
+    return ''.join(iter_docx_text(data))
+
+
+FREESECT = 0xFFFFFFFF
+ENDOFCHAIN = 0xFFFFFFFE
+OLE_SIGNATURE = b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'
+
+
+class CompoundFile:
+    """Read-only access to the streams of an OLE2 compound file"""
+
+    def __init__(self, data):
+        if not data.startswith(OLE_SIGNATURE) or len(data) < 512:
+            raise ValueError("Not an OLE2 compound file")
+        self.data = data
+        (major_version,) = struct.unpack_from('<H', data, 0x1A)
+        self.sector_shift, self.mini_sector_shift = struct.unpack_from('<HH', data, 0x1E)
+        self.sector_size = 1 << self.sector_shift
+        self.mini_sector_size = 1 << self.mini_sector_shift
+        (fat_sectors, first_directory, _, self.mini_cutoff, first_mini_fat, _,
+         first_difat, difat_sectors) = struct.unpack_from('<IIIIIIII', data, 0x2C)
+
+        fat_ids = [sid for sid in struct.unpack_from('<109I', data, 0x4C) if sid != FREESECT]
+        per_sector = self.sector_size // 4
+        sid = first_difat
+        for _ in range(difat_sectors):
+            if sid >= ENDOFCHAIN:
+                break
+            entries = struct.unpack_from(f'<{per_sector}I', data, self._offset(sid))
+            fat_ids.extend(entry for entry in entries[:-1] if entry != FREESECT)
+            sid = entries[-1]
+        fat_ids = fat_ids[:fat_sectors]
+
+        self.fat = []
+        for sid in fat_ids:
+            self.fat.extend(struct.unpack_from(f'<{per_sector}I', data, self._offset(sid)))
+
+        directory = self._read_chain(first_directory, self.fat, self._sector)
+        self.entries = {}
+        root = None
+        for start in range(0, len(directory) - 127, 128):
+            entry = directory[start:start + 128]
+            name_length, entry_type = struct.unpack_from('<HB', entry, 64)
+            if entry_type not in (1, 2, 5):
+                continue
+            name = entry[:max(0, name_length - 2)].decode('utf-16-le', errors='replace')
+            first_sector, size = struct.unpack_from('<IQ', entry, 116)
+            if major_version == 3:
+                size &= 0xFFFFFFFF  # the high half is undefined in version 3 files
+            if entry_type == 5:
+                root = (first_sector, size)
+            elif entry_type == 2:
+                self.entries.setdefault(name, (first_sector, size))
+
+        self.mini_fat = []
+        self.mini_stream = b''
+        if root is not None and first_mini_fat < ENDOFCHAIN:
+            mini_fat = self._read_chain(first_mini_fat, self.fat, self._sector)
+            self.mini_fat = list(struct.unpack_from(f'<{len(mini_fat) // 4}I', mini_fat))
+            self.mini_stream = self._read_chain(root[0], self.fat, self._sector)[:root[1]]
+
+    def _offset(self, sid):
+        return (sid + 1) << self.sector_shift
+
+    def _sector(self, sid):
+        offset = self._offset(sid)
+        return self.data[offset:offset + self.sector_size]
+
+    def _mini_sector(self, sid):
+        offset = sid << self.mini_sector_shift
+        return self.mini_stream[offset:offset + self.mini_sector_size]
+
+    def _read_chain(self, sid, table, read):
+        chunks = []
+        # A corrupt table could loop; a chain never has more links than entries
+        for _ in range(len(table) + 1):
+            if sid >= ENDOFCHAIN or sid >= len(table):
+                break
+            chunks.append(read(sid))
+            sid = table[sid]
+        else:
+            raise ValueError("Corrupt compound file: sector chain loops")
+        return b''.join(chunks)
+
+    def __contains__(self, name):
+        return name in self.entries
+
+    def stream(self, name):
+        """Contents of a top-level stream"""
+        try:
+            first_sector, size = self.entries[name]
+        except KeyError:
+            raise ValueError(f"Compound file has no {name} stream")
+        if size < self.mini_cutoff:
+            return self._read_chain(first_sector, self.mini_fat, self._mini_sector)[:size]
+        return self._read_chain(first_sector, self.fat, self._sector)[:size]
+
+
+WORD_IDENT = 0xA5EC
+FIB_CLX_INDEX = 33  # fcClx/lcbClx pair in FibRgFcLcb97
+FIELD_MARKS = re.compile('([\x13\x14\x15])')
+# Paragraph, cell and page marks to text; drop anchors and hyphenation hints
+WORD_CHARACTERS = str.maketrans({
+    '\r': '\n', '\x07': '\t', '\x0b': '\n', '\x0c': '\n', '\x0e': '\n', '\x1e': '-',
+    '\x01': None, '\x02': None, '\x03': None, '\x04': None, '\x05': None, '\x08': None, '\x1f': None,
+})
+
+
+def _strip_fields(text):
+    """Keep field results, dropping the instructions before each separator"""
+    if '\x13' not in text:
+        return text
+    kept = []
+    instructions = []  # one flag per open field: still in its instruction part?
+    for part in FIELD_MARKS.split(text):
+        if part == '\x13':
+            instructions.append(True)
+        elif part == '\x14':
+            if instructions:
+                instructions[-1] = False
+        elif part == '\x15':
+            if instructions:
+                instructions.pop()
+        elif not any(instructions):
+            kept.append(part)
+    return ''.join(kept)
+
+
+def doc_to_text(data):
+    """Main document text of a Word 97-2003 .doc file
+
+    Text is read through the piece table in the table stream, so fast-saved
+    files come out in document order. Headers, footnotes and text boxes are
+    stored as separate stories and are not included.
+    """
+    compound = CompoundFile(data)
+    word = compound.stream('WordDocument')
+    if len(word) < 0x22 or struct.unpack_from('<H', word, 0)[0] != WORD_IDENT:
+        raise ValueError("Not a Word 97-2003 document")
+    flags = struct.unpack_from('<H', word, 0x0A)[0]
+    if flags & 0x0100:
+        raise ValueError("Encrypted Word documents are not supported")
+    table = compound.stream('1Table' if flags & 0x0200 else '0Table')
+
+    position = 32
+    (words,) = struct.unpack_from('<H', word, position)
+    position += 2 + words * 2
+    (longs,) = struct.unpack_from('<H', word, position)
+    text_length = struct.unpack_from('<i', word, position + 2 + 3 * 4)[0]  # ccpText
+    position += 2 + longs * 4
+    (pairs,) = struct.unpack_from('<H', word, position)
+    if pairs <= FIB_CLX_INDEX:
+        raise ValueError("Word document is too old (Word 6/95 files are not supported)")
+    clx_offset, clx_length = struct.unpack_from('<II', word, position + 2 + FIB_CLX_INDEX * 8)
+
+    position, end = clx_offset, clx_offset + clx_length
+    while position < end and table[position] == 0x01:  # Prc: formatting, skipped
+        position += 3 + struct.unpack_from('<H', table, position + 1)[0]
+    if position >= end or table[position] != 0x02:
+        raise ValueError("Word document has no piece table")
+    (plc_length,) = struct.unpack_from('<I', table, position + 1)
+    position += 5
+    count = (plc_length - 4) // 12
+    boundaries = struct.unpack_from(f'<{count + 1}I', table, position)
+    descriptors = position + (count + 1) * 4
+
+    pieces = []
+    remaining = text_length
+    for index in range(count):
+        if remaining <= 0:
+            break
+        length = min(boundaries[index + 1] - boundaries[index], remaining)
+        remaining -= length
+        (offset,) = struct.unpack_from('<I', table, descriptors + index * 8 + 2)
+        if offset & 0x40000000:
+            # Compressed piece: one cp1252 byte per character at half the offset
+            start = (offset & 0x3FFFFFFF) // 2
+            pieces.append(word[start:start + length].decode('cp1252', errors='replace'))
+        else:
+            pieces.append(word[offset:offset + length * 2].decode('utf-16-le', errors='replace'))
+
+    # A row ends with an extra cell mark after its last cell
+    text = _strip_fields(''.join(pieces)).replace('\x07\x07', '\n')
+    return text.translate(WORD_CHARACTERS)